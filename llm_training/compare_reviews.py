@@ -3,8 +3,8 @@ import polars as pl
 from tqdm.auto import tqdm
 import re
 import statistics
+import openai
 from openai import OpenAI
-import time
 from pathlib import Path
 import hashlib
 import json
@@ -32,7 +32,13 @@ args = parse_args()
 with open(args.api_key_file, "r") as f:
     API_KEY = f.read().strip()
 
-client = OpenAI(base_url="https://openrouter.ai/api/v1", api_key=API_KEY)
+client = OpenAI(base_url="https://openrouter.ai/api/v1", api_key=API_KEY, max_retries=0)
+
+import shared_modules  # noqa: F401
+from network_utils import RetryPolicy
+
+# retry rate limits, server and connection errors forever with backoff, fail fast on other errors (e.g. 400, 401)
+retry = RetryPolicy(max_attempts=None, transient_exceptions=(openai.APIConnectionError,))
 
 
 
@@ -102,16 +108,10 @@ for message in tqdm(messages):
     p = Path('completions_judge') / str(h)
 
     if not p.exists():
-        while True:
-            try:
-                completion = chat_complete(client, args.model_name, message)
-                completions.append(completion.model_dump_json())
-                with open(p, 'w') as f:
-                    f.write(completion.model_dump_json())
-                break
-            except Exception as e:
-                print(e)
-                time.sleep(60)
+        completion = retry.call(chat_complete, client, args.model_name, message, host=client.base_url.host)
+        completions.append(completion.model_dump_json())
+        with open(p, 'w') as f:
+            f.write(completion.model_dump_json())
     else:
         print('loading existing completion', p)
         with open(p, 'r') as f:
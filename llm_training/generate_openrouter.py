@@ -2,8 +2,8 @@ import argparse
 
 import polars as pl
 from tqdm.auto import tqdm
+import openai
 from openai import OpenAI
-import time
 from pathlib import Path
 import hashlib
 import json
@@ -34,7 +34,13 @@ print(f'output column name: {args.col_name}')
 with open(args.api_key_file, "r") as f:
     API_KEY = f.read().strip()
 
-client = OpenAI(base_url="https://openrouter.ai/api/v1", api_key=API_KEY)
+client = OpenAI(base_url="https://openrouter.ai/api/v1", api_key=API_KEY, max_retries=0)
+
+import shared_modules  # noqa: F401
+from network_utils import RetryPolicy
+
+# retry rate limits, server and connection errors forever with backoff, fail fast on other errors (e.g. 400, 401)
+retry = RetryPolicy(max_attempts=None, transient_exceptions=(openai.APIConnectionError,))
 
 
 def chat_complete(client, model_name, messages):
@@ -58,16 +64,10 @@ for message in tqdm(messages):
     h = hashlib.md5(''.join(x['content'] for x in message).encode()).hexdigest()
     p = completions_dir / (args.col_name + '_' + str(h))
     if not p.exists():
-        while True:
-            try:
-                completion = chat_complete(client, args.model_name, message)
-                completions.append(completion.model_dump_json())
-                with open(p, 'w') as f:
-                    f.write(completion.model_dump_json())
-                break
-            except Exception as e:
-                print(e)
-                time.sleep(60)
+        completion = retry.call(chat_complete, client, args.model_name, message, host=client.base_url.host)
+        completions.append(completion.model_dump_json())
+        with open(p, 'w') as f:
+            f.write(completion.model_dump_json())
     else:
         print('loading existing completion', p)
         with open(p, 'r') as f:
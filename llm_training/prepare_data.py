@@ -1,156 +1,301 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import re
 import polars as pl
 import matplotlib.pyplot as plt
 
-MD_HEADER_SPLIT = re.compile(r"^#+\ ",re.MULTILINE)
-REFERENCE_MATCHES = ["References", "REFERENCES","R E F E R E N C E S", "Re F E R E N C E S"]
-
-
-dataset = Path("~/data/dataset/v1/notes.zstd.parquet")
-df = pl.read_parquet(dataset)
-print(f"loaded df: {df.shape}")
-
-# Split md text into main and appendix
-def get_main_text(text: str):
-    sections = re.split(MD_HEADER_SPLIT, text)
-    reference_sections = [i for i, section in enumerate(sections) if any(reference_match in section for reference_match in REFERENCE_MATCHES)]
-    if not reference_sections:
-        print("no reference section found") # TODO: handle this case better?
-        return text, ""
-        # print(text)
-        # raise ValueError("no reference section found")
-    reference_section_index = reference_sections[0]
-    reference_section_text = sections[reference_section_index]
-
-    main_text = text.split(reference_section_text)[0] + reference_section_text
-    appendix = ''.join(text.split(reference_section_text)[1:])
-    return main_text, appendix
-
-texts = df.select(pl.col("pdf_md")).to_series().to_list()
-main_texts, appendix_texts = zip(*map(get_main_text, texts))
-df = df.with_columns(pl.Series(name="pdf_md_main_text", values=main_texts))
-df = df.with_columns(pl.Series(name="pdf_md_appendix_text", values=appendix_texts))
-
-# get overview of main text length distribution
-main_text_lengths = df.select(pl.col("pdf_md_main_text").str.len_chars())
-fig = main_text_lengths.to_pandas().plot.hist(bins=100)
-fig.set_xlabel("Paper length (chars)")
-fig.set_ylabel("Number of papers")
-plt.tight_layout()
-plt.show()
-print(main_text_lengths.describe())
-# mean: ~50k chars
-
-# Filter based on paper length
-min_main_text_length = df.select(pl.col("pdf_md_main_text").str.len_chars()).quantile(.01).item()
-max_main_text_length = df.select(pl.col("pdf_md_main_text").str.len_chars()).quantile(.99).item()
-print(f"Min main text length: {min_main_text_length}\nMax main text length: {max_main_text_length}")
-df = df.filter((pl.col("pdf_md_main_text").str.len_chars() > min_main_text_length) & (pl.col("pdf_md_main_text").str.len_chars() < max_main_text_length))
-print(f"filtered paper length: {df.shape}")
-
-# Filter based on review length
-df = df.explode('reviews')
-df = df.rename({'reviews': 'review'})
-df = df.with_columns(review_length=pl.col("review").struct.field("content").list.join('\n').str.len_chars())
-print(f"reviews: {df.shape}")
-
-# get overview of review length distribution
-review_lengths = df.select(pl.col("review_length"))
-fig = review_lengths.to_pandas().plot.hist(bins=100)
-fig.set_xlabel("Review length (chars)")
-fig.set_ylabel("Number of reviews")
-plt.tight_layout()
-plt.show()
-print(review_lengths.describe())
-# mean: ~3.1k chars
-
-min_review_length = df.select(pl.col("review_length")).quantile(.01).item()
-max_review_length = df.select(pl.col("review_length")).quantile(.99).item()
-print(f"Min review length: {min_review_length}\nMax review length: {max_review_length}")
-df = df.filter((pl.col("review").struct.field("content").list.join('\n').str.len_chars() > min_review_length) & (pl.col("review").struct.field("content").list.join('\n').str.len_chars() < max_review_length))
-print(df.shape)
-print(f"filtered review length: {df.shape}")
+# the main text/appendix split is shared with make_dataset.py, which stores a section index of every paper
+import shared_modules  # noqa: F401
+from md_sections import get_section_indices, main_text_expression
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        "--dataset",
+        type=Path,
+        required=False,
+        default=Path("~/data/dataset/v1/notes.zstd.parquet"),
+        help="The dataset of make_dataset.py: notes.zstd.parquet, or papers.zstd.parquet of --layout normalized (the reviews are read from reviews.zstd.parquet next to it). For --incremental builds, the notes or papers directory.",
+    )
+    parser.add_argument(
+        "--output_dir",
+        type=Path,
+        required=False,
+        default=Path("data"),
+        help="The output directory for the train and test datasets and the review templates.",
+    )
+    parser.add_argument(
+        "--length_quantiles",
+        type=float,
+        nargs=2,
+        required=False,
+        default=[0.01, 0.99],
+        help="Papers and reviews are kept if their length is strictly between these quantiles.",
+    )
+    parser.add_argument(
+        "--test_venues",
+        type=str,
+        nargs="+",
+        required=False,
+        default=["ICLR.cc/2025/Conference", "NeurIPS.cc/2024/Conference"],
+        help="The venues the test papers are sampled from.",
+    )
+    parser.add_argument(
+        "--test_papers_per_venue",
+        type=int,
+        required=False,
+        default=200,
+        help="The number of test papers of every test venue.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        required=False,
+        default=None,
+        help="Seed for sampling the test papers.",
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        required=False,
+        default=None,
+        help="The number of processes that index the papers of datasets without a pdf_md_sections column, defaults to the number of cpus.",
+    )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        required=False,
+        default=1000,
+        help="The number of papers read at a time when indexing papers.",
+    )
+    parser.add_argument(
+        "--show_plots",
+        action="store_true",
+        help="Show the paper and review length distributions.",
+    )
+    return parser.parse_args()
 
-# filter based on reviewer confidence
-def filter_confident_reviews(row):
-    review = row['review']
-    confidence_index = review['content_fields'].index('confidence')
-    confidence_value = review['content'][confidence_index]
-    match row['or_venue']:
-        case 'ICLR.cc/2022/Conference':
-            confidence_value = int(confidence_value[0])
-            return confidence_value >= 4
-        case 'ICLR.cc/2023/Conference':
-            confidence_value = int(confidence_value[0])
-            return confidence_value >= 4
-        case 'ICLR.cc/2024/Conference':
-            confidence_value = int(confidence_value[0])
-            return confidence_value >= 4
-        case 'ICLR.cc/2025/Conference':
-            confidence_value = int(confidence_value[0])
-            return confidence_value >= 4
-        case 'NeurIPS.cc/2022/Conference':
-            confidence_value = int(confidence_value[0])
-            return confidence_value >= 4
-        case 'NeurIPS.cc/2023/Conference':
-            confidence_value = int(confidence_value[0])
-            return confidence_value >= 4
-        case 'NeurIPS.cc/2024/Conference':
-            confidence_value = int(confidence_value[0])
-            return confidence_value >= 4
-        case _:
-            raise ValueError(f"Unknown venue: {row['or_venue']}")
-            # return True
-
-keep = []
-for row in df.select('review', 'or_venue').rows(named=True):
-    if filter_confident_reviews(row):
-        keep.append(True)
+
+def scan_dataset(dataset: Path):
+    papers = pl.scan_parquet(dataset)
+    # reviews are processed in their own frame with one row per review, the paper text is only joined when formatting
+    if dataset.name in ("papers.zstd.parquet", "papers"):
+        # built with make_dataset.py --layout normalized, partitioned by venue with --incremental
+        reviews = pl.scan_parquet(dataset.parent / dataset.name.replace("papers", "reviews"), hive_partitioning=False)
     else:
-        keep.append(False)
-df = df.with_columns(pl.Series(name="confidence_filter", values=keep))
-df = df.filter(pl.col("confidence_filter"))
-print(f"filtered review confidence: {df.shape}")
-
-# # format reviews
-dataset = []
-for row in df.rows(named=True):
-    paper_text = row["pdf_md_main_text"]
-    review_content_fields = row["review"]["content_fields"]
-    review_content = row["review"]["content"]
-    review_content_meta = row["review"]["content_meta"]
-
-    review_fields = '\n'.join([f"## {field.replace('_', ' ').title()}\n{field_description}\n" for field, field_description in zip(review_content_fields, review_content_meta)])
-    review = '# Review\n\n' + '\n'.join([f"## {field.replace('_', ' ').title()}\n{content}\n" for field, content in zip(review_content_fields, review_content)])
-    dataset.append({'paper_text': paper_text, 'review_fields': review_fields, 'review': review, 'or_venue': row['or_venue'], 'id': row['id']})
-
-dataset_df = pl.from_dicts(dataset)
-
-test_set_ids = []
-test_set_ids.extend(dataset_df.filter(pl.col('or_venue') == 'ICLR.cc/2025/Conference').select(pl.col('id').unique()).sample(fraction=1.0).head(200).select('id').to_series().to_list())
-test_set_ids.extend(dataset_df.filter(pl.col('or_venue') == 'NeurIPS.cc/2024/Conference').select(pl.col('id').unique()).sample(fraction=1.0).head(200).select('id').to_series().to_list())
-
-df_train = dataset_df.filter(~pl.col('id').is_in(test_set_ids))
-df_test = dataset_df.filter(pl.col('id').is_in(test_set_ids))
-
-
-dataset_df.write_parquet("data/dataset.zstd.parquet")
-df_train.write_parquet("data/dataset_train.zstd.parquet")
-# df_test.write_parquet("dataset_test.zstd.parquet")
-
-
-# prepare test set for generation
-df_test = df_test.unique(subset=(pl.col("id"), pl.col("paper_text"), pl.col("review_fields"), pl.col("or_venue"))).join(df_test.select(pl.col('id'), pl.col('review')).group_by('id').agg(pl.col('review').alias('reviews')), on='id', how='left')
-df_test.write_parquet("data/dataset_test.zstd.parquet")
-"""
-test dataset schema:
-Schema([('paper_text', String),
-        ('review_fields', String),
-        ('review', String),
-        ('or_venue', String),
-        ('id', String),
-        ('reviews', List(String))])
-"""
+        reviews = papers.select(pl.col("reviews").explode().drop_nulls()).unnest("reviews")
+        papers = papers.drop("reviews")
+    return papers, reviews
+
+
+def add_section_index(papers: pl.LazyFrame, num_workers: int, batch_size: int) -> pl.LazyFrame:
+    if "pdf_md_sections" in papers.collect_schema().names():
+        return papers
+    # datasets compiled before make_dataset.py stored the section index, index the papers in a process pool
+    sections = []
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        for batch in papers.select("pdf_md").collect_batches(chunk_size=batch_size):
+            sections.append(get_section_indices(batch["pdf_md"].to_list(), executor))
+    # joined by row, ids need not be unique
+    sections = pl.concat(sections).to_frame().with_row_index("_row")
+    papers = papers.with_row_index("_row").join(sections.lazy(), on="_row", how="left", maintain_order="left")
+    return papers.drop("_row")
+
+
+def plot_lengths(lengths: pl.Series, xlabel: str, ylabel: str):
+    fig = lengths.to_frame().to_pandas().plot.hist(bins=100)
+    fig.set_xlabel(xlabel)
+    fig.set_ylabel(ylabel)
+    plt.tight_layout()
+    plt.show()
+
+
+# filter based on reviewer confidence
+# the confidence rules of every venue: the content field with the confidence, how it is parsed and the minimum confidence
+# of the reviews that are kept. Reviews of venues without a rule raise a ValueError.
+CONFIDENCE_RULES = pl.DataFrame(
+    [
+        ("ICLR.cc/2022/Conference", "confidence", "first_digit", 4),
+        ("ICLR.cc/2023/Conference", "confidence", "first_digit", 4),
+        ("ICLR.cc/2024/Conference", "confidence", "first_digit", 4),
+        ("ICLR.cc/2025/Conference", "confidence", "first_digit", 4),
+        ("NeurIPS.cc/2022/Conference", "confidence", "first_digit", 4),
+        ("NeurIPS.cc/2023/Conference", "confidence", "first_digit", 4),
+        ("NeurIPS.cc/2024/Conference", "confidence", "first_digit", 4),
+    ],
+    schema={"or_venue": pl.String, "confidence_field": pl.String, "parse_rule": pl.String, "min_confidence": pl.Int64},
+    orient="row",
+)
+CONFIDENCE_PARSERS = {
+    # e.g. "4: You are confident in your assessment, but not absolutely certain."
+    "first_digit": lambda value: value.str.slice(0, 1).cast(pl.Int64, strict=False),
+}
+
+
+def confidence_expression(value: pl.Expr) -> pl.Expr:
+    # the rule of every review is joined to it, values that cannot be parsed are null
+    return pl.coalesce(
+        [pl.when(pl.col("parse_rule") == name).then(parse(value)) for name, parse in CONFIDENCE_PARSERS.items()]
+    )
+
+
+def filter_confident_reviews(reviews: pl.DataFrame, templates) -> pl.DataFrame:
+    unknown_venues = reviews.join(CONFIDENCE_RULES, on="or_venue", how="anti")["or_venue"].unique().to_list()
+    if unknown_venues:
+        raise ValueError(f"Unknown venues: {unknown_venues}, add their rules to CONFIDENCE_RULES")
+    # the position of every field in the content of the reviews of a template
+    field_indices = pl.DataFrame(
+        [
+            (template_id, field, index)
+            for template_id, template in templates.items()
+            for index, field in enumerate(template["content_fields"])
+        ],
+        schema={"template_id": pl.String, "confidence_field": pl.String, "confidence_index": pl.Int64},
+        orient="row",
+    ).unique(subset=["template_id", "confidence_field"], keep="first", maintain_order=True)
+    rules = reviews.select("template_id", "or_venue", "content")
+    rules = rules.join(CONFIDENCE_RULES, on="or_venue", how="left", maintain_order="left")
+    rules = rules.join(field_indices, on=["template_id", "confidence_field"], how="left", maintain_order="left")
+    missing = rules.filter(pl.col("confidence_index").is_null())
+    if missing.height:
+        raise ValueError(f"{missing.height} reviews have no confidence field, templates: {missing['template_id'].unique().to_list()}")
+    value = pl.col("content").list.get(pl.col("confidence_index"))
+    rules = rules.select(value.alias("confidence_value"), confidence_expression(value).alias("confidence"), "min_confidence")
+    unparsed = rules.filter(pl.col("confidence").is_null())
+    if unparsed.height:
+        raise ValueError(f"{unparsed.height} confidence values cannot be parsed: {unparsed['confidence_value'].unique().head(5).to_list()}")
+    return reviews.filter(rules["confidence"] >= rules["min_confidence"])
+
+
+def main(args):
+    papers, reviews = scan_dataset(args.dataset.expanduser())
+    # reviews reference the names and descriptions of their fields by template_id
+    templates = {template['template_id']: template for template in pl.read_parquet(args.dataset.expanduser().parent / "templates.zstd.parquet").rows(named=True)}
+
+    # Split md text into main and appendix, the main text ends at appendix_start of the section index
+    papers = add_section_index(papers, args.num_workers, args.batch_size)
+    appendix_start = pl.col("pdf_md_sections").struct.field("appendix_start")
+    # papers without a reference section are all main text, their length is stored by make_dataset.py
+    num_chars = pl.col("pdf_md_num_chars") if "pdf_md_num_chars" in papers.collect_schema().names() else pl.col("pdf_md").str.len_chars()
+    papers = papers.with_columns(main_text_length=pl.coalesce(appendix_start, num_chars))
+    reviews = reviews.with_columns(review_length=pl.col("content").list.join('\n').str.len_chars())
+
+    # the length distributions and quantiles are computed in one pass over the dataset, the review lengths are those of
+    # the papers that pass the paper length filter
+    min_quantile, max_quantile = args.length_quantiles
+    main_text_length = pl.col("main_text_length")
+    # the quantiles are those of all papers, also when the filtered frame is collected again
+    kept_papers = papers.filter((main_text_length > main_text_length.quantile(min_quantile)) & (main_text_length < main_text_length.quantile(max_quantile)))
+    kept_reviews = reviews.join(kept_papers.select(pl.col('id').alias('forum')), on='forum', how='semi')
+    main_text_lengths, no_reference, review_lengths = pl.collect_all(
+        [
+            papers.select(main_text_length),
+            papers.select(appendix_start.null_count()),
+            kept_reviews.select("review_length"),
+        ],
+        engine="streaming",
+    )
+    main_text_lengths = main_text_lengths.to_series()
+    review_lengths = review_lengths.to_series()
+    print(f"loaded papers: {len(main_text_lengths)}, no reference section found: {no_reference.item()} papers")
+
+    # get overview of main text length distribution
+    if args.show_plots:
+        plot_lengths(main_text_lengths, "Paper length (chars)", "Number of papers")
+    print(main_text_lengths.describe())
+    # mean: ~50k chars
+
+    # Filter based on paper length
+    min_main_text_length = main_text_lengths.quantile(min_quantile)
+    max_main_text_length = main_text_lengths.quantile(max_quantile)
+    print(f"Min main text length: {min_main_text_length}\nMax main text length: {max_main_text_length}")
+    papers = kept_papers
+    print(f"filtered paper length: {main_text_lengths.is_between(min_main_text_length, max_main_text_length, closed='none').sum()}")
+
+    # Filter based on review length
+    # keep the reviews of the remaining papers, reviews are keyed by forum (the id of the paper)
+    print(f"reviews: {len(review_lengths)}")
+
+    # get overview of review length distribution
+    if args.show_plots:
+        plot_lengths(review_lengths, "Review length (chars)", "Number of reviews")
+    print(review_lengths.describe())
+    # mean: ~3.1k chars
+
+    min_review_length = review_lengths.quantile(min_quantile)
+    max_review_length = review_lengths.quantile(max_quantile)
+    print(f"Min review length: {min_review_length}\nMax review length: {max_review_length}")
+    review_length = pl.col("review_length")
+    reviews = reviews.filter((review_length > min_review_length) & (review_length < max_review_length))
+    reviews = reviews.join(papers.select(pl.col('id').alias('forum'), pl.col('or_venue')), on='forum', how='inner', maintain_order='left')
+    reviews = reviews.select('template_id', 'content', 'or_venue', 'forum').collect(engine="streaming")
+    print(f"filtered review length: {reviews.shape}")
+
+    reviews = filter_confident_reviews(reviews, templates)
+    print(f"filtered review confidence: {reviews.shape}")
+
+    # # format reviews
+    dataset = []
+    for row in reviews.rows(named=True):
+        review_content_fields = templates[row["template_id"]]["content_fields"]
+        review_content = row["content"]
+
+        review = '# Review\n\n' + '\n'.join([f"## {field.replace('_', ' ').title()}\n{content}\n" for field, content in zip(review_content_fields, review_content)])
+        dataset.append({'template_id': row["template_id"], 'review': review, 'or_venue': row['or_venue'], 'id': row['forum']})
+    dataset = pl.from_dicts(dataset)
+
+    # the review fields of the system prompt are rendered once per template and joined when prompts are created
+    review_templates = []
+    for template_id in dataset.select(pl.col('template_id').unique()).to_series().to_list():
+        template = templates[template_id]
+        review_fields = '\n'.join([f"## {field.replace('_', ' ').title()}\n{field_description}\n" for field, field_description in zip(template['content_fields'], template['content_meta'])])
+        review_templates.append({'template_id': template_id, 'review_fields': review_fields})
+    review_templates_df = pl.from_dicts(review_templates)
+
+    # test papers are sampled before the paper text is joined
+    test_set_ids = []
+    for or_venue in args.test_venues:
+        test_set_ids.extend(dataset.filter(pl.col('or_venue') == or_venue).select(pl.col('id').unique(maintain_order=True)).sample(fraction=1.0, seed=args.seed).head(args.test_papers_per_venue).select('id').to_series().to_list())
+
+    # join the paper text last, only the main text of the remaining papers is read
+    paper_texts = papers.select(pl.col('id'), main_text_expression(pl.col("pdf_md"), pl.col("pdf_md_sections")).alias('paper_text'))
+    dataset_df = dataset.lazy().join(paper_texts, on='id', how='left', maintain_order='left')
+    dataset_df = dataset_df.select('paper_text', 'template_id', 'review', 'or_venue', 'id')
+
+    df_train = dataset_df.filter(~pl.col('id').is_in(test_set_ids))
+    df_test = dataset_df.filter(pl.col('id').is_in(test_set_ids))
+
+    args.output_dir.mkdir(exist_ok=True, parents=True)
+    # the datasets are streamed to parquet, the paper text is read once for all of them
+    _, _, df_test = pl.collect_all(
+        [
+            dataset_df.sink_parquet(args.output_dir / "dataset.zstd.parquet", lazy=True),
+            df_train.sink_parquet(args.output_dir / "dataset_train.zstd.parquet", lazy=True),
+            df_test,
+        ],
+        engine="streaming",
+    )
+    review_templates_df.write_parquet(args.output_dir / "review_templates.zstd.parquet")
+
+    # prepare test set for generation
+    df_test = df_test.unique(subset=(pl.col("id"), pl.col("paper_text"), pl.col("template_id"), pl.col("or_venue"))).join(df_test.select(pl.col('id'), pl.col('review')).group_by('id').agg(pl.col('review').alias('reviews')), on='id', how='left')
+    # the generation scripts read the review fields from the test set
+    df_test = df_test.join(review_templates_df, on='template_id', how='left')
+    df_test.write_parquet(args.output_dir / "dataset_test.zstd.parquet")
+    """
+    test dataset schema:
+    Schema([('paper_text', String),
+            ('template_id', String),
+            ('review', String),
+            ('or_venue', String),
+            ('id', String),
+            ('reviews', List(String)),
+            ('review_fields', String)])
+    """
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print("args:\n" + "\n".join([f"\t{arg}:{value}" for arg, value in vars(args).items()]))
+    main(args)
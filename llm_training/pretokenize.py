@@ -12,6 +12,9 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 
 df_train = pl.read_parquet("data/dataset_train.zstd.parquet")
 df_test = pl.read_parquet("data/dataset_test.zstd.parquet")
+# training reviews reference their review fields by template_id
+review_templates = pl.read_parquet("data/review_templates.zstd.parquet")
+df_train = df_train.join(review_templates, on='template_id', how='left')
 
 tokenizer = transformers.AutoTokenizer.from_pretrained(model_name)
 
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Importing this module makes the modules of openreview_dataset_creation that are shared with the training scripts
+# (md_sections, network_utils) importable when a script is run from this directory.
+sys.path.append(str(Path(__file__).resolve().parent.parent / "openreview_dataset_creation"))
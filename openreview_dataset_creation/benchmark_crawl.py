@@ -0,0 +1,195 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import polars as pl
+
+from mock_openreview_server import add_mock_args, make_server, server_urls
+from note_store import iter_notes, read_index
+
+# Runs get_openreview_notes.py and download_pdfs.py against mock_openreview_server.py and reports their throughput.
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        "--output_dir",
+        type=str,
+        required=True,
+        help="The output directory for the crawled notes, pdfs, logs and benchmark.json. Overwritten on every run.",
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        required=False,
+        default=4,
+        help="--num_workers of get_openreview_notes.py and download_pdfs.py.",
+    )
+    parser.add_argument(
+        "--requests_per_second",
+        type=float,
+        required=False,
+        default=None,
+        help="--requests_per_second of get_openreview_notes.py and download_pdfs.py. Unlimited if not set.",
+    )
+    parser.add_argument(
+        "--num_pdfs",
+        type=int,
+        required=False,
+        default=200,
+        help="The number of pdfs to download. 0 to skip the download benchmark.",
+    )
+    parser.add_argument(
+        "--details",
+        type=str,
+        required=False,
+        choices=["all", "parser"],
+        default="all",
+        help="--details of get_openreview_notes.py.",
+    )
+    add_mock_args(parser)
+    return parser.parse_args()
+
+
+def dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def get_pdf_url(note):
+    pdf = note["content"]["pdf"]
+    return pdf["value"] if isinstance(pdf, dict) else pdf
+
+
+def run(command, log_file, urls):
+    print(f"running {' '.join(command)}")
+    # openreview-py's V1 client logs in via the V2 API, which it finds through OPENREVIEW_API_V2_URL for local urls
+    env = dict(
+        os.environ, OPENREVIEW_USERNAME="mock", OPENREVIEW_PASSWORD="mock", OPENREVIEW_API_V2_URL=urls["api_v2_url"]
+    )
+    start = time.perf_counter()
+    with open(log_file, "w") as f:
+        process = subprocess.run(command, cwd=Path(__file__).parent, env=env, stdout=f, stderr=subprocess.STDOUT)
+    seconds = time.perf_counter() - start
+    if process.returncode:
+        print(f"\tfailed with exit code {process.returncode}, see {log_file}")
+    return seconds, process.returncode
+
+
+def measure(server, command, log_file):
+    mock = server.mock
+    with mock.lock:
+        stats = mock.stats.copy()
+    seconds, returncode = run(command, log_file, server_urls(server))
+    with mock.lock:
+        stats = mock.stats - stats
+    wire_mb = stats.pop("bytes_sent", 0) / 1e6
+    return {
+        "seconds": round(seconds, 3),
+        "returncode": returncode,
+        "wire_mb": round(wire_mb, 3),
+        "wire_mb_per_sec": round(wire_mb / seconds, 3),
+        "responses": dict(sorted(stats.items())),
+    }
+
+
+def main(args):
+    output_dir = Path(args.output_dir)
+    notes_dir = output_dir / "notes"
+    pdf_dir = output_dir / "pdfs"
+    for path in (notes_dir, pdf_dir):
+        if path.exists():
+            shutil.rmtree(path)
+    output_dir.mkdir(exist_ok=True, parents=True)
+
+    server = make_server("127.0.0.1", 0, args)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = server_urls(server)
+    venues = sorted(server.mock.venues)
+    venues_file = output_dir / "or_venues.txt"
+    with open(venues_file, "w") as f:
+        f.write("\n".join(venues) + "\n")
+    print(f"mock server at {urls['openreview_url']} with {len(venues):_} venues")
+
+    rate_limit = ["--requests_per_second", str(args.requests_per_second)] if args.requests_per_second else []
+    command = [
+        sys.executable,
+        "get_openreview_notes.py",
+        "--or_venues_file",
+        str(venues_file.absolute()),
+        "--output_dir",
+        str(notes_dir.absolute()),
+        "--num_workers",
+        str(args.num_workers),
+        "--details",
+        args.details,
+        "--api_v1_url",
+        urls["api_v1_url"],
+        "--api_v2_url",
+        urls["api_v2_url"],
+    ] + rate_limit
+    crawl = measure(server, command, output_dir / "crawl.log")
+    store_dirs = [index_file.parent for index_file in notes_dir.glob("*/index.json")]
+    num_notes = sum(read_index(store_dir)["num_notes"] for store_dir in store_dirs)
+    stored_mb = sum(dir_size(store_dir) for store_dir in store_dirs) / 1e6
+    crawl.update(
+        venues=len(store_dirs),
+        notes=num_notes,
+        notes_per_sec=round(num_notes / crawl["seconds"], 3),
+        stored_mb=round(stored_mb, 3),
+    )
+    results = {"args": vars(args), "crawl": crawl}
+    print(f"crawl: {crawl}")
+
+    if args.num_pdfs and store_dirs:
+        rows = [
+            {"id": note["id"], "pdf_url": get_pdf_url(note)}
+            for store_dir in store_dirs
+            for note in iter_notes(store_dir)
+        ]
+        notes_df = output_dir / "notes_df.parquet"
+        pl.DataFrame(rows[: args.num_pdfs]).write_parquet(notes_df)
+        command = [
+            sys.executable,
+            "download_pdfs.py",
+            "--notes_df",
+            str(notes_df.absolute()),
+            "--output_dir",
+            str(pdf_dir.absolute()),
+            "--num_workers",
+            str(args.num_workers),
+            "--requests_per_second",
+            str(args.requests_per_second or 1e6),
+            "--burst",
+            str(args.num_workers),
+            "--openreview_url",
+            urls["openreview_url"],
+        ]
+        download = measure(server, command, output_dir / "download.log")
+        num_pdfs = len(list(pdf_dir.glob("*.pdf")))
+        pdf_mb = sum(f.stat().st_size for f in pdf_dir.glob("*.pdf")) / 1e6
+        download.update(
+            pdfs=num_pdfs,
+            pdfs_per_sec=round(num_pdfs / download["seconds"], 3),
+            mb=round(pdf_mb, 3),
+            mb_per_sec=round(pdf_mb / download["seconds"], 3),
+        )
+        results["download"] = download
+        print(f"download: {download}")
+
+    server.shutdown()
+    outfile = output_dir / "benchmark.json"
+    print(f"writing results to {outfile}")
+    with open(outfile, "w") as f:
+        json.dump(results, f, indent=1)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print("args:\n" + "\n".join([f"\t{arg}:{value}" for arg, value in vars(args).items()]))
+    main(args)
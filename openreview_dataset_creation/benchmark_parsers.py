@@ -0,0 +1,208 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import resource
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import polars as pl
+
+from note_parsers import NOTE_PARSERS
+from note_store import read_index, store_dir_for
+from synthetic_notes import write_synthetic_store
+
+# Parses synthetic notes of every venue in NOTE_PARSERS (see synthetic_notes.py) with parse_notes.py and reports the
+# throughput, peak RSS and output size per venue and engine. Results are written to benchmark.json, runs of different
+# commits can be compared with --baseline.
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        "--output_dir",
+        type=str,
+        required=True,
+        help="The output directory for the synthetic notes, parsed notes and benchmark.json.",
+    )
+    parser.add_argument(
+        "--venues",
+        type=str,
+        nargs="+",
+        required=False,
+        default=list(NOTE_PARSERS),
+        help="The venues to benchmark.",
+    )
+    parser.add_argument(
+        "--engines",
+        type=str,
+        nargs="+",
+        required=False,
+        choices=["python", "polars"],
+        default=["python", "polars"],
+        help="--engine of parse_notes.py.",
+    )
+    parser.add_argument(
+        "--notes_per_venue",
+        type=int,
+        required=False,
+        default=2000,
+        help="The number of synthetic notes of every venue.",
+    )
+    parser.add_argument(
+        "--review_words",
+        type=int,
+        required=False,
+        default=100,
+        help="The average number of words of every synthetic review field.",
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        required=False,
+        default=1,
+        help="--num_workers of parse_notes.py.",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        required=False,
+        default=1,
+        help="The number of runs of every benchmark, the fastest one is reported.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        required=False,
+        default=0,
+        help="Seed for the synthetic notes.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        required=False,
+        default=None,
+        help="A benchmark.json of an earlier run to compare notes/sec with.",
+    )
+    return parser.parse_args()
+
+
+def dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=Path(__file__).parent, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_parse_notes(notes, output_dir, engine, num_workers):
+    # runs in a fresh process for every benchmark, so that the peak RSS and imported modules are not shared between runs
+    import parse_notes
+
+    # through the parser of parse_notes.py, so that options added there get their defaults
+    args = parse_notes.parse_args(
+        ["--notes", *notes, "--output_dir", output_dir, "--num_workers", str(num_workers)]
+        + ["--validate_fraction", "0", "--engine", engine]
+    )
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parse_notes.main(args)
+    seconds = time.perf_counter() - start
+    # ru_maxrss is in KB, the peak of this process or of the largest worker
+    peak_rss = max(resource.getrusage(who).ru_maxrss for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN))
+    return seconds, peak_rss * 1024
+
+
+def measure(store_dirs, output_dir, engine, num_workers, repeats):
+    results = []
+    for _ in range(repeats):
+        if output_dir.exists():
+            shutil.rmtree(output_dir)
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=mp_context) as executor:
+            notes = [str(store_dir) for store_dir in store_dirs]
+            results.append(executor.submit(run_parse_notes, notes, str(output_dir), engine, num_workers).result())
+    seconds, peak_rss = min(results)
+    num_notes = sum(read_index(store_dir)["num_notes"] for store_dir in store_dirs)
+    outfiles = list(output_dir.glob("*.parquet"))
+    num_parsed = sum(pl.scan_parquet(outfile).select(pl.len()).collect().item() for outfile in outfiles)
+    input_mb = sum(dir_size(store_dir) for store_dir in store_dirs) / 1e6
+    output_mb = sum(outfile.stat().st_size for outfile in outfiles) / 1e6
+    return {
+        "notes": num_notes,
+        "parsed_notes": num_parsed,
+        "seconds": round(seconds, 3),
+        "notes_per_sec": round(num_notes / seconds, 1),
+        "peak_rss_mb": round(peak_rss / 1e6, 1),
+        "input_mb": round(input_mb, 3),
+        "output_mb": round(output_mb, 3),
+        "input_mb_per_sec": round(input_mb / seconds, 3),
+    }
+
+
+def compare(results, baseline):
+    print(f"notes/sec compared to {baseline['args']['output_dir']} (commit {baseline['commit']}):")
+    for name, engines in results["benchmarks"].items():
+        for engine, result in engines.items():
+            before = baseline["benchmarks"].get(name, {}).get(engine)
+            if before is None:
+                continue
+            change = result["notes_per_sec"] / before["notes_per_sec"] - 1
+            print(f"\t{name} {engine}: {before['notes_per_sec']} -> {result['notes_per_sec']} ({change:+.1%})")
+
+
+def main(args):
+    output_dir = Path(args.output_dir)
+    notes_dir = output_dir / "notes"
+    parsed_dir = output_dir / "notes_parsed"
+    output_dir.mkdir(exist_ok=True, parents=True)
+    baseline = None
+    if args.baseline:
+        # read before benchmark.json of this run may overwrite it
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    # synthetic notes are only regenerated when the venue, number of notes or seed change
+    store_dirs = dict()
+    for or_venue in args.venues:
+        store_dir = store_dir_for(notes_dir, or_venue)
+        config = dict(notes_per_venue=args.notes_per_venue, review_words=args.review_words, seed=args.seed)
+        config_file = store_dir / "synthetic.json"
+        if not config_file.exists() or json.loads(config_file.read_text()) != config:
+            print(f"generating {args.notes_per_venue:_} notes of {or_venue}")
+            write_synthetic_store(notes_dir, or_venue, args.notes_per_venue, args.seed, args.review_words)
+            config_file.write_text(json.dumps(config))
+        store_dirs[or_venue] = store_dir
+
+    benchmarks = {or_venue: [store_dir] for or_venue, store_dir in store_dirs.items()}
+    if len(store_dirs) > 1:
+        # a rebuild of all venues in one run
+        benchmarks["all"] = list(store_dirs.values())
+    results = {"args": vars(args), "commit": get_commit(), "benchmarks": dict()}
+    for name, benchmark_store_dirs in benchmarks.items():
+        results["benchmarks"][name] = dict()
+        for engine in args.engines:
+            result = measure(benchmark_store_dirs, parsed_dir, engine, args.num_workers, args.repeats)
+            results["benchmarks"][name][engine] = result
+            print(f"{name} {engine}: {result}")
+    shutil.rmtree(parsed_dir)
+
+    outfile = output_dir / "benchmark.json"
+    print(f"writing results to {outfile}")
+    with open(outfile, "w") as f:
+        json.dump(results, f, indent=1)
+    if baseline is not None:
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print("args:\n" + "\n".join([f"\t{arg}:{value}" for arg, value in vars(args).items()]))
+    main(args)
@@ -0,0 +1,34 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Incremental builds (parse_notes.py and make_dataset.py --incremental) keep a fingerprint of the inputs of every
+# output in <output_dir>/build_state.json. An output is only rebuilt when the fingerprint of its inputs changed. Files
+# are compared by size and modification time, like make does, so unchanged inputs are never read.
+STATE_FILE = "build_state.json"
+
+
+def file_stamp(path: Path) -> List[Any]:
+    stat = os.stat(path)
+    return [str(path), stat.st_size, stat.st_mtime_ns]
+
+
+def fingerprint(inputs: Any) -> str:
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+def read_build_state(output_dir: Path) -> Dict[str, str]:
+    state_file = Path(output_dir) / STATE_FILE
+    if not state_file.exists():
+        return dict()
+    with open(state_file, "r") as f:
+        return json.load(f)
+
+
+def write_build_state(output_dir: Path, state: Dict[str, str]):
+    tmpfile = Path(output_dir) / f"{STATE_FILE}.tmp"
+    with open(tmpfile, "w") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmpfile, Path(output_dir) / STATE_FILE)
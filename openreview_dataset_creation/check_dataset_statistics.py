@@ -0,0 +1,108 @@
+import argparse
+import random
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import polars as pl
+
+from synthetic_notes import synthetic_text, write_synthetic_store
+
+# Builds a dataset of synthetic notes (see synthetic_notes.py) and markdown with make_dataset.py in every layout, and
+# runs dataset_statistics.py with only --dataset on each build. The reviews of a normalized build have to be found next
+# to its papers table, and every build has to report all of its reviews.
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        "--output_dir",
+        type=Path,
+        required=True,
+        help="The output directory for the synthetic notes, markdown, datasets and statistics. It is cleared first.",
+    )
+    parser.add_argument(
+        "--venues",
+        type=str,
+        nargs="+",
+        required=False,
+        default=["ICLR.cc/2022/Conference", "ICLR.cc/2024/Conference"],
+        help="The venues of the dataset, API v1 and v2 venues with decisions.",
+    )
+    parser.add_argument(
+        "--notes_per_venue",
+        type=int,
+        required=False,
+        default=200,
+        help="The number of synthetic notes of every venue.",
+    )
+    return parser.parse_args()
+
+
+# the make_dataset.py options of every build, and the table that is passed to dataset_statistics.py as --dataset
+BUILDS = {
+    "notes": (["--layout", "notes"], "notes.zstd.parquet"),
+    "normalized": (["--layout", "normalized"], "papers.zstd.parquet"),
+    "normalized_incremental": (["--layout", "normalized", "--incremental"], "papers"),
+}
+
+
+def run(command):
+    print(f"running {' '.join(map(str, command))}")
+    process = subprocess.run(
+        [sys.executable, *map(str, command)], cwd=Path(__file__).parent, capture_output=True, text=True
+    )
+    if process.returncode:
+        raise RuntimeError(f"{command[0]} failed with exit code {process.returncode}:\n{process.stderr}")
+
+
+def write_md(parsed_dir: Path, pdf_md_dir: Path):
+    # a main text, a reference section and an appendix for every parsed note
+    rng = random.Random(0)
+    ids = pl.scan_parquet(sorted(parsed_dir.glob("**/*.parquet"))).select("id").collect()["id"]
+    for note_id in ids:
+        sections = ["Introduction", "Method", "References", "Appendix"]
+        text = "\n\n".join(f"# {section}\n\n{synthetic_text(rng, 200)}" for section in sections)
+        (pdf_md_dir / note_id).mkdir(parents=True, exist_ok=True)
+        (pdf_md_dir / note_id / f"{note_id}.md").write_text(text)
+
+
+def num_reported_reviews(statistics_file: Path) -> int:
+    for line in statistics_file.read_text().splitlines():
+        if line.startswith("Number of reviews: "):
+            return int(line.removeprefix("Number of reviews: "))
+    raise ValueError(f"{statistics_file} reports no number of reviews")
+
+
+def main(args):
+    if args.output_dir.exists():
+        shutil.rmtree(args.output_dir)
+    notes_dir = args.output_dir / "notes"
+    parsed_dir = args.output_dir / "notes_parsed"
+    pdf_md_dir = args.output_dir / "pdfs_md"
+    store_dirs = [write_synthetic_store(notes_dir, or_venue, args.notes_per_venue) for or_venue in args.venues]
+    run(["parse_notes.py", "--notes", *store_dirs, "--output_dir", parsed_dir])
+    write_md(parsed_dir, pdf_md_dir)
+
+    for name, (options, table) in BUILDS.items():
+        dataset_dir = args.output_dir / "dataset" / name
+        statistics_dir = args.output_dir / "statistics" / name
+        inputs = ["--notes_dir", parsed_dir, "--pdf_md_dir", pdf_md_dir]
+        run(["make_dataset.py", *inputs, "--output_dir", dataset_dir, *options])
+        run(["dataset_statistics.py", "--dataset", dataset_dir / table, "--output_dir", statistics_dir])
+        if name == "notes":
+            reviews = pl.scan_parquet(dataset_dir / table).select(pl.col("reviews").list.len().sum())
+        else:
+            reviews = pl.scan_parquet(dataset_dir / table.replace("papers", "reviews")).select(pl.len())
+        num_reviews = reviews.collect().item()
+        reported = num_reported_reviews(statistics_dir / "statistics.txt")
+        if reported != num_reviews:
+            raise ValueError(f"{name}: dataset_statistics.py reports {reported} reviews, the dataset has {num_reviews}")
+        print(f"{name}: ok, {num_reviews:_} reviews")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print("args:\n" + "\n".join([f"\t{arg}:{value}" for arg, value in vars(args).items()]))
+    main(args)
@@ -18,6 +18,21 @@ def parse_args():
         required=True,
         help="The dataset to compute statistics for.",
     )
+    parser.add_argument(
+        "--templates",
+        type=Path,
+        required=False,
+        default=None,
+        help="The review and decision templates of the dataset. Defaults to templates.zstd.parquet next to --dataset.",
+    )
+    parser.add_argument(
+        "--reviews",
+        type=Path,
+        required=False,
+        default=None,
+        help="The reviews table of a dataset built with make_dataset.py --layout normalized, --dataset is then its papers table. "
+        "Defaults to the reviews table next to a papers table.",
+    )
     parser.add_argument(
         "--output_dir",
         type=Path,
@@ -27,13 +42,30 @@ def parse_args():
     return parser.parse_args()
 
 
+def find_reviews(dataset, reviews):
+    # like scan_dataset in llm_training/prepare_data.py, the reviews of a normalized dataset are next to its papers table
+    if reviews is None and dataset.name in ("papers.zstd.parquet", "papers"):
+        reviews = dataset.parent / dataset.name.replace("papers", "reviews")
+    if reviews is not None:
+        if not reviews.exists():
+            raise FileNotFoundError(f"reviews table {reviews.absolute()} does not exist, pass it with --reviews.")
+    elif "reviews" not in pl.scan_parquet(dataset).collect_schema().names():
+        raise ValueError(f"{dataset} has no reviews column, pass the reviews table of a normalized dataset with --reviews.")
+    return reviews
+
+
 def main(args):
+    # checked before any output is written
+    args.reviews = find_reviews(args.dataset, args.reviews)
 
     args.output_dir.mkdir(exist_ok=True, parents=True)
 
     with open(args.output_dir / "statistics.txt", "w") as f:
 
         df = pl.read_parquet(args.dataset)
+        templates = pl.read_parquet(args.templates or args.dataset.parent / "templates.zstd.parquet")
+        decision_fields = templates.select(pl.col("template_id"), pl.col("content_fields").alias("decision_fields"))
+        df = df.join(decision_fields, left_on=pl.col("decision").struct.field("template_id"), right_on="template_id", how="left")
 
         number_of_papers = df.shape[0]
         print(f"Number of papers: {number_of_papers}", file=f)
@@ -42,7 +74,7 @@ def main(args):
         count_dfs = []
         for df_by_venue in df.partition_by('or_venue'):
             print(f"Venue:{df_by_venue.select('or_venue').unique().item()}", file=f)
-            decision_index = df_by_venue.select(pl.col("decision").struct.field("content_fields").list.eval((pl.element() == 'decision').cast(int)).list.arg_max().mode()).item()
+            decision_index = df_by_venue.select(pl.col("decision_fields").list.eval((pl.element() == 'decision').cast(int)).list.arg_max().mode()).item()
             decision_counts = df_by_venue.select(pl.col("decision").struct.field("content").list.get(decision_index).value_counts()).unnest('content').sort('count', descending=True).rename({'content': 'decision'})
             print(f"Decisions: {decision_counts}", file=f)
             count_dfs.append(decision_counts)
@@ -69,10 +101,13 @@ def main(args):
         plt.savefig(args.output_dir / "num_reviews_per_paper.png")
 
         
-        df = df.explode('reviews')
-        df = df.rename({'reviews': 'review'})
-        print(f"Number of reviews: {df.shape[0]}", file=f)
-        review_lengths = df.select(pl.col('review').struct.field('content').list.join('\n').str.len_chars())
+        # one row per review, without the paper text
+        if args.reviews:
+            reviews = pl.read_parquet(args.reviews)
+        else:
+            reviews = df.select(pl.col('reviews').explode().drop_nulls()).unnest('reviews')
+        print(f"Number of reviews: {reviews.shape[0]}", file=f)
+        review_lengths = reviews.select(pl.col('content').list.join('\n').str.len_chars())
         print(review_lengths.describe(percentiles=(.25, .5, .75, .99)), file=f)
         fig = review_lengths.to_pandas().plot.hist(bins=100)
         fig.set_xlabel("Review length (chars)")
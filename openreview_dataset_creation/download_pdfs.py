@@ -1,12 +1,25 @@
 import argparse
-import time
+import hashlib
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit
 
 import polars as pl
 import requests
 from tqdm.auto import tqdm
 
+from manifest import DONE, FAILED, PENDING, Manifest, blob_path
+from network_utils import TRANSIENT_STATUS, HTTPStatusError, RetryPolicy, TokenBucket, get_session, get_status_code
+
 OPENREVIEW_URL = "https://openreview.net"
+PDF_MAGIC = b"%PDF-"
+PDF_EOF = b"%%EOF"
+PDF_TAIL_BYTES = 1024
+CONTENT_RANGE = re.compile(r"bytes (\d+)-\d+/(\d+|\*)")
 
 
 def parse_args():
@@ -26,46 +39,285 @@ def parse_args():
         help="The output directory.",
     )
     parser.add_argument(
-        "--sleep",
+        "--openreview_url",
+        type=str,
+        required=False,
+        default=OPENREVIEW_URL,
+        help="The site the pdf_urls of the notes are relative to, e.g. mock_openreview_server.py for testing.",
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        required=False,
+        default=4,
+        help="The maximum number of downloads in flight.",
+    )
+    parser.add_argument(
+        "--requests_per_second",
         type=float,
         required=False,
         default=2,
-        help="The sleep interval between downloads (seconds).",
+        help="Global rate limit for requests to openreview, shared by all workers.",
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        required=False,
+        default=4,
+        help="The maximum number of requests that may be sent at once after an idle period.",
+    )
+    parser.add_argument(
+        "--max_attempts",
+        type=int,
+        required=False,
+        default=5,
+        help="How often a download is tried on transient errors (429, 5xx, connection errors) "
+        "before it is marked as failed.",
+    )
+    parser.add_argument(
+        "--max_backoff",
+        type=float,
+        required=False,
+        default=60,
+        help="Upper bound (seconds) of the exponential backoff between retries, unless the server sends Retry-After.",
+    )
+    parser.add_argument(
+        "--breaker_threshold",
+        type=int,
+        required=False,
+        default=5,
+        help="Stop all workers from contacting a host after this many consecutive transient errors.",
+    )
+    parser.add_argument(
+        "--breaker_timeout",
+        type=float,
+        required=False,
+        default=30,
+        help="Seconds until a single probe request is sent to a host that tripped the circuit breaker.",
+    )
+    parser.add_argument(
+        "--chunk_size",
+        type=int,
+        required=False,
+        default=1 << 16,
+        help="The chunk size (bytes) for streaming downloads to disk.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        required=False,
+        default=60,
+        help="Connect/read timeout for a single request (seconds).",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        required=False,
+        default=None,
+        help="sqlite manifest that tracks download status. Defaults to <output_dir>/manifest.sqlite",
+    )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        required=False,
+        help="Only print how many pdfs of notes_df are downloaded, pending or failed.",
+    )
+    parser.add_argument(
+        "--content_addressed",
+        action="store_true",
+        required=False,
+        help="Store pdfs once per content as <output_dir>/sha256/<xx>/<sha256>.pdf instead of <output_dir>/<id>.pdf. "
+        "The id to sha256 mapping is kept in the manifest.",
+    )
+    parser.add_argument(
+        "--only_failed",
+        action="store_true",
+        required=False,
+        help="Only retry downloads that failed before.",
     )
     return parser.parse_args()
 
 
+class DownloadResult(NamedTuple):
+    ok: bool
+    http_status: Optional[int]
+    num_bytes: int
+    sha256: Optional[str]
+    message: str
+
+
+def is_complete_pdf(path: Path, expected_size: Optional[int]) -> bool:
+    size = path.stat().st_size
+    if expected_size is not None and size != expected_size:
+        return False
+    with open(path, "rb") as f:
+        if f.read(len(PDF_MAGIC)) != PDF_MAGIC:
+            return False
+        f.seek(max(0, size - PDF_TAIL_BYTES))
+        return PDF_EOF in f.read()
+
+
+def download_pdf(session, limiter, download_url, outfile, chunk_size, timeout):
+    # stream into a .part file and only rename it to outfile once it is verified,
+    # so a crash never leaves a truncated outfile behind. An existing .part file is resumed with a Range request.
+    partfile = outfile.with_name(outfile.name + ".part")
+    offset = partfile.stat().st_size if partfile.exists() else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+    limiter.acquire()
+    with session.get(download_url, headers=headers, stream=True, timeout=timeout) as res:
+        if res.status_code == 416:
+            # our partial file does not match the remote file anymore, start over next time
+            partfile.unlink()
+            return DownloadResult(False, res.status_code, 0, None, f"Discarded stale partial download {partfile}")
+        if res.status_code in TRANSIENT_STATUS or res.status_code >= 500:
+            # retried by the RetryPolicy
+            raise HTTPStatusError(
+                res.status_code, f"Got status code {res.status_code} for url {download_url}", res.headers
+            )
+        if res.status_code not in (200, 206):
+            # permanent errors like 403 or 404 are not retried
+            message = f"Got status code {res.status_code} for url {download_url}"
+            return DownloadResult(False, res.status_code, 0, None, message)
+
+        sha256 = hashlib.sha256()
+        if res.status_code == 206:
+            content_range = res.headers.get("Content-Range", "")
+            match = CONTENT_RANGE.fullmatch(content_range)
+            if match is None or int(match.group(1)) != offset:
+                partfile.unlink()
+                return DownloadResult(False, res.status_code, 0, None, f"Unexpected Content-Range {content_range!r}")
+            expected_size = int(match.group(2)) if match.group(2) != "*" else None
+            with open(partfile, "rb") as f:
+                for chunk in iter(lambda: f.read(chunk_size), b""):
+                    sha256.update(chunk)
+            mode = "ab"
+        else:
+            # the server ignored our Range header (or there was none), download everything
+            content_length = res.headers.get("Content-Length")
+            encoded = res.headers.get("Content-Encoding", "identity") != "identity"
+            expected_size = int(content_length) if content_length and not encoded else None
+            mode = "wb"
+
+        with open(partfile, mode) as f:
+            for chunk in res.iter_content(chunk_size=chunk_size):
+                sha256.update(chunk)
+                f.write(chunk)
+
+    if not is_complete_pdf(partfile, expected_size):
+        num_bytes = partfile.stat().st_size
+        partfile.unlink()
+        return DownloadResult(
+            False, res.status_code, num_bytes, None, f"Incomplete pdf from {download_url} ({num_bytes:_} bytes), discarded."
+        )
+    num_bytes = partfile.stat().st_size
+    os.replace(partfile, outfile)
+    return DownloadResult(True, res.status_code, num_bytes, sha256.hexdigest(), f"Saved {download_url} to {outfile}")
+
+
+def store_blob(pdf_file: Path, store_dir: Path, sha256: str) -> Path:
+    blob = blob_path(store_dir, sha256)
+    if blob.exists():
+        pdf_file.unlink()
+    else:
+        blob.parent.mkdir(exist_ok=True, parents=True)
+        os.replace(pdf_file, blob)
+    return blob
+
+
 def main(args):
     infile = Path(args.notes_df)
     output_dir = Path(args.output_dir)
     output_dir.mkdir(exist_ok=True, parents=True)
 
+    manifest = Manifest(args.manifest or output_dir / "manifest.sqlite")
+    if manifest.is_empty("downloads"):
+        print(f"Importing existing pdfs from {output_dir} into {manifest.path}")
+        print(f"\timported {manifest.import_downloads(output_dir):_} pdfs")
+
     df = pl.read_parquet(infile).select("id", "pdf_url")
+    manifest.register_downloads(df.rows())
+    status = manifest.get_download_status()
+    if args.status:
+        print(df.select(pl.col("id").replace_strict(status).alias("status")).to_series().value_counts(sort=True))
+        return
 
-    with tqdm(total=len(df), desc="Downloading pdfs", smoothing=0.9) as pbar:
-        for row in df.rows(named=True):
-            outfile = output_dir / f"{row['id']}.pdf"
-            if outfile.exists():
-                pbar.write(f"Skipping {row['id']} : {row['pdf_url']}, already exists.")
-                pbar.update()
-                continue
-            download_url = OPENREVIEW_URL + row["pdf_url"]
-            pbar.write(f"Downloading {download_url}")
-            try:
-                res = requests.get(download_url)
-                if res.status_code == 200:
-                    pbar.write(f"Saving to {outfile}")
-                    pdf_content = res.content
-                    with open(outfile, "wb") as f:
-                        f.write(pdf_content)
+    todo_status = {FAILED} if args.only_failed else {PENDING, FAILED}
+    todo = df.filter(pl.col("id").replace_strict(status).is_in(todo_status))
+    print(f"Skipping {len(df) - len(todo):_} pdfs, already downloaded{' or pending' if args.only_failed else ''}.")
+
+    if args.content_addressed:
+        # the same pdf_url always serves the same bytes, so only download urls we have not stored yet
+        hashes_by_url = manifest.get_hashes_by_url()
+        stored = todo.filter(pl.col("pdf_url").is_in(list(hashes_by_url)))
+        for note_id, pdf_url in stored.rows():
+            manifest.record_download(note_id, DONE, sha256=hashes_by_url[pdf_url], message="deduplicated by pdf_url")
+        todo = todo.filter(~pl.col("pdf_url").is_in(list(hashes_by_url)))
+        print(f"Reusing stored pdfs for {len(stored):_} notes with an already downloaded pdf_url.")
+    downloads = todo.group_by("pdf_url", maintain_order=True).agg("id")
+
+    limiter = TokenBucket(args.requests_per_second, burst=args.burst)
+    retry = RetryPolicy(
+        max_attempts=args.max_attempts,
+        max_delay=args.max_backoff,
+        failure_threshold=args.breaker_threshold,
+        reset_timeout=args.breaker_timeout,
+    )
+    session = get_session(pool_size=args.num_workers)
+    incoming_dir = output_dir / "incoming"
+    if args.content_addressed:
+        incoming_dir.mkdir(exist_ok=True)
+
+    with tqdm(total=len(downloads), desc="Downloading pdfs", smoothing=0.9) as pbar:
+        with ThreadPoolExecutor(max_workers=args.num_workers) as executor:
+            futures = {}
+            for pdf_url, note_ids in downloads.rows():
+                if args.content_addressed:
+                    outfile = incoming_dir / f"{note_ids[0]}.pdf"
                 else:
-                    pbar.write(f"Got status code {res.status_code} for url {download_url}.")
-                    pbar.write("Waiting 60 secs before proceeding.")
-                    time.sleep(60)
-            except requests.exceptions.ChunkedEncodingError as e:
-                continue
-            pbar.update()
-            time.sleep(args.sleep)
+                    outfile = output_dir / f"{note_ids[0]}.pdf"
+                download_url = args.openreview_url + pdf_url
+                future = executor.submit(
+                    retry.call,
+                    download_pdf,
+                    session,
+                    limiter,
+                    download_url,
+                    outfile,
+                    args.chunk_size,
+                    args.timeout,
+                    host=urlsplit(download_url).netloc,
+                )
+                futures[future] = note_ids, download_url, outfile
+            for future in as_completed(futures):
+                note_ids, download_url, outfile = futures[future]
+                try:
+                    result = future.result()
+                except (requests.exceptions.RequestException, HTTPStatusError) as e:
+                    result = DownloadResult(
+                        False, get_status_code(e), 0, None, f"Failed to download {download_url}: {e}"
+                    )
+                if result.ok:
+                    if args.content_addressed:
+                        store_blob(outfile, output_dir / "sha256", result.sha256)
+                    else:
+                        # several notes sharing one pdf_url each get their own copy
+                        for note_id in note_ids[1:]:
+                            shutil.copyfile(outfile, output_dir / f"{note_id}.pdf")
+                for note_id in note_ids:
+                    manifest.record_download(
+                        note_id,
+                        DONE if result.ok else FAILED,
+                        http_status=result.http_status,
+                        num_bytes=result.num_bytes,
+                        sha256=result.sha256,
+                        message=result.message,
+                    )
+                pbar.write(result.message)
+                pbar.update()
+
+    print(f"manifest: {manifest.summary()['downloads']}")
+    manifest.close()
 
 
 if __name__ == "__main__":
@@ -1,22 +1,55 @@
 import argparse
 import json
-import pickle
-from pathlib import Path
 import os
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 
-from openreview_utils import get_client
+from invitation_cache import InvitationCache
+from network_utils import TokenBucket
+from note_parsers import NOTE_DETAILS, get_note_details
+from note_store import NoteShardWriter, iter_notes, store_dir_for, store_exists
+from openreview_utils import API_V1_URL, API_V2_URL, ClientPool, iter_all_notes, iter_notes_modified_since
 
 
 def parse_args():
     parser = argparse.ArgumentParser(
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
     )
-    parser.add_argument(
+    venue_group = parser.add_mutually_exclusive_group(required=True)
+    venue_group.add_argument(
         "--or_venue",
         type=str,
-        required=True,
         help="The venue to get notes for, e.g. 'ICLR.cc/2022/Conference'",
     )
+    venue_group.add_argument(
+        "--or_venues_file",
+        type=str,
+        help="A file with one venue per line (e.g. or_venues.txt from get_openreview_venues.py). All venues are crawled concurrently.",
+    )
+    parser.add_argument(
+        "--venue_filter",
+        type=str,
+        required=False,
+        default=None,
+        help="Only crawl venues from or_venues_file matching this regex, e.g. '^ICLR.cc/20[0-9]+/Conference$'",
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        required=False,
+        default=4,
+        help="The number of venues crawled concurrently.",
+    )
+    parser.add_argument(
+        "--requests_per_second",
+        type=float,
+        required=False,
+        default=None,
+        help="Global rate limit for requests to the OpenReview API, shared by all venues. Unlimited if not set.",
+    )
     parser.add_argument(
         "--output_dir",
         type=str,
@@ -29,89 +62,223 @@ def parse_args():
         required=False,
         help="Force getting notes even if file exists.",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        required=False,
+        help="If the output exists, only fetch notes modified since the last sync and merge them into it.",
+    )
+    parser.add_argument(
+        "--details",
+        type=str,
+        required=False,
+        choices=["all", "parser"],
+        default="all",
+        help="Which note details to fetch and store. 'parser' only fetches the details the venue's note parser reads "
+        "(no full 'replies' tree), which makes responses and stored notes much smaller.",
+    )
+    parser.add_argument(
+        "--invitation_cache_dir",
+        type=str,
+        required=False,
+        default=None,
+        help="Directory for cached invitations (submission and reply templates), shared by all venues and runs. "
+        "Defaults to <output_dir>/invitations",
+    )
+    parser.add_argument(
+        "--refresh_invitations",
+        action="store_true",
+        required=False,
+        help="Fetch all invitations again instead of using the cached ones.",
+    )
+    parser.add_argument(
+        "--api_v1_url",
+        type=str,
+        required=False,
+        default=API_V1_URL,
+        help="Base url of the OpenReview API V1, e.g. of mock_openreview_server.py for testing.",
+    )
+    parser.add_argument(
+        "--api_v2_url",
+        type=str,
+        required=False,
+        default=API_V2_URL,
+        help="Base url of the OpenReview API V2.",
+    )
     return parser.parse_args()
 
 
-def main(args):
-    output_dir = Path(args.output_dir)
-    output_dir.mkdir(exist_ok=True, parents=True)
-    outfile = Path(args.output_dir) / f"{args.or_venue.replace('/', '_')}.pkl"
-    if outfile.exists():
-        if not args.force:
-            raise FileExistsError(f"output file {outfile.absolute()} already exists.")
+def iter_notes_v2(client, or_venue, details="all"):
+    venue_group = client.get_group(or_venue)
+    if not venue_group.content:
+        print("failed to get information from API V2")
+        return
+    submission_name = venue_group.content["submission_name"]["value"]
+    yield from iter_all_notes(
+        client, invitation=f"{or_venue}/-/{submission_name}", details=details
+    )
 
-    notes = dict()
-    # Following https://docs.openreview.net/how-to-guides/data-retrieval-and-modification/how-to-get-all-reviews
-    # v2
-    api_v2 = True
-    print("trying API V2")
-    or_username = os.environ.get('OPENREVIEW_USERNAME')
-    or_password = os.environ.get('OPENREVIEW_PASSWORD')
-    if not or_username or not or_password:
-        raise ValueError("OPENREVIEW_USERNAME and OPENREVIEW_PASSWORD must be set as environment variables")
-    client = get_client(
-        version=2, or_username=or_username, or_password=or_password
-    )
-    venue_group = client.get_group(args.or_venue)
-    if venue_group.content:
-        submission_name = venue_group.content["submission_name"]["value"]
-        notes = client.get_all_notes(
-            invitation=f"{args.or_venue}/-/{submission_name}", details="all"
-        )
-        notes = {note.id: note for note in notes}
-    else:
-        "failed to get information from API V2"
-    if not notes:
-        print("could not find any notes.")
-        print("switching to V1 API and trying again")
-        # v1
-        api_v2 = False
-        print("trying API V1")
-        client = get_client(
-            version=1, or_username=or_username, or_password=or_password
-        )
-        print("trying to find notes by invitation: /-/Blind_Submission")
-        notes_doubleblind = client.get_all_notes(
-            invitation=f"{args.or_venue}/-/Blind_Submission", details="all"
-        )
-        notes_doubleblind = {note.id: note for note in notes_doubleblind}
-        print(f"\tgot {len(notes_doubleblind)} notes")
-        notes.update(notes_doubleblind)
-        print("trying to find notes by invitation: /-/Submission")
-        notes_singleblind = client.get_all_notes(
-            invitation=f"{args.or_venue}/-/Submission", details="all"
-        )
-        notes_singleblind = {note.id: note for note in notes_singleblind}
-        print(f"\tgot {len(notes_singleblind)} notes")
-        notes.update(notes_singleblind)
 
-    print(f"Got {len(notes):_} unique notes.")
-    if not notes:
-        raise ValueError(
-            f"No notes to process. Did you provide a correct venue?\n{args.or_venue}"
-        )
+def prefetch(iterator, executor, max_prefetch, stop):
+    # starts iterating in a thread of the executor right away, at most max_prefetch items ahead of the consumer.
+    # Setting `stop` makes the thread give up, e.g. when the consumer fails.
+    items = queue.Queue(maxsize=max_prefetch)
+    done = object()
 
-    rows = []
-    for note in notes.values():
-        note_dict = note.__dict__
-        note_dict["or_venue"] = args.or_venue
-        rows.append(note_dict)
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
 
-    print(f"writing notes to {outfile.absolute()}")
-    with open(outfile, "wb") as f:
-        pickle.dump(rows, f)
+    def produce():
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+        finally:
+            put(done)
 
-    # get reply templates
+    future = executor.submit(produce)
+
+    def consume():
+        while (item := items.get()) is not done:
+            yield item
+        # raises the exception of the producer, if any
+        future.result()
+
+    return consume()
+
+
+def iter_notes_v1(client, or_venue, details="all", max_prefetch=1000):
+    # Submission notes are fetched in the background while Blind_Submission notes are streamed, at most max_prefetch
+    # notes ahead. Blind_Submission notes still come first so they win the deduplication by id.
+    print("trying to find notes by invitations: /-/Blind_Submission, /-/Submission")
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        try:
+            submissions = prefetch(
+                iter_all_notes(client, invitation=f"{or_venue}/-/Submission", details=details),
+                executor,
+                max_prefetch,
+                stop,
+            )
+            num_notes = 0
+            for note in iter_all_notes(client, invitation=f"{or_venue}/-/Blind_Submission", details=details):
+                num_notes += 1
+                yield note
+            print(f"\t/-/Blind_Submission: got {num_notes} notes")
+            num_notes = 0
+            for note in submissions:
+                num_notes += 1
+                yield note
+            print(f"\t/-/Submission: got {num_notes} notes")
+        finally:
+            stop.set()
+
+
+# how far each incremental sync reaches back before the newest tmdate of the previous one
+SYNC_OVERLAP_MS = 60 * 60 * 1000
+
+
+def get_submission_invitations(client, or_venue, api_v2):
+    if api_v2:
+        submission_name = client.get_group(or_venue).content["submission_name"]["value"]
+        return {f"{or_venue}/-/{submission_name}"}
+    return {f"{or_venue}/-/Blind_Submission", f"{or_venue}/-/Submission"}
+
+
+def get_changed_notes(client, or_venue, api_v2, since, details="all"):
+    # every note of a venue (submissions, reviews, comments, ...) belongs to a forum, which is the id of its submission.
+    # Refetch the submissions of all forums that have a note modified after (about) `since`.
+    # Notes edited while the previous sync paged through the modified notes move to the front, which shifts the later
+    # notes by one offset, so a note at a page boundary can be skipped although it is older than the watermark that
+    # was saved. Every sync therefore starts SYNC_OVERLAP_MS before the watermark and refetches the forums of that
+    # overlap again, the merge replaces them by id.
+    start = since - SYNC_OVERLAP_MS
     if api_v2:
-        invitations = [
-            reply["invitations"][0]
-            for note in rows
-            for reply in note["details"]["replies"]
-        ]
+        modified = iter_notes_modified_since(client, start, domain=or_venue)
     else:
-        invitations = [
-            reply["invitation"] for note in rows for reply in note["details"]["replies"]
-        ]
+        modified = iter_notes_modified_since(client, start, invitation=f"{or_venue}/.*")
+    changed_forums = set()
+    max_tmdate = since
+    for note in modified:
+        changed_forums.add(note.forum)
+        max_tmdate = max(max_tmdate, note.tmdate)
+    print(f"{len(changed_forums):_} forums changed since tmdate {start} (watermark {since})")
+
+    submission_invitations = get_submission_invitations(client, or_venue, api_v2)
+    notes = dict()
+    for forum in sorted(changed_forums):
+        for note in client.get_notes(id=forum, details=details):
+            invitations = note.invitations if api_v2 else [note.invitation]
+            if submission_invitations.intersection(invitations):
+                notes[note.id] = note
+    return notes, max_tmdate
+
+
+def to_row(note, or_venue):
+    note_dict = note.__dict__
+    note_dict["or_venue"] = or_venue
+    return note_dict
+
+
+class NotesSummary:
+    # what we need to know about the notes after they have been streamed to disk
+    def __init__(self, api_v2):
+        self.api_v2 = api_v2
+        self.num_notes = 0
+        self.max_tmdate = 0
+        self.invitations = []
+        self.submission_invitation = None
+        self.submission_template = None
+
+    def add(self, row):
+        self.num_notes += 1
+        # without the "replies" detail, templates and the sync watermark are based on the direct replies only
+        replies = row["details"].get("replies", row["details"]["directReplies"])
+        self.max_tmdate = max([self.max_tmdate, row.get("tmdate") or 0] + [reply.get("tmdate") or 0 for reply in replies])
+        if self.api_v2:
+            self.invitations.extend(reply["invitations"][0] for reply in replies)
+        else:
+            self.invitations.extend(reply["invitation"] for reply in replies)
+        if self.submission_invitation is None:
+            self.submission_invitation = row["invitations"][0] if self.api_v2 else row["invitation"]
+            self.submission_template = row["details"].get("invitation")
+
+
+def get_details(or_venue, details_profile):
+    if details_profile == "all":
+        return "all"
+    if or_venue not in NOTE_DETAILS:
+        print(f"{or_venue}: no note parser for this venue, fetching all details.")
+        return "all"
+    return ",".join(get_note_details(or_venue))
+
+
+def write_notes(rows, store_dir, or_venue, api_v2, details):
+    print(f"writing notes to {store_dir.absolute()}")
+    summary = NotesSummary(api_v2)
+    with NoteShardWriter(store_dir, or_venue, details=details) as writer:
+        for row in rows:
+            if writer.write(row):
+                summary.add(row)
+    return summary
+
+
+def write_sync_state(sync_file, or_venue, api_v2, max_tmdate, details):
+    with open(sync_file, "w") as f:
+        json.dump(
+            {"or_venue": or_venue, "api_version": 2 if api_v2 else 1, "max_tmdate": max_tmdate, "details": details}, f
+        )
+
+
+def write_templates(client, summary, store_dir, invitation_cache):
+    # get reply templates
+    invitations = summary.invitations
     invitation_types = sorted(list(set([inv.split("/")[-1] for inv in invitations])))
     selected_invs = []
     for invitation_type in invitation_types:
@@ -119,15 +286,17 @@ def main(args):
             if invitation_type in inv:
                 selected_invs.append(inv)
                 break
-    selected_invs = [
-        client.get_invitations(id=inv, expired=True)[0].__dict__
-        for inv in selected_invs
-    ]
+    selected_invs = invitation_cache.get_many(client, selected_invs)
 
     # get submission template
-    submission_template = rows[0]["details"]["invitation"]
+    submission_template = summary.submission_template
+    if submission_template is None:
+        # not fetched as a note detail
+        submission_template = invitation_cache.get(client, summary.submission_invitation)
+    else:
+        invitation_cache.put(summary.submission_invitation, submission_template)
 
-    outfile = outfile.parent / f"{outfile.stem}.template.json"
+    outfile = store_dir.parent / f"{store_dir.name}.template.json"
     print(f"writing templates to {outfile.absolute()}")
     with open(outfile, "w") as f:
         json.dump(
@@ -139,6 +308,141 @@ def main(args):
         )
 
 
+def sync_notes(or_venue, store_dir, sync_file, pool, invitation_cache):
+    with open(sync_file, "r") as f:
+        sync_state = json.load(f)
+    api_v2 = sync_state["api_version"] == 2
+    # keep the details of the existing notes
+    details = sync_state.get("details", "all")
+    with pool.client(sync_state["api_version"]) as client:
+        notes, max_tmdate = get_changed_notes(client, or_venue, api_v2, sync_state["max_tmdate"], details)
+        if not notes:
+            print(f"{or_venue}: notes are up to date.")
+            write_sync_state(sync_file, or_venue, api_v2, max_tmdate, details)
+            return
+
+        changed_rows = {note.id: to_row(note, or_venue) for note in notes.values()}
+
+        def merged_rows():
+            for row in iter_notes(store_dir):
+                yield changed_rows.pop(row["id"], row)
+            print(f"{or_venue}: adding {len(changed_rows):_} new notes.")
+            yield from changed_rows.values()
+
+        # the merged notes are streamed into a new store, which replaces the old one once it is complete
+        summary = write_notes(merged_rows(), store_dir, or_venue, api_v2, details)
+        print(f"{or_venue}: merged {len(notes):_} changed notes, {summary.num_notes:_} notes in total.")
+
+        write_templates(client, summary, store_dir, invitation_cache)
+    write_sync_state(sync_file, or_venue, api_v2, max(max_tmdate, summary.max_tmdate), details)
+
+
+def crawl_venue(or_venue, output_dir, pool, invitation_cache, force=False, incremental=False, details_profile="all"):
+    store_dir = store_dir_for(output_dir, or_venue)
+    sync_file = store_dir.parent / f"{store_dir.name}.sync.json"
+
+    if store_exists(store_dir):
+        if incremental and sync_file.exists():
+            sync_notes(or_venue, store_dir, sync_file, pool, invitation_cache)
+            return store_dir
+        if incremental:
+            print(f"no sync state found at {sync_file.absolute()}, getting all notes.")
+        elif not force:
+            raise FileExistsError(f"output {store_dir.absolute()} already exists.")
+
+    # Following https://docs.openreview.net/how-to-guides/data-retrieval-and-modification/how-to-get-all-reviews
+    # notes are written to disk page by page as they arrive
+    details = get_details(or_venue, details_profile)
+    # v2
+    api_v2 = True
+    print(f"{or_venue}: trying API V2")
+    with pool.client(2) as client:
+        rows = (to_row(note, or_venue) for note in iter_notes_v2(client, or_venue, details))
+        summary = write_notes(rows, store_dir, or_venue, api_v2, details)
+    if not summary.num_notes:
+        print(f"{or_venue}: could not find any notes.")
+        print("switching to V1 API and trying again")
+        # v1
+        api_v2 = False
+        print(f"{or_venue}: trying API V1")
+        with pool.client(1) as client:
+            rows = (to_row(note, or_venue) for note in iter_notes_v1(client, or_venue, details))
+            summary = write_notes(rows, store_dir, or_venue, api_v2, details)
+
+    print(f"{or_venue}: Got {summary.num_notes:_} unique notes.")
+    if not summary.num_notes:
+        raise ValueError(
+            f"No notes to process. Did you provide a correct venue?\n{or_venue}"
+        )
+
+    with pool.client(2 if api_v2 else 1) as client:
+        write_templates(client, summary, store_dir, invitation_cache)
+    write_sync_state(sync_file, or_venue, api_v2, summary.max_tmdate, details)
+    return store_dir
+
+
+def read_venues(or_venues_file, venue_filter=None):
+    with open(or_venues_file, "r") as f:
+        venues = [line.strip() for line in f if line.strip()]
+    if venue_filter:
+        pattern = re.compile(venue_filter)
+        venues = [venue for venue in venues if pattern.search(venue)]
+    return venues
+
+
+def main(args):
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(exist_ok=True, parents=True)
+
+    or_username = os.environ.get('OPENREVIEW_USERNAME')
+    or_password = os.environ.get('OPENREVIEW_PASSWORD')
+    if not or_username or not or_password:
+        raise ValueError("OPENREVIEW_USERNAME and OPENREVIEW_PASSWORD must be set as environment variables")
+
+    limiter = None
+    if args.requests_per_second:
+        limiter = TokenBucket(args.requests_per_second, burst=args.num_workers)
+    pool = ClientPool(or_username, or_password, limiter=limiter, baseurls={1: args.api_v1_url, 2: args.api_v2_url})
+    invitation_cache = InvitationCache(
+        args.invitation_cache_dir or output_dir / "invitations", refresh=args.refresh_invitations
+    )
+
+    if args.or_venue:
+        crawl_venue(
+            args.or_venue,
+            output_dir,
+            pool,
+            invitation_cache,
+            force=args.force,
+            incremental=args.incremental,
+            details_profile=args.details,
+        )
+        print(f"invitation cache: {invitation_cache.hits:_} hits, {invitation_cache.misses:_} misses")
+        return
+
+    venues = read_venues(args.or_venues_file, args.venue_filter)
+    print(f"Crawling {len(venues):_} venues with {args.num_workers} workers.")
+    failed = dict()
+    with ThreadPoolExecutor(max_workers=args.num_workers) as executor:
+        futures = {
+            executor.submit(
+                crawl_venue, venue, output_dir, pool, invitation_cache, args.force, args.incremental, args.details
+            ): venue
+            for venue in venues
+        }
+        for future in as_completed(futures):
+            venue = futures[future]
+            try:
+                print(f"{venue}: done, wrote {future.result()}")
+            except Exception as e:
+                print(f"{venue}: failed with {e!r}")
+                failed[venue] = e
+    print(f"Finished {len(venues) - len(failed):_}/{len(venues):_} venues.")
+    print(f"invitation cache: {invitation_cache.hits:_} hits, {invitation_cache.misses:_} misses")
+    if failed:
+        print("Failed venues:\n" + "\n".join(f"\t{venue}: {e!r}" for venue, e in failed.items()))
+
+
 if __name__ == "__main__":
     args = parse_args()
     print(
@@ -3,7 +3,7 @@ from pathlib import Path
 import openreview
 import os
 
-from openreview_utils import get_client
+from openreview_utils import API_V2_URL, get_client
 
 
 def parse_args():
@@ -14,6 +14,13 @@ def parse_args():
         required=True,
         help="The output directory.",
     )
+    parser.add_argument(
+        "--api_v2_url",
+        type=str,
+        required=False,
+        default=API_V2_URL,
+        help="Base url of the OpenReview API V2.",
+    )
     return parser.parse_args()
 
 
@@ -26,7 +33,7 @@ def main(args):
         raise ValueError("OPENREVIEW_USERNAME and OPENREVIEW_PASSWORD must be set as environment variables")
 
     client = get_client(
-        version=2, or_username=or_username, or_password=or_password
+        version=2, or_username=or_username, or_password=or_password, baseurl=args.api_v2_url
     )
     
     venues_group = client.get_group(id="venues")
@@ -0,0 +1,55 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Invitations (submission and reply templates) rarely change once a venue is set up. They are cached on disk as
+# <cache_dir>/<invitation id with "/" replaced by "_">.json and shared by all venues and runs.
+
+
+class InvitationCache:
+    def __init__(self, cache_dir: Path, refresh: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(exist_ok=True, parents=True)
+        # with refresh, every invitation is fetched again once per run
+        self.refresh = refresh
+        self.refreshed = set()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, invitation_id: str) -> Path:
+        return self.cache_dir / f"{invitation_id.replace('/', '_')}.json"
+
+    def put(self, invitation_id: str, invitation: Dict[str, Any]):
+        path = self.path(invitation_id)
+        tmpfile = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmpfile, "w") as f:
+            json.dump(invitation, f)
+        os.replace(tmpfile, path)
+        with self.lock:
+            self.refreshed.add(invitation_id)
+
+    def load(self, invitation_id: str):
+        path = self.path(invitation_id)
+        with self.lock:
+            if not path.exists() or (self.refresh and invitation_id not in self.refreshed):
+                self.misses += 1
+                return None
+            self.hits += 1
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def get(self, client, invitation_id: str) -> Dict[str, Any]:
+        invitation = self.load(invitation_id)
+        if invitation is None:
+            invitation = client.get_invitations(id=invitation_id, expired=True)[0].__dict__
+            self.put(invitation_id, invitation)
+        return invitation
+
+    def get_many(self, client, invitation_ids: List[str], num_workers: int = 4) -> List[Dict[str, Any]]:
+        # cache misses are fetched concurrently, the result keeps the order of invitation_ids
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            return list(executor.map(lambda invitation_id: self.get(client, invitation_id), invitation_ids))
@@ -1,9 +1,23 @@
 import argparse
-
+import os
+import shutil
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from urllib.parse import quote
+
 import polars as pl
+import pyarrow.parquet as pq
 from tqdm.auto import tqdm
 
+from build_state import file_stamp, fingerprint, read_build_state, write_build_state
+from manifest import Manifest
+from md_corpus import MdCorpus
+from md_sections import get_section_indices
+from note_parsers import get_templates
+from parse_notes import REPLY_COLUMNS
+
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -15,38 +29,179 @@ def parse_args():
         required=True,
         help="directory containing parsed notes",
     )
-    parser.add_argument(
+    md_source = parser.add_mutually_exclusive_group(required=True)
+    md_source.add_argument(
         "--pdf_md_dir",
         type=Path,
-        required=True,
         help="directory containing pdf md files",
     )
+    md_source.add_argument(
+        "--md_corpus",
+        type=Path,
+        help="packed md corpus (see md_corpus.py) to read the md text from instead of --pdf_md_dir",
+    )
     parser.add_argument(
         "--output_dir",
         type=Path,
         required=True,
         help="The output directory.",
     )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        required=False,
+        default=None,
+        help="sqlite manifest of a content-addressed pdf store. If set, md files are looked up by the sha256 of each note's pdf.",
+    )
+    parser.add_argument(
+        "--layout",
+        type=str,
+        required=False,
+        choices=["notes", "normalized"],
+        default="notes",
+        help="'notes' writes notes.zstd.parquet with the reviews of every paper in a list column. "
+        "'normalized' writes papers.zstd.parquet without the reviews and reviews.zstd.parquet with one row per review, "
+        "keyed by forum (the id of the paper) and id.",
+    )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        required=False,
+        default=1000,
+        help="The number of notes whose md text is loaded at once, each batch is written as one parquet row group.",
+    )
+    parser.add_argument(
+        "--num_threads",
+        type=int,
+        required=False,
+        default=16,
+        help="The number of md files read in parallel.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Write every table partitioned by venue, <output_dir>/<table>/or_venue=<venue>/, with the rows sorted by id. "
+        "Only the partitions of venues whose notes or md changed since the last --incremental run are rebuilt.",
+    )
     return parser.parse_args()
 
 
-def read_notes(notes_dir: Path) -> pl.DataFrame:
-    dfs = []
-    for file in sorted(list(notes_dir.glob("**/*.parquet"))):
-        print(f"reading file: {file}")
-        df = pl.read_parquet(file)
-        print(df.shape)
-        dfs.append(df)
-    return pl.concat(dfs, how="vertical_relaxed")
+# the output tables of each layout
+TABLES = {
+    "notes": ["notes.zstd.parquet"],
+    "normalized": ["papers.zstd.parquet", "reviews.zstd.parquet"],
+}
+
+
+def reply_types(file) -> str:
+    schema = pl.read_parquet_schema(file)
+    return ", ".join(f"{column}: {type(schema[column]).__name__}" for column in REPLY_COLUMNS)
+
+
+def scan_notes(files) -> pl.LazyFrame:
+    print(f"scanning {len(files):_} notes files")
+    # nested replies of different inputs are cast to their common supertype, like parse_notes.py does for the shards
+    # of one input
+    lf = pl.concat([pl.scan_parquet(file) for file in files], how="vertical_relaxed")
+    # replies are json strings (String) or nested (List), inputs without any replies have the Null type
+    kinds = {type(pl.read_parquet_schema(file)[column]) for file in files for column in REPLY_COLUMNS}
+    try:
+        if len(kinds - {pl.Null}) > 1:
+            raise pl.exceptions.SchemaError("json and nested replies")
+        lf.collect_schema()
+    except pl.exceptions.SchemaError as e:
+        # e.g. the nested replies of API v1 and v2 venues
+        raise ValueError(
+            f"the replies of the notes files have incompatible types ({str(e).splitlines()[0]}), parse them with "
+            "parse_notes.py --replies_format json to combine them. Reply types of the notes files:\n"
+            + "\n".join(f"{file}: {reply_types(file)}" for file in files)
+        ) from e
+    return lf
 
 
-def load_text(note_id, pdf_md_dir: Path):
-    md_file = pdf_md_dir / note_id / f"{note_id}.md"
+def load_text(name, pdf_md_dir: Path):
+    md_file = pdf_md_dir / name / f"{name}.md"
     with open(md_file, "r") as f:
         content = f.read()
     return content
 
 
+def get_tables(df: pl.DataFrame, texts, layout: str):
+    # the output rows of a batch of notes, by output file name
+    df = df.with_columns(pl.Series(name="pdf_md", values=texts, dtype=pl.String)).drop("md_name")
+    # headings and the main text/appendix split, so that later steps can slice the text instead of searching it
+    df = df.with_columns(get_section_indices(texts).alias("pdf_md_sections"))
+    # add some useful columns
+    df = df.with_columns(num_reviews=pl.col("reviews").list.len())
+    df = df.with_columns(pdf_md_num_chars=pl.col("pdf_md").str.len_chars())
+    # df = df.with_columns(pdf_md_main_text_num_chars=pl.col("pdf_md_main_text").str.len_chars())
+    # df = df.with_columns(pdf_md_appendix_text_num_chars=pl.col("pdf_md_appendix_text").str.len_chars())
+    if layout == "notes":
+        return {"notes.zstd.parquet": df}
+    # reviews are stored once, without a copy of the paper text per review
+    reviews = df.select(pl.col("reviews").explode().drop_nulls()).unnest("reviews")
+    return {"papers.zstd.parquet": df.drop("reviews"), "reviews.zstd.parquet": reviews}
+
+
+def write_tables(notes: pl.LazyFrame, read_text, layout: str, outfiles, batch_size: int, executor, desc: str):
+    # notes are streamed in batches, the md text of a batch is read in parallel and appended to the outputs as one
+    # row group, outputs are only moved into place when complete
+    num_notes = notes.select(pl.len()).collect().item()
+    tmpfiles = dict()
+    writers = dict()
+    for name, table in get_tables(notes.clear().collect(), [], layout).items():
+        outfiles[name].parent.mkdir(exist_ok=True, parents=True)
+        tmpfiles[name] = outfiles[name].with_name(f"{outfiles[name].name}.tmp")
+        schema = table.to_arrow().schema
+        # a dictionary of the unique paper texts only costs memory
+        use_dictionary = [column for column in schema.names if column != "pdf_md"]
+        writers[name] = pq.ParquetWriter(
+            tmpfiles[name], schema, compression="zstd", compression_level=3, use_dictionary=use_dictionary
+        )
+    num_rows = dict.fromkeys(writers, 0)
+    with tqdm(total=num_notes, desc=desc) as progress:
+        for df in notes.collect_batches(chunk_size=batch_size):
+            texts = list(executor.map(read_text, df["md_name"]))
+            for name, table in get_tables(df, texts, layout).items():
+                if table.height:
+                    writers[name].write_table(table.to_arrow().cast(writers[name].schema))
+                    num_rows[name] += table.height
+            progress.update(df.height)
+    for name, writer in writers.items():
+        writer.close()
+        os.replace(tmpfiles[name], outfiles[name])
+        print(f"{outfiles[name]}: {num_rows[name]:_} rows")
+
+
+def partition_dir(output_dir: Path, name: str, or_venue: str) -> Path:
+    # hive partitions as polars writes them, the venue is percent-encoded
+    return output_dir / name.removesuffix(".zstd.parquet") / f"or_venue={quote(or_venue, safe='')}"
+
+
+def get_venue_inputs(notes_files, notes: pl.LazyFrame, md_stamp, layout: str, executor):
+    # the fingerprint of everything a venue partition is built from
+    venue_files = defaultdict(list)
+    for file in notes_files:
+        for or_venue in pl.scan_parquet(file).select(pl.col("or_venue").unique()).collect()["or_venue"]:
+            venue_files[or_venue].append(file_stamp(file))
+    md_names = notes.select("or_venue", "md_name").collect()
+    md_stamps = dict(zip(md_names["md_name"], executor.map(md_stamp, md_names["md_name"])))
+    # a new venue or a new version of this script can change the schema of all partitions
+    empty = notes.clear().collect()
+    schema = str({name: table.schema for name, table in get_tables(empty, [], layout).items()})
+    return {
+        or_venue: fingerprint(
+            dict(
+                notes=venue_files[or_venue],
+                md=[md_stamps[name] for name in sorted(group["md_name"])],
+                layout=layout,
+                schema=schema,
+            )
+        )
+        for (or_venue,), group in md_names.group_by("or_venue")
+    }
+
+
 def main(args):
     # args = argparse.Namespace()
     # args.notes_dir = Path("data/notes_parsed")
@@ -56,28 +211,81 @@ def main(args):
     args.output_dir.mkdir(exist_ok=True, parents=True)
 
 
-    outfile = args.output_dir / "notes.zstd.parquet"
-    if outfile.exists():
-        raise FileExistsError(f"output file {outfile.absolute()} already exists.")
+    outfiles = {name: args.output_dir / name for name in TABLES[args.layout]}
+    for outfile in outfiles.values():
+        if outfile.exists() and not args.incremental:
+            raise FileExistsError(f"output file {outfile.absolute()} already exists.")
 
-    df = read_notes(args.notes_dir)
-    print(df.shape)
+    notes_files = sorted(list(args.notes_dir.glob("**/*.parquet")))
+    notes = scan_notes(notes_files)
 
-    # add text
-    texts = []
-    for row in tqdm(df.select(pl.col("id")).rows(named=True), desc="loading md text"):
-        text = load_text(row["id"], args.pdf_md_dir)
-        texts.append(text)
-    df = df.with_columns(pl.Series(name="pdf_md", values=texts))
-    
-    # add some useful columns    # add some useful columns
-    df = df.with_columns(num_reviews=pl.col("reviews").list.len())
-    df = df.with_columns(pdf_md_num_chars=pl.col("pdf_md").str.len_chars())
-    # df = df.with_columns(pdf_md_main_text_num_chars=pl.col("pdf_md_main_text").str.len_chars())
-    # df = df.with_columns(pdf_md_appendix_text_num_chars=pl.col("pdf_md_appendix_text").str.len_chars())
-    
+    # the review and decision rubrics, which rows reference by template_id
+    template_ids = notes.select(
+        pl.concat_list(
+            pl.col("reviews").list.eval(pl.element().struct.field("template_id")),
+            pl.col("decision").struct.field("template_id"),
+        )
+        .explode()
+        .drop_nulls()
+        .unique()
+    ).collect()
+    templates = get_templates(template_ids.to_series())
+    print(f"templates: {templates.height}")
+
+    # md files are named by note id, or by pdf sha256 for a content-addressed store
+    if args.manifest:
+        manifest = Manifest(args.manifest)
+        hashes = manifest.get_hashes()
+        manifest.close()
+        md_names = pl.DataFrame(list(hashes.items()), schema={"id": pl.String, "md_name": pl.String}, orient="row")
+        notes = notes.join(md_names.lazy(), on="id", how="left", maintain_order="left")
+        missing = notes.filter(pl.col("md_name").is_null()).select(pl.len()).collect().item()
+        if missing:
+            raise ValueError(f"{missing} notes have no downloaded pdf in {args.manifest}")
+    else:
+        notes = notes.with_columns(md_name=pl.col("id"))
+
+    if args.md_corpus:
+        corpus = MdCorpus(args.md_corpus)
+        read_text = corpus.get
+
+        def md_stamp(name):
+            entry = corpus.entries[name]
+            return [name, corpus.shard_files[entry.shard].name, entry.offset, entry.length]
+
+    else:
+        read_text = partial(load_text, pdf_md_dir=args.pdf_md_dir)
+
+        def md_stamp(name):
+            return file_stamp(args.pdf_md_dir / name / f"{name}.md")
 
-    df.write_parquet(outfile)
+    with ThreadPoolExecutor(max_workers=args.num_threads) as executor:
+        if not args.incremental:
+            write_tables(notes, read_text, args.layout, outfiles, args.batch_size, executor, "adding md text")
+        else:
+            state = read_build_state(args.output_dir)
+            venue_inputs = get_venue_inputs(notes_files, notes, md_stamp, args.layout, executor)
+            for or_venue in sorted(set(state) - set(venue_inputs)):
+                print(f"{or_venue}: no longer in {args.notes_dir}, removing its partitions")
+                for name in sum(TABLES.values(), []):
+                    shutil.rmtree(partition_dir(args.output_dir, name, or_venue), ignore_errors=True)
+                del state[or_venue]
+                write_build_state(args.output_dir, state)
+            changed = [or_venue for or_venue in sorted(venue_inputs) if state.get(or_venue) != venue_inputs[or_venue]]
+            print(f"rebuilding {len(changed):_} of {len(venue_inputs):_} venues: {changed}")
+            for or_venue in changed:
+                venue_outfiles = {
+                    name: partition_dir(args.output_dir, name, or_venue) / "part-00000.zstd.parquet"
+                    for name in TABLES[args.layout]
+                }
+                # sorted row groups let filters on id skip most of them
+                venue_notes = notes.filter(pl.col("or_venue") == or_venue).sort("id")
+                write_tables(venue_notes, read_text, args.layout, venue_outfiles, args.batch_size, executor, or_venue)
+                state[or_venue] = venue_inputs[or_venue]
+                write_build_state(args.output_dir, state)
+    if args.md_corpus:
+        corpus.close()
+    templates.write_parquet(args.output_dir / "templates.zstd.parquet")
 
 if __name__ == "__main__":
     args = parse_args()
@@ -0,0 +1,156 @@
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Persistent record of which pdfs have been downloaded and converted, so that scripts can plan their work with
+# one query instead of probing the filesystem for every note.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    id TEXT PRIMARY KEY,
+    pdf_url TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    num_bytes INTEGER,
+    sha256 TEXT,
+    http_status INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    message TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS conversions (
+    name TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    message TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+def blob_path(store_dir: Path, sha256: str, suffix: str = ".pdf") -> Path:
+    # content-addressed layout: <store_dir>/<first two hex chars>/<sha256><suffix>
+    return Path(store_dir) / sha256[:2] / f"{sha256}{suffix}"
+
+
+class Manifest:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        self.conn = sqlite3.connect(self.path, timeout=60)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def is_empty(self, table: str) -> bool:
+        return self.conn.execute(f"SELECT NOT EXISTS (SELECT 1 FROM {table})").fetchone()[0] == 1
+
+    # downloads
+
+    def register_downloads(self, rows: Iterable[Tuple[str, str]]):
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO downloads (id, pdf_url, created_at, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET pdf_url = excluded.pdf_url",
+                [(note_id, pdf_url, now, now) for note_id, pdf_url in rows],
+            )
+
+    def import_downloads(self, pdf_dir: Path):
+        # one directory listing to adopt pdfs that were downloaded before the manifest existed
+        now = time.time()
+        with os.scandir(pdf_dir) as entries:
+            rows = [
+                (entry.name.removesuffix(".pdf"), DONE, now, now)
+                for entry in entries
+                if entry.name.endswith(".pdf") and entry.is_file()
+            ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO downloads (id, status, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def get_download_status(self) -> Dict[str, str]:
+        return dict(self.conn.execute("SELECT id, status FROM downloads"))
+
+    def get_downloads(self, status: str) -> List[Tuple[str, Optional[str]]]:
+        return self.conn.execute("SELECT id, sha256 FROM downloads WHERE status = ? ORDER BY id", (status,)).fetchall()
+
+    def get_hashes(self) -> Dict[str, str]:
+        return dict(self.conn.execute("SELECT id, sha256 FROM downloads WHERE status = ? AND sha256 IS NOT NULL", (DONE,)))
+
+    def get_hashes_by_url(self) -> Dict[str, str]:
+        return dict(
+            self.conn.execute(
+                "SELECT pdf_url, sha256 FROM downloads WHERE status = ? AND sha256 IS NOT NULL AND pdf_url IS NOT NULL",
+                (DONE,),
+            )
+        )
+
+    def get_unique_hashes(self) -> List[str]:
+        return [
+            sha256
+            for (sha256,) in self.conn.execute(
+                "SELECT DISTINCT sha256 FROM downloads WHERE status = ? AND sha256 IS NOT NULL ORDER BY sha256", (DONE,)
+            )
+        ]
+
+    def record_download(
+        self,
+        note_id: str,
+        status: str,
+        http_status: Optional[int] = None,
+        num_bytes: Optional[int] = None,
+        sha256: Optional[str] = None,
+        message: Optional[str] = None,
+    ):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE downloads SET status = ?, http_status = ?, num_bytes = ?, sha256 = ?, message = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (status, http_status, num_bytes, sha256, message, time.time(), note_id),
+            )
+
+    # conversions
+
+    def import_conversions(self, md_dir: Path):
+        # marker writes {name}/{name}.md, adopt conversions that were done before the manifest existed
+        now = time.time()
+        with os.scandir(md_dir) as entries:
+            names = [entry.name for entry in entries if entry.is_dir()]
+        rows = [(name, DONE, now, now) for name in names if (md_dir / name / f"{name}.md").exists()]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO conversions (name, status, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def get_conversion_status(self) -> Dict[str, str]:
+        return dict(self.conn.execute("SELECT name, status FROM conversions"))
+
+    def record_conversion(self, name: str, status: str, message: Optional[str] = None):
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO conversions (name, status, attempts, message, created_at, updated_at) "
+                "VALUES (?, ?, 1, ?, ?, ?) ON CONFLICT(name) DO UPDATE SET status = excluded.status, "
+                "message = excluded.message, attempts = attempts + 1, updated_at = excluded.updated_at",
+                (name, status, message, now, now),
+            )
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        return {
+            table: dict(self.conn.execute(f"SELECT status, COUNT(*) FROM {table} GROUP BY status"))
+            for table in ("downloads", "conversions")
+        }
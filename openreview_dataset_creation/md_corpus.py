@@ -0,0 +1,193 @@
+import argparse
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+import pyarrow as pa
+from tqdm.auto import tqdm
+
+# A packed corpus of the markdown of converted pdfs, instead of one {name}/{name}.md directory per pdf:
+#   <corpus_dir>/md-<time>-<pid>.zst        every document compressed as its own zstd frame, written back to back
+#   <corpus_dir>/md-<time>-<pid>.index.tsv  one "name\toffset\tlength\tnum_bytes" line per document of the shard
+# A shard is a valid multi-frame zstd file (`zstd -dc` prints all its documents). Writers only ever create new shards,
+# so several conversion processes can append to the same corpus. A name written again later replaces the earlier
+# document. Index lines are written after their document, so a crashed writer loses at most one partial line.
+SHARD_SUFFIX = ".zst"
+INDEX_SUFFIX = ".index.tsv"
+
+
+class Entry(NamedTuple):
+    shard: int
+    offset: int
+    length: int  # compressed
+    num_bytes: int  # uncompressed
+
+
+def read_shard_index(index_file: Path) -> List[Tuple[str, int, int, int]]:
+    entries = []
+    with open(index_file, "r") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            name, offset, length, num_bytes = line[:-1].split("\t")
+            entries.append((name, int(offset), int(length), int(num_bytes)))
+    return entries
+
+
+class MdCorpusWriter:
+    def __init__(self, corpus_dir: Path, shard_bytes: int = 1 << 30, compression_level: int = 3):
+        self.corpus_dir = Path(corpus_dir)
+        self.corpus_dir.mkdir(exist_ok=True, parents=True)
+        self.shard_bytes = shard_bytes
+        self.codec = pa.Codec("zstd", compression_level)
+        self.shard = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def open_shard(self):
+        # names sort by creation time, later shards take precedence
+        name = f"md-{time.time_ns():020d}-{os.getpid()}"
+        self.shard = open(self.corpus_dir / f"{name}{SHARD_SUFFIX}", "wb")
+        self.index = open(self.corpus_dir / f"{name}{INDEX_SUFFIX}", "w")
+
+    def close_shard(self):
+        self.shard.close()
+        self.index.close()
+        self.shard = None
+
+    def write(self, name: str, text: str):
+        data = text.encode("utf-8")
+        frame = self.codec.compress(data, asbytes=True)
+        if self.shard is None:
+            self.open_shard()
+        offset = self.shard.tell()
+        self.shard.write(frame)
+        self.shard.flush()
+        self.index.write(f"{name}\t{offset}\t{len(frame)}\t{len(data)}\n")
+        self.index.flush()
+        if offset + len(frame) >= self.shard_bytes:
+            self.close_shard()
+
+    def close(self):
+        if self.shard is not None:
+            self.close_shard()
+
+
+class MdCorpus:
+    # the documents of all shards whose index lines were written when the corpus was opened
+    def __init__(self, corpus_dir: Path):
+        self.corpus_dir = Path(corpus_dir)
+        if not self.corpus_dir.is_dir():
+            raise FileNotFoundError(f"md corpus {self.corpus_dir.absolute()} does not exist.")
+        self.shard_files = sorted(self.corpus_dir.glob(f"md-*{SHARD_SUFFIX}"))
+        self.entries: Dict[str, Entry] = dict()
+        for i, shard_file in enumerate(self.shard_files):
+            index_file = shard_file.with_name(shard_file.name.removesuffix(SHARD_SUFFIX) + INDEX_SUFFIX)
+            for name, offset, length, num_bytes in read_shard_index(index_file):
+                self.entries[name] = Entry(i, offset, length, num_bytes)
+        self.maps = [None] * len(self.shard_files)
+        self.lock = threading.Lock()  # get is called from many threads, every shard is mapped once
+        self.codec = pa.Codec("zstd")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name: str):
+        return name in self.entries
+
+    def names(self) -> List[str]:
+        return list(self.entries)
+
+    def shard_map(self, shard: int) -> mmap.mmap:
+        shard_map = self.maps[shard]
+        if shard_map is None:
+            with self.lock:
+                if self.maps[shard] is None:
+                    with open(self.shard_files[shard], "rb") as f:
+                        self.maps[shard] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                shard_map = self.maps[shard]
+        return shard_map
+
+    def read(self, entry: Entry) -> str:
+        frame = self.shard_map(entry.shard)[entry.offset : entry.offset + entry.length]
+        return self.codec.decompress(frame, entry.num_bytes, asbytes=True).decode("utf-8")
+
+    def get(self, name: str) -> str:
+        return self.read(self.entries[name])
+
+    def scan(self) -> Iterator[Tuple[str, str]]:
+        # in file order, which reads every shard front to back
+        for name, entry in sorted(self.entries.items(), key=lambda item: item[1][:2]):
+            yield name, self.read(entry)
+
+    def close(self):
+        with self.lock:
+            for shard_map in self.maps:
+                if shard_map is not None:
+                    shard_map.close()
+            self.maps = [None] * len(self.shard_files)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        "--pdf_md_dir",
+        type=Path,
+        required=True,
+        help="directory containing the {name}/{name}.md files written by marker",
+    )
+    parser.add_argument(
+        "--corpus",
+        type=Path,
+        required=True,
+        help="The md corpus to append to, md files of names that are already in it are skipped.",
+    )
+    parser.add_argument(
+        "--num_threads",
+        type=int,
+        required=False,
+        default=16,
+        help="The number of md files read in parallel.",
+    )
+    return parser.parse_args()
+
+
+def read_md_file(md_file: Path) -> str:
+    with open(md_file, "r") as f:
+        return f.read()
+
+
+def main(args):
+    # packs an existing directory of marker outputs into a corpus
+    existing = set(MdCorpus(args.corpus).names()) if args.corpus.exists() else set()
+    with os.scandir(args.pdf_md_dir) as entries:
+        names = sorted(entry.name for entry in entries if entry.is_dir() and entry.name not in existing)
+    md_files = [args.pdf_md_dir / name / f"{name}.md" for name in names]
+    md_files = [md_file for md_file in md_files if md_file.exists()]
+    print(f"packing {len(md_files):_} md files into {args.corpus} ({len(existing):_} already packed)")
+    batch_size = 64 * args.num_threads
+    with ThreadPoolExecutor(max_workers=args.num_threads) as executor, MdCorpusWriter(args.corpus) as writer:
+        for start in tqdm(range(0, len(md_files), batch_size)):
+            batch = md_files[start : start + batch_size]
+            for md_file, text in zip(batch, executor.map(read_md_file, batch)):
+                writer.write(md_file.stem, text)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print("args:\n" + "\n".join([f"\t{arg}:{value}" for arg, value in vars(args).items()]))
+    main(args)
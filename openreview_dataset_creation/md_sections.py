@@ -0,0 +1,102 @@
+import re
+from bisect import bisect_right
+from concurrent.futures import Executor
+from functools import partial
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence
+
+import polars as pl
+
+# The section index of a markdown paper, computed once by make_dataset.py and stored in the pdf_md_sections column.
+# It reproduces the main text/appendix split of get_main_text in llm_training/prepare_data.py: the text is split at
+# markdown headers, the first section that contains one of REFERENCE_MATCHES is the reference section, the main text
+# ends after its first occurrence in the text and the appendix is the rest, with later copies of the reference section
+# removed. All offsets are in characters, like python and polars string slicing.
+MD_HEADER_SPLIT = re.compile(r"^#+\ ", re.MULTILINE)
+MD_HEADER = re.compile(r"#+\ ")
+REFERENCE_MATCHES = ["References", "REFERENCES", "R E F E R E N C E S", "Re F E R E N C E S"]
+
+SECTIONS_DTYPE = pl.Struct(
+    {
+        "heading_offsets": pl.List(pl.UInt32),  # start of every header line
+        "heading_levels": pl.List(pl.UInt8),  # number of #
+        "reference_start": pl.UInt32,  # null if there is no reference section
+        "appendix_start": pl.UInt32,  # end of the main text, null if there is no reference section
+        "repeated_reference_offsets": pl.List(pl.UInt32),  # later copies of the reference section, not in the appendix
+    }
+)
+
+
+def find_headings(text: str) -> List[re.Match]:
+    # the matches of MD_HEADER_SPLIT, line starts are found with str.find, which is much faster than a regex scan
+    line_starts = [0]
+    offset = text.find("\n#")
+    while offset != -1:
+        line_starts.append(offset + 1)
+        offset = text.find("\n#", offset + 1)
+    return [heading for heading in map(partial(MD_HEADER.match, text), line_starts) if heading is not None]
+
+
+def get_section_index(text: str) -> Dict[str, Any]:
+    headings = find_headings(text)
+    index = dict(
+        heading_offsets=[heading.start() for heading in headings],
+        heading_levels=[heading.end() - heading.start() - 1 for heading in headings],
+        reference_start=None,
+        appendix_start=None,
+        repeated_reference_offsets=[],
+    )
+    # REFERENCE_MATCHES contain no "#" and start with a letter, so they never overlap a header prefix and the earliest
+    # match in the text lies in the first section that contains one. Every pattern only searches before the earliest
+    # match of the previous ones.
+    first_match = len(text)
+    for reference_match in REFERENCE_MATCHES:
+        offset = text.find(reference_match, 0, first_match + len(reference_match) - 1)
+        if offset != -1:
+            first_match = offset
+    if first_match == len(text):
+        return index
+    section_starts = [0] + [heading.end() for heading in headings]
+    section_ends = [heading.start() for heading in headings] + [len(text)]
+    i = bisect_right(section_starts, first_match) - 1
+    section = text[section_starts[i] : section_ends[i]]
+    # the text is split at the first occurrence of the section's text, which can come before the section
+    reference_start = text.find(section)
+    index["reference_start"] = reference_start
+    index["appendix_start"] = reference_start + len(section)
+    offset = text.find(section, index["appendix_start"])
+    while offset != -1:
+        index["repeated_reference_offsets"].append(offset)
+        offset = text.find(section, offset + len(section))
+    return index
+
+
+def truncate_at_section(text: str, index: Dict[str, Any], max_chars: int, max_level: Optional[int] = None) -> str:
+    # the longest prefix of at most max_chars that ends before a heading (of at most max_level)
+    if len(text) <= max_chars:
+        return text
+    ends = [
+        offset
+        for offset, level in zip(index["heading_offsets"], index["heading_levels"])
+        if 0 < offset <= max_chars and (max_level is None or level <= max_level)
+    ]
+    return text[: ends[-1] if ends else max_chars]
+
+
+def main_text_expression(text: pl.Expr, sections: pl.Expr) -> pl.Expr:
+    appendix_start = sections.struct.field("appendix_start")
+    return pl.when(appendix_start.is_null()).then(text).otherwise(text.str.slice(0, appendix_start))
+
+
+def get_section_index_batch(texts: Sequence[str]) -> List[Dict[str, Any]]:
+    return [get_section_index(text) for text in texts]
+
+
+def get_section_indices(texts: Sequence[str], executor: Optional[Executor] = None, batch_size: int = 256) -> pl.Series:
+    # with a process pool, batches of texts are sent to the workers and only their offsets are sent back
+    if executor is None:
+        indices = get_section_index_batch(texts)
+    else:
+        batches = [texts[start : start + batch_size] for start in range(0, len(texts), batch_size)]
+        indices = list(chain.from_iterable(executor.map(get_section_index_batch, batches)))
+    return pl.Series("pdf_md_sections", indices, dtype=SECTIONS_DTYPE)
@@ -0,0 +1,523 @@
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from note_store import INDEX_FILE, iter_notes, read_index
+
+# A local stand-in for the parts of the OpenReview API used by get_openreview_notes.py, get_openreview_venues.py and
+# download_pdfs.py. Both API versions are served by one server under http://<host>:<port>/v1 and /v2, pdfs under /pdf.
+# Notes come from an output directory of get_openreview_notes.py (--fixtures_dir) or from a synthetic generator.
+
+MOCK_USER = {"id": "~Mock_User1", "profile": {"id": "~Mock_User1", "usernames": ["~Mock_User1"]}}
+CONTENT_RANGE = re.compile(r"bytes=(\d+)-")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        "--host",
+        type=str,
+        required=False,
+        default="127.0.0.1",
+        help="The host to listen on.",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        required=False,
+        default=8080,
+        help="The port to listen on.",
+    )
+    add_mock_args(parser)
+    return parser.parse_args()
+
+
+def add_mock_args(parser):
+    parser.add_argument(
+        "--fixtures_dir",
+        type=str,
+        required=False,
+        default=None,
+        help="Serve the notes and templates of this output directory of get_openreview_notes.py. "
+        "If not set, synthetic venues are generated.",
+    )
+    parser.add_argument(
+        "--synthetic_venues",
+        type=int,
+        required=False,
+        default=2,
+        help="The number of synthetic venues per API version.",
+    )
+    parser.add_argument(
+        "--notes_per_venue",
+        type=int,
+        required=False,
+        default=2000,
+        help="The number of submissions of every synthetic venue.",
+    )
+    parser.add_argument(
+        "--reviews_per_note",
+        type=int,
+        required=False,
+        default=4,
+        help="The number of reviews of every synthetic submission.",
+    )
+    parser.add_argument(
+        "--review_words",
+        type=int,
+        required=False,
+        default=400,
+        help="The number of words of every synthetic review.",
+    )
+    parser.add_argument(
+        "--pdf_size",
+        type=int,
+        required=False,
+        default=1 << 20,
+        help="The size (bytes) of every served pdf.",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        required=False,
+        default=0.0,
+        help="Mean latency (seconds) added to every response, uniformly jittered by +-50%%.",
+    )
+    parser.add_argument(
+        "--error_rate",
+        type=float,
+        required=False,
+        default=0.0,
+        help="Fraction of requests answered with a 500.",
+    )
+    parser.add_argument(
+        "--rate_limit_rate",
+        type=float,
+        required=False,
+        default=0.0,
+        help="Fraction of requests answered with a 429 and a Retry-After header.",
+    )
+    parser.add_argument(
+        "--retry_after",
+        type=int,
+        required=False,
+        default=1,
+        help="The Retry-After (seconds) sent with 429 responses.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        required=False,
+        default=0,
+        help="Seed for the synthetic data and the injected errors.",
+    )
+
+
+def make_token(user: Dict[str, Any]) -> str:
+    # an unsigned-looking HS256 JWT, openreview-py only decodes it without verifying the signature
+    def b64(data: bytes) -> str:
+        return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+    header = b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = b64(json.dumps({"user": user, "iat": int(time.time()), "exp": int(time.time()) + 7 * 24 * 3600}).encode())
+    signature = b64(hmac.new(b"mock", f"{header}.{payload}".encode(), hashlib.sha256).digest())
+    return f"{header}.{payload}.{signature}"
+
+
+def synthetic_text(rng: random.Random, num_words: int) -> str:
+    words = ["model", "data", "results", "method", "training", "the", "we", "paper", "proposed", "baseline"]
+    return " ".join(rng.choice(words) for _ in range(num_words))
+
+
+def synthetic_venue(or_venue, api_version, num_notes, reviews_per_note, review_words, rng):
+    # submissions with their direct replies (reviews and a decision) as "directReplies" and "replies" details
+    submission_invitation = f"{or_venue}/-/Submission" if api_version == 2 else f"{or_venue}/-/Blind_Submission"
+
+    def value(x):
+        return {"value": x} if api_version == 2 else x
+
+    def invitation(inv):
+        return {"invitations": [inv], "domain": or_venue} if api_version == 2 else {"invitation": inv}
+
+    notes = []
+    for number in range(1, num_notes + 1):
+        note_id = hashlib.sha1(f"{or_venue}/{number}".encode()).hexdigest()[:10]
+        tmdate = 1_600_000_000_000 + number * 1000
+        replies = []
+        for review_number in range(reviews_per_note):
+            replies.append(
+                {
+                    "id": f"{note_id}r{review_number}",
+                    "number": review_number + 1,
+                    "forum": note_id,
+                    "replyto": note_id,
+                    **invitation(f"{or_venue}/Submission{number}/-/Official_Review"),
+                    "signatures": [f"{or_venue}/Submission{number}/Reviewer_{review_number}"],
+                    "writers": [or_venue],
+                    "readers": ["everyone"],
+                    "content": {
+                        "summary": value(synthetic_text(rng, review_words // 4)),
+                        "strengths": value(synthetic_text(rng, review_words // 4)),
+                        "weaknesses": value(synthetic_text(rng, review_words // 4)),
+                        "questions": value(synthetic_text(rng, review_words // 4)),
+                        "rating": value(rng.choice([1, 3, 5, 6, 8, 10])),
+                        "confidence": value(rng.randint(1, 5)),
+                    },
+                    "cdate": tmdate,
+                    "tcdate": tmdate,
+                    "mdate": tmdate,
+                    "tmdate": tmdate,
+                }
+            )
+        replies.append(
+            {
+                "id": f"{note_id}d",
+                "number": 1,
+                "forum": note_id,
+                "replyto": note_id,
+                **invitation(f"{or_venue}/Submission{number}/-/Decision"),
+                "signatures": [f"{or_venue}/Program_Chairs"],
+                "writers": [or_venue],
+                "readers": ["everyone"],
+                "content": {"decision": value(rng.choice(["Accept (poster)", "Reject"])), "comment": value("")},
+                "cdate": tmdate,
+                "tcdate": tmdate,
+                "mdate": tmdate,
+                "tmdate": tmdate,
+            }
+        )
+        notes.append(
+            {
+                "id": note_id,
+                "number": number,
+                "forum": note_id,
+                "replyto": None,
+                **invitation(submission_invitation),
+                "signatures": [f"{or_venue}/Submission{number}/Authors"],
+                "writers": [or_venue],
+                "readers": ["everyone"],
+                "content": {
+                    "title": value(f"Synthetic paper {number}"),
+                    "abstract": value(synthetic_text(rng, 200)),
+                    "authors": value(["Anonymous"]),
+                    "authorids": value([f"{or_venue}/Submission{number}/Authors"]),
+                    "keywords": value(["synthetic"]),
+                    "pdf": value(f"/pdf/{hashlib.sha1(note_id.encode()).hexdigest()}.pdf"),
+                    "venue": value(or_venue),
+                    "venueid": value(or_venue),
+                },
+                "cdate": tmdate,
+                "tcdate": tmdate,
+                "mdate": tmdate,
+                "tmdate": tmdate,
+                "pdate": tmdate,
+                "odate": tmdate,
+                "ddate": None,
+                "details": {
+                    "replyCount": len(replies),
+                    "directReplyCount": len(replies),
+                    "directReplies": replies,
+                    "replies": replies,
+                    "tags": [],
+                },
+            }
+        )
+    return notes
+
+
+class MockOpenReview:
+    def __init__(
+        self,
+        pdf_size=1 << 20,
+        latency=0.0,
+        error_rate=0.0,
+        rate_limit_rate=0.0,
+        retry_after=1,
+        seed=0,
+    ):
+        self.pdf_size = pdf_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.token = make_token(MOCK_USER)
+        # or_venue -> api version, submission invitation
+        self.venues = dict()
+        # api version -> submissions (with details) and all other notes (replies)
+        self.notes = {1: [], 2: []}
+        self.replies = {1: [], 2: []}
+        self.submissions_by_id = {1: dict(), 2: dict()}
+        self.invitations = {1: dict(), 2: dict()}
+        # the filtered and sorted notes of a query, so that paging through it does not filter again for every page
+        self.query_cache = dict()
+        self.stats = Counter()
+
+    def add_venue(self, or_venue, api_version, notes, templates=None):
+        notes = [{key: value for key, value in note.items() if key != "or_venue"} for note in notes]
+        submission_invitation = notes[0]["invitations"][0] if api_version == 2 else notes[0]["invitation"]
+        self.venues[or_venue] = dict(api_version=api_version, submission_name=submission_invitation.split("/-/")[-1])
+        self.notes[api_version].extend(notes)
+        self.submissions_by_id[api_version].update((note["id"], note) for note in notes)
+        for note in notes:
+            details = note.get("details") or dict()
+            self.replies[api_version].extend(details.get("replies", details.get("directReplies", [])))
+        if templates:
+            for template in [templates["submission_template"]] + templates["reply_templates"]:
+                if template:
+                    self.invitations[api_version][template["id"]] = template
+
+    def add_synthetic_venues(self, num_venues, notes_per_venue, reviews_per_note, review_words):
+        for api_version in (1, 2):
+            for i in range(num_venues):
+                or_venue = f"Mock.cc/{2000 + i}/Conference_V{api_version}"
+                notes = synthetic_venue(or_venue, api_version, notes_per_venue, reviews_per_note, review_words, self.rng)
+                self.add_venue(or_venue, api_version, notes)
+
+    def add_fixtures(self, fixtures_dir):
+        for index_file in sorted(Path(fixtures_dir).glob(f"*/{INDEX_FILE}")):
+            store_dir = index_file.parent
+            or_venue = read_index(store_dir)["or_venue"]
+            notes = list(iter_notes(store_dir))
+            if not notes:
+                continue
+            sync_file = store_dir.parent / f"{store_dir.name}.sync.json"
+            if sync_file.exists():
+                with open(sync_file, "r") as f:
+                    api_version = json.load(f)["api_version"]
+            else:
+                api_version = 2 if notes[0].get("invitations") else 1
+            template_file = store_dir.parent / f"{store_dir.name}.template.json"
+            templates = None
+            if template_file.exists():
+                with open(template_file, "r") as f:
+                    templates = json.load(f)
+            self.add_venue(or_venue, api_version, notes, templates)
+            print(f"loaded {len(notes):_} notes of {or_venue} (API V{api_version})")
+
+    # endpoints, each returns (status, json body)
+
+    def get_groups(self, api_version, query):
+        group_id = query.get("id")
+        if group_id == "venues":
+            return 200, {"groups": [{"id": "venues", "members": sorted(self.venues)}]}
+        if group_id not in self.venues:
+            return 404, {"name": "NotFoundError", "message": f"Group Not Found: {group_id}"}
+        venue = self.venues[group_id]
+        content = None
+        if api_version == 2 and venue["api_version"] == 2:
+            content = {"submission_name": {"value": venue["submission_name"]}}
+        return 200, {"groups": [{"id": group_id, "content": content, "members": []}]}
+
+    def find_notes(self, api_version, query):
+        if query.get("id"):
+            note = self.submissions_by_id[api_version].get(query["id"])
+            return [note] if note else []
+        key = (api_version, query.get("invitation"), query.get("domain"), query.get("sort"))
+        if key in self.query_cache:
+            return self.query_cache[key]
+        candidates = self.notes[api_version] + self.replies[api_version]
+        invitation = query.get("invitation")
+        if invitation:
+            pattern = re.compile(invitation if "*" in invitation else re.escape(invitation))
+            candidates = [
+                note
+                for note in candidates
+                if any(pattern.fullmatch(inv) for inv in note.get("invitations", [note.get("invitation")]) if inv)
+            ]
+        if query.get("domain"):
+            candidates = [note for note in candidates if note.get("domain") == query["domain"]]
+        if query.get("sort") == "tmdate:desc":
+            candidates = sorted(candidates, key=lambda note: note.get("tmdate") or 0, reverse=True)
+        with self.lock:
+            self.query_cache[key] = candidates
+        return candidates
+
+    def get_notes(self, api_version, query):
+        details = query.get("details")
+        candidates = self.find_notes(api_version, query)
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", 1000))
+        notes = []
+        for note in candidates[offset : offset + limit]:
+            note = dict(note)
+            if "details" in note:
+                if details is None:
+                    note.pop("details")
+                elif details != "all":
+                    requested = set(details.split(","))
+                    note["details"] = {key: value for key, value in note["details"].items() if key in requested}
+            notes.append(note)
+        return 200, {"notes": notes, "count": len(candidates)}
+
+    def get_invitations(self, api_version, query):
+        invitation_id = query.get("id")
+        invitation = self.invitations[api_version].get(invitation_id)
+        if invitation is None and any(invitation_id.startswith(f"{venue}/") for venue in self.venues):
+            invitation = {"id": invitation_id, "cdate": 1_600_000_000_000, "tcdate": 1_600_000_000_000}
+            if api_version == 2:
+                invitation["edit"] = {"note": {"content": {}}}
+            else:
+                invitation["reply"] = {"content": {}}
+        return 200, {"invitations": [invitation] if invitation else []}
+
+    def login(self, api_version, query):
+        return 200, {"token": self.token, "user": MOCK_USER}
+
+    def get_profiles(self, api_version, query):
+        return 200, {"profiles": [{"id": MOCK_USER["id"], "active": True, "content": {"names": [{"fullname": "Mock User"}]}}]}
+
+    def pdf_bytes(self, path):
+        # deterministic bytes per path that pass download_pdfs.is_complete_pdf
+        header = b"%PDF-1.4\n% " + path.encode() + b"\n"
+        trailer = b"\n%%EOF\n"
+        filler = hashlib.sha256(path.encode()).hexdigest().encode()
+        body_size = max(0, self.pdf_size - len(header) - len(trailer))
+        return header + (filler * (body_size // len(filler) + 1))[:body_size] + trailer
+
+    def inject(self):
+        # returns an error response (status, headers, body) for this request or None
+        with self.lock:
+            latency = self.latency * self.rng.uniform(0.5, 1.5)
+            x = self.rng.random()
+        if latency:
+            time.sleep(latency)
+        if x < self.rate_limit_rate:
+            return 429, {"Retry-After": str(self.retry_after)}, {"name": "RateLimitError", "message": "Too many requests"}
+        if x < self.rate_limit_rate + self.error_rate:
+            return 500, {}, {"name": "Error", "message": "Injected server error"}
+        return None
+
+
+ROUTES = {
+    ("GET", "groups"): MockOpenReview.get_groups,
+    ("GET", "notes"): MockOpenReview.get_notes,
+    ("GET", "invitations"): MockOpenReview.get_invitations,
+    ("GET", "profiles"): MockOpenReview.get_profiles,
+    ("POST", "login"): MockOpenReview.login,
+}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send(self, status, body: bytes, headers: Optional[Dict[str, str]] = None, content_type="application/json"):
+        mock = self.server.mock
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or dict()).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+        with mock.lock:
+            mock.stats[f"status_{status}"] += 1
+            mock.stats["bytes_sent"] += len(body)
+
+    def send_json(self, status, data, headers=None):
+        self.send(status, json.dumps(data).encode(), headers)
+
+    def handle_request(self, method):
+        mock = self.server.mock
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if method == "POST":
+            length = int(self.headers.get("Content-Length", 0))
+            if length:
+                self.rfile.read(length)
+
+        error = mock.inject()
+        if error is not None:
+            status, headers, body = error
+            self.send_json(status, body, headers)
+            return
+
+        parts = url.path.strip("/").split("/")
+        if parts[0] == "pdf" and method == "GET":
+            self.send_pdf(url.path)
+            return
+        if len(parts) == 2 and parts[0] in ("v1", "v2") and (method, parts[1]) in ROUTES:
+            status, body = ROUTES[method, parts[1]](mock, int(parts[0][1]), query)
+            self.send_json(status, body)
+            return
+        self.send_json(404, {"name": "NotFoundError", "message": f"{method} {url.path} is not mocked"})
+
+    def send_pdf(self, path):
+        pdf = self.server.mock.pdf_bytes(path)
+        match = CONTENT_RANGE.fullmatch(self.headers.get("Range", ""))
+        if match is None:
+            self.send(200, pdf, content_type="application/pdf")
+            return
+        start = int(match.group(1))
+        if start >= len(pdf):
+            self.send(416, b"", {"Content-Range": f"bytes */{len(pdf)}"}, content_type="application/pdf")
+            return
+        headers = {"Content-Range": f"bytes {start}-{len(pdf) - 1}/{len(pdf)}"}
+        self.send(206, pdf[start:], headers, content_type="application/pdf")
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+
+def make_server(host, port, args) -> ThreadingHTTPServer:
+    mock = MockOpenReview(
+        pdf_size=args.pdf_size,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    if args.fixtures_dir:
+        mock.add_fixtures(args.fixtures_dir)
+    else:
+        mock.add_synthetic_venues(args.synthetic_venues, args.notes_per_venue, args.reviews_per_note, args.review_words)
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    server.mock = mock
+    return server
+
+
+def server_urls(server) -> Dict[str, str]:
+    host, port = server.server_address[:2]
+    url = f"http://{host}:{port}"
+    return {"openreview_url": url, "api_v1_url": f"{url}/v1", "api_v2_url": f"{url}/v2"}
+
+
+def main(args):
+    server = make_server(args.host, args.port, args)
+    mock = server.mock
+    print(f"serving {len(mock.venues):_} venues, {len(mock.notes[1]) + len(mock.notes[2]):_} submissions")
+    for name, url in server_urls(server).items():
+        print(f"\t--{name} {url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"stats: {dict(mock.stats)}")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print("args:\n" + "\n".join([f"\t{arg}:{value}" for arg, value in vars(args).items()]))
+    main(args)
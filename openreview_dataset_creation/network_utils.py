@@ -0,0 +1,211 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# responses worth retrying, every other 4xx means the request itself is wrong and is not retried
+TRANSIENT_STATUS = {408, 425, 429, 500, 502, 503, 504}
+TRANSIENT_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+class TokenBucket:
+    # Global rate limit shared by all worker threads: tokens refill at `rate` per second up to `burst`.
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError(f"rate must be > 0, but got {rate}")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HTTPStatusError(Exception):
+    # for code that checks status codes itself instead of raising requests' HTTPError
+    def __init__(self, status_code: int, message: str, headers=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = headers or dict()
+
+
+def get_status_code(error: Exception) -> Optional[int]:
+    # requests' HTTPError and openai's APIStatusError carry the response, our HTTPStatusError the status code
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    value = headers.get("Retry-After") if headers is not None else None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    # Stops all threads from sending requests to a host after `failure_threshold` consecutive transient failures.
+    # After `reset_timeout` seconds a single probe request is let through. If it succeeds the circuit closes again,
+    # if it fails the circuit stays open for twice as long (up to `max_reset_timeout`).
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, max_reset_timeout: float = 600.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.timeout = reset_timeout
+        self.failures = 0
+        self.open_until = 0.0
+        self.probing = False
+        self.condition = threading.Condition()
+
+    def wait(self) -> bool:
+        # returns whether the caller sends the probe request
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                if now < self.open_until:
+                    self.condition.wait(self.open_until - now)
+                elif self.failures < self.failure_threshold:
+                    return False
+                elif not self.probing:
+                    self.probing = True
+                    return True
+                else:
+                    self.condition.wait()
+
+    def release_probe(self):
+        # the probe request failed before reaching the host, another request may probe instead
+        with self.condition:
+            self.probing = False
+            self.condition.notify_all()
+
+    def record_success(self):
+        # also called for permanent errors: the host answered, it is just the request that is wrong
+        with self.condition:
+            self.failures = 0
+            self.probing = False
+            self.timeout = self.reset_timeout
+            self.condition.notify_all()
+
+    def record_failure(self, retry_after: Optional[float] = None):
+        with self.condition:
+            now = time.monotonic()
+            self.failures += 1
+            if retry_after is not None:
+                # the server told us when to come back, that holds for all threads
+                self.open_until = max(self.open_until, now + retry_after)
+            if self.probing:
+                self.timeout = min(2 * self.timeout, self.max_reset_timeout)
+            if self.probing or self.failures >= self.failure_threshold:
+                self.open_until = max(self.open_until, now + self.timeout)
+            self.probing = False
+            self.condition.notify_all()
+
+
+class RetryPolicy:
+    # Retries transient errors with exponential backoff and full jitter, honours Retry-After, and shares one
+    # CircuitBreaker per host between all threads. Permanent errors are raised immediately.
+    def __init__(
+        self,
+        max_attempts: Optional[int] = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        transient_exceptions: tuple = (),
+    ):
+        # max_attempts=None retries transient errors forever
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.transient_exceptions = TRANSIENT_EXCEPTIONS + tuple(transient_exceptions)
+        self.breakers = dict()
+        self.lock = threading.Lock()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self.breakers[host]
+
+    def is_transient(self, error: Exception) -> bool:
+        status_code = get_status_code(error)
+        if status_code is not None:
+            return status_code in TRANSIENT_STATUS or status_code >= 500
+        return isinstance(error, self.transient_exceptions)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def call(self, fn, *args, host: str = "default", **kwargs):
+        breaker = self.breaker(host)
+        attempt = 0
+        while True:
+            attempt += 1
+            probe = breaker.wait()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not self.is_transient(e):
+                    if get_status_code(e) is not None:
+                        # the host answered, it is just the request that is wrong
+                        breaker.record_success()
+                    elif probe:
+                        # a local error (disk, parsing, ...) says nothing about the host
+                        breaker.release_probe()
+                    raise
+                retry_after = get_retry_after(e)
+                breaker.record_failure(retry_after)
+                if self.max_attempts is not None and attempt >= self.max_attempts:
+                    raise
+                delay = self.backoff(attempt, retry_after)
+                print(f"{host}: {e!r}, retrying in {delay:.1f}s (attempt {attempt})")
+                time.sleep(delay)
+                continue
+            breaker.record_success()
+            return result
+
+
+def get_session(pool_size: int) -> requests.Session:
+    # one keep-alive connection per worker thread
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -1,27 +1,61 @@
-from .iclr_2021 import parse_iclr_2021_note
-from .iclr_2022 import parse_iclr_2022_note
-from .iclr_2023 import parse_iclr_2023_note
-from .iclr_2024 import parse_iclr_2024_note
-from .iclr_2025 import parse_iclr_2025_note
-from .neurips_2022 import parse_neurips_2022_note
-from .neurips_2023 import parse_neurips_2023_note
-from .neurips_2024 import parse_neurips_2024_note
-
-NOTE_PARSERS = {
-    "NeurIPS.cc/2024/Conference": parse_neurips_2024_note,
-    "NeurIPS.cc/2023/Conference": parse_neurips_2023_note,
-    "NeurIPS.cc/2022/Conference": parse_neurips_2022_note,
-    # "NeurIPS.cc/2021/Conference": parse_neurips_2021_note,
-    "ICLR.cc/2025/Conference": parse_iclr_2025_note,
-    "ICLR.cc/2024/Conference": parse_iclr_2024_note,
-    "ICLR.cc/2023/Conference": parse_iclr_2023_note,
-    "ICLR.cc/2022/Conference": parse_iclr_2022_note,
-    "ICLR.cc/2021/Conference": parse_iclr_2021_note,
+import functools
+
+import polars as pl
+
+from .data_models import TEMPLATE_SCHEMA
+from .expressions import compile_frame_parser
+from .schema import compile_note_parser, get_template, note_details
+from .venues import VENUE_SCHEMAS
+
+NOTE_PARSERS = {venue: compile_note_parser(schema) for venue, schema in VENUE_SCHEMAS.items()}
+
+# the review and decision templates of all venues by template_id, venues with the same rubric share a template
+TEMPLATES = {
+    template["template_id"]: template
+    for template in (
+        get_template(fields)
+        for schema in VENUE_SCHEMAS.values()
+        for fields in (schema.review_fields, schema.decision_fields)
+        if fields is not None
+    )
 }
 
+# the note details each venue's parsers read, see note_details in schema.py
+NOTE_DETAILS = {venue: note_details(schema) for venue, schema in VENUE_SCHEMAS.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def get_note_parser(venue, validate=True, dump_replies=True):
+    # validate=False: the parser returns dicts with the fields of Note.model_dump() instead of a pydantic Note
+    # dump_replies=False: replies and direct_replies are kept as lists of dicts instead of json strings
+    assert (
+        venue in NOTE_PARSERS
+    ), f"note parser for venue {venue} does not exists. Available note parsers:\n{list(NOTE_PARSERS.keys())}"
+    if validate and dump_replies:
+        return NOTE_PARSERS[venue]
+    return compile_note_parser(VENUE_SCHEMAS[venue], validate, dump_replies)
+
 
-def get_note_parser(venue):
+@functools.lru_cache(maxsize=None)
+def get_frame_parser(venue):
+    # parses a frame of raw json notes with polars expressions, see expressions.py
     assert (
         venue in NOTE_PARSERS
     ), f"note parser for venue {venue} does not exists. Available note parsers:\n{list(NOTE_PARSERS.keys())}"
-    return NOTE_PARSERS[venue]
+    return compile_frame_parser(venue, VENUE_SCHEMAS[venue])
+
+
+def get_note_details(venue):
+    assert (
+        venue in NOTE_DETAILS
+    ), f"note details for venue {venue} do not exist. Available venues:\n{list(NOTE_DETAILS.keys())}"
+    return NOTE_DETAILS[venue]
+
+
+def get_templates(template_ids) -> pl.DataFrame:
+    template_ids = set(template_ids)
+    missing = template_ids - set(TEMPLATES)
+    assert (
+        not missing
+    ), f"templates {missing} do not exist in note_parsers/venues.py, the notes were parsed with a different version of it."
+    return pl.DataFrame([TEMPLATES[template_id] for template_id in sorted(template_ids)], schema=TEMPLATE_SCHEMA)
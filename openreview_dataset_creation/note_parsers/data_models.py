@@ -1,6 +1,8 @@
+import collections.abc
 import json
-from typing import Any, Dict, Sequence, Optional
+from typing import Any, Dict, Sequence, Optional, Union, get_args, get_origin
 
+import polars as pl
 from pydantic import BaseModel, ValidationInfo, field_validator
 
 
@@ -16,10 +18,9 @@ class Decision(BaseModel):
     invitation: str
     writers: Sequence[str]
 
-    # content fields
-    content_fields: Sequence[str]
+    # content fields, named and described by the Template with this id
+    template_id: str
     content: Sequence[str]
-    content_meta: Sequence[str]
 
     # time fields
     cdate: Optional[int] = None
@@ -38,10 +39,9 @@ class Review(BaseModel):
     invitation: str
     writers: Sequence[str]
 
-    # content fields
-    content_fields: Sequence[str]
+    # content fields, named and described by the Template with this id
+    template_id: str
     content: Sequence[str]
-    content_meta: Sequence[str]
 
     # time fields
     cdate: Optional[int] = None
@@ -52,6 +52,12 @@ class Review(BaseModel):
     tddate: Optional[int] = None
 
 
+class Template(BaseModel):
+    template_id: str
+    content_fields: Sequence[str]
+    content_meta: Sequence[str]
+
+
 class Note(BaseModel):
     id: str
     number: int
@@ -89,8 +95,8 @@ class Note(BaseModel):
     tags: Optional[Sequence["str"]]
     reply_count: int
     direct_reply_count: int
-    replies: str
-    direct_replies: str
+    replies: Optional[str]  # None if the notes were fetched without the "replies" detail
+    direct_replies: Optional[str]  # None if the venue parses no replies and they were not fetched
 
     # parsed details
     reviews: Sequence[Review]
@@ -98,6 +104,26 @@ class Note(BaseModel):
 
     @field_validator("replies", "direct_replies")
     @classmethod
-    def check_valid_json(cls, s: str, info: ValidationInfo) -> str:
-        assert json.loads(s)
+    def check_valid_json(cls, s: Optional[str], info: ValidationInfo) -> Optional[str]:
+        assert s is None or json.loads(s)
         return s
+
+
+def get_polars_dtype(annotation) -> pl.DataType:
+    if get_origin(annotation) is Union:
+        (annotation,) = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return get_polars_dtype(annotation)
+    if get_origin(annotation) is collections.abc.Sequence:
+        return pl.List(get_polars_dtype(get_args(annotation)[0]))
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return pl.Struct(get_polars_schema(annotation))
+    return {str: pl.String, int: pl.Int64}[annotation]
+
+
+def get_polars_schema(model: type[BaseModel]) -> pl.Schema:
+    # a fixed schema, so that columns which are null in a whole batch of notes do not become the Null dtype
+    return pl.Schema({name: get_polars_dtype(field.annotation) for name, field in model.model_fields.items()})
+
+
+NOTE_SCHEMA = get_polars_schema(Note)
+TEMPLATE_SCHEMA = get_polars_schema(Template)
@@ -0,0 +1,194 @@
+from typing import Callable, Dict, List, Sequence
+
+import polars as pl
+
+from .data_models import NOTE_SCHEMA, ParserError
+from .schema import (
+    NOTE_CONTENT_FIELDS,
+    NOTE_DATES,
+    REPLY_DATES,
+    ContentField,
+    Field,
+    VenueSchema,
+    get_template_id,
+    join_lines,
+    note_details,
+)
+
+# The polars counterpart of compile_note_parser: a VenueSchema is turned into the dtype of the json fields the parser
+# reads and into expressions that build the Note columns from them. Raw json lines are decoded with that dtype, which
+# skips all other keys and turns missing keys into nulls, so the whole shard is parsed in rust instead of note by note.
+# Replies are copied as the json text of the notes.
+
+# the polars versions of the transforms used in venues.py, applied to the values decoded with the given dtype
+TRANSFORMS = {
+    str: (pl.String, lambda expr: expr),  # numbers are decoded as their string representation
+    join_lines: (pl.List(pl.String), lambda expr: expr.list.join("\n")),
+}
+
+
+def field_dtype(field: Field, dtype: pl.DataType, api_version: int) -> pl.DataType:
+    if field.transform is not None:
+        if field.transform not in TRANSFORMS:
+            raise NotImplementedError(f"transform {field.transform} of field {field.key} has no polars version")
+        dtype = TRANSFORMS[field.transform][0]
+    # API v2 wraps every content value in {"value": ...}
+    return pl.Struct({"value": dtype}) if api_version == 2 else dtype
+
+
+def field_expression(obj: pl.Expr, field: Field, api_version: int) -> pl.Expr:
+    expr = obj.struct.field(field.key)
+    if api_version == 2:
+        expr = expr.struct.field("value")
+    if field.transform is not None:
+        expr = TRANSFORMS[field.transform][1](expr)
+    if field.optional and field.default is not None:
+        expr = expr.fill_null(field.default)
+    return expr
+
+
+def content_field(field: ContentField) -> Field:
+    return Field(field.key or field.name, field.optional, "", field.transform)
+
+
+def merge_dtypes(dtypes: Dict[str, pl.DataType], key: str, dtype: pl.DataType):
+    assert dtypes.setdefault(key, dtype) == dtype, f"key {key} is read as {dtypes[key]} and {dtype}"
+
+
+def reply_dtype(schema: VenueSchema) -> pl.Struct:
+    content = dict()
+    for fields in (schema.review_fields, schema.decision_fields or []):
+        for field in map(content_field, fields):
+            merge_dtypes(content, field.key, field_dtype(field, pl.String, schema.api_version))
+    invitation = {"invitation": pl.String} if schema.api_version == 1 else {"invitations": pl.List(pl.String)}
+    return pl.Struct(
+        {
+            "id": pl.String,
+            "number": pl.Int64,
+            "forum": pl.String,
+            "replyto": pl.String,
+            **invitation,
+            "writers": pl.List(pl.String),
+            "content": pl.Struct(content),
+            **{field.key: pl.Int64 for field in schema.reply_dates.values()},
+        }
+    )
+
+
+def note_dtype(schema: VenueSchema) -> pl.Struct:
+    content = dict()
+    for name, field in schema.note_fields.items():
+        merge_dtypes(content, field.key, field_dtype(field, NOTE_SCHEMA[name], schema.api_version))
+    details = {
+        "directReplies": pl.List(reply_dtype(schema)),
+        "replyCount": pl.Int64,
+        "directReplyCount": pl.Int64,
+        "tags": NOTE_SCHEMA["tags"],
+    }
+    details = {key: dtype for key, dtype in details.items() if key in note_details(schema)}
+    return pl.Struct(
+        {
+            "id": pl.String,
+            "number": pl.Int64,
+            "forum": pl.String,
+            "or_venue": pl.String,
+            "content": pl.Struct(content),
+            **{name: pl.Int64 for name in NOTE_DATES},
+            "details": pl.Struct(details),
+        }
+    )
+
+
+def invitation_expression(reply: pl.Expr, api_version: int) -> pl.Expr:
+    return reply.struct.field("invitation") if api_version == 1 else reply.struct.field("invitations").list.first()
+
+
+def reply_expression(fields: Sequence[ContentField], reply_dates: Dict[str, Field], api_version: int) -> pl.Expr:
+    reply = pl.element()
+    content = reply.struct.field("content")
+    values = []
+    for field in map(content_field, fields):
+        value = field_expression(content, field, api_version)
+        values.append(value.fill_null("") if field.optional else value)
+    dates = [
+        (reply.struct.field(reply_dates[name].key) if name in reply_dates else pl.lit(None, pl.Int64)).alias(name)
+        for name in REPLY_DATES
+    ]
+    return pl.struct(
+        reply.struct.field("id"),
+        reply.struct.field("number"),
+        reply.struct.field("forum"),
+        reply.struct.field("replyto").alias("reply_to"),
+        invitation_expression(reply, api_version).alias("invitation"),
+        reply.struct.field("writers"),
+        pl.lit(get_template_id(fields)).alias("template_id"),
+        pl.concat_list(values).alias("content"),
+        *dates,
+    )
+
+
+def note_expressions(schema: VenueSchema) -> List[pl.Expr]:
+    note = pl.col("note")
+    details = note.struct.field("details")
+    invitation = invitation_expression(pl.element(), schema.api_version)
+    is_review = invitation.str.contains(schema.review_invitation, literal=True)
+    if "directReplies" in note_details(schema):
+        direct_replies = details.struct.field("directReplies")
+        reviews = direct_replies.list.filter(is_review).list.eval(
+            reply_expression(schema.review_fields, schema.reply_dates, schema.api_version)
+        )
+    else:
+        reviews = pl.lit([], dtype=NOTE_SCHEMA["reviews"])
+    if schema.decision_fields is not None:
+        # the last decision wins, like in the compiled parsers
+        decision = (
+            direct_replies.list.filter(~is_review & invitation.str.contains("Decision", literal=True))
+            .list.eval(reply_expression(schema.decision_fields, schema.reply_dates, schema.api_version))
+            .list.last()
+        )
+    else:
+        decision = pl.lit(None)
+    content = [
+        (
+            field_expression(note.struct.field("content"), schema.note_fields[name], schema.api_version)
+            if name in schema.note_fields
+            else pl.lit(None)
+        ).alias(name)
+        for name in NOTE_CONTENT_FIELDS
+    ]
+    columns = [
+        note.struct.field("id"),
+        note.struct.field("number"),
+        note.struct.field("forum"),
+        note.struct.field("or_venue"),
+        *content,
+        *[note.struct.field(name) for name in NOTE_DATES],
+        details.struct.field("tags"),
+        details.struct.field("replyCount").alias("reply_count"),
+        details.struct.field("directReplyCount").alias("direct_reply_count"),
+        pl.col("line").str.json_path_match("$.details.replies").alias("replies"),
+        pl.col("line").str.json_path_match("$.details.directReplies").alias("direct_replies"),
+        reviews.alias("reviews"),
+        decision.alias("decision"),
+    ]
+    return [column.cast(NOTE_SCHEMA[name]) for column, name in zip(columns, NOTE_SCHEMA.names())]
+
+
+def compile_frame_parser(venue: str, schema: VenueSchema) -> Callable[[pl.DataFrame], pl.DataFrame]:
+    dtype = note_dtype(schema)
+    columns = note_expressions(schema)
+
+    def parse_frame(lines: pl.DataFrame) -> pl.DataFrame:
+        # lines: a "line" column with the json of one note of this venue per row, returns the notes with NOTE_SCHEMA
+        notes = lines.with_columns(pl.col("line").str.json_decode(dtype).alias("note"))
+        other_venues = notes.filter(pl.col("note").struct.field("or_venue") != venue).height
+        if other_venues:
+            raise ParserError(f"{other_venues} notes are not from {venue}")
+        df = notes.select(columns)
+        if schema.require_reviews:
+            for forum in df.filter(pl.col("reviews").list.len() == 0)["forum"]:
+                print(f"Found no reviews in note. forum: {forum}")
+            df = df.filter(pl.col("reviews").list.len() > 0)
+        return df
+
+    return parse_frame
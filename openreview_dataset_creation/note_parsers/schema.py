@@ -0,0 +1,239 @@
+import hashlib
+import json
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from .data_models import Decision, Note, ParserError, Review
+
+# A venue is described by a VenueSchema (see venues.py), which is compiled once into a note parser: the schema is
+# turned into the source code of a parser function with every key path written out, like the parsers that used to be
+# written by hand for every venue. Parsing a note then does no lookups or branching on the schema.
+# Parsers compiled with validate=False build plain dicts with the fields of Note.model_dump() instead of pydantic models.
+# With dump_replies=False they also keep replies and direct_replies as lists of dicts instead of json strings.
+# The names and descriptions of the review/decision content fields are not stored in every reply, but once per venue in a
+# Template, which replies reference by template_id.
+
+
+class Field(NamedTuple):
+    key: str
+    optional: bool = False  # a missing key gives `default` instead of a KeyError
+    default: Any = None
+    transform: Optional[Callable] = None  # applied to values that are present
+
+
+class ContentField(NamedTuple):
+    name: str  # the name in Template.content_fields
+    meta: str  # the description of the field shown to reviewers
+    key: Optional[str] = None  # the key in the reply content, defaults to `name`
+    optional: bool = False  # a missing key gives ""
+    transform: Optional[Callable] = None
+
+
+class VenueSchema(NamedTuple):
+    api_version: int
+    note_fields: Dict[str, Field]  # Note fields read from the note content, all other content fields are None
+    review_invitation: str  # direct replies whose invitation contains this are reviews
+    review_fields: Sequence[ContentField]
+    decision_fields: Optional[Sequence[ContentField]]  # None if decisions are not parsed
+    reply_dates: Dict[str, Field]  # time fields of reviews and decisions, missing ones are None
+    require_reviews: bool = False  # raise a ParserError for notes without reviews
+
+
+def note_details(schema: VenueSchema) -> List[str]:
+    # The note details the parsers of a venue read. Reviews and decisions are direct replies, so directReplies is only
+    # needed by venues that parse them. "replies" (the whole discussion tree) is only copied to the output and is by far
+    # the largest detail, so it is never required.
+    details = ["directReplyCount", "replyCount", "tags"]
+    if schema.review_fields or schema.decision_fields is not None:
+        details.insert(0, "directReplies")
+    return details
+
+
+def join_lines(values):
+    return "\n".join(values)
+
+
+NOTE_DATES = ["cdate", "tcdate", "mdate", "tmdate", "pdate", "odate", "ddate"]
+NOTE_CONTENT_FIELDS = [
+    "venue",
+    "venueid",
+    "title",
+    "authors",
+    "author_ids",
+    "keywords",
+    "summary",
+    "abstract",
+    "area",
+    "paperhash",
+    "bibtex",
+    "pdf_url",
+    "original_pdf_url",
+    "supplementary_material_url",
+    "code",
+    "data",
+]
+REPLY_DATES = ["cdate", "tcdate", "mdate", "tmdate", "ddate", "tddate"]
+
+
+def value_expression(obj: str, field: Field, value_key: Optional[str], namespace: Dict[str, Any]) -> str:
+    expression = f"{obj}[{field.key!r}]"
+    if value_key is not None:
+        # API v2 wraps every content value in {"value": ...}
+        expression += f"[{value_key!r}]"
+    if field.transform is not None:
+        name = f"transform_{len(namespace)}"
+        namespace[name] = field.transform
+        expression = f"{name}({expression})"
+    if field.optional:
+        expression = f"({expression} if {field.key!r} in {obj} else {field.default!r})"
+    return expression
+
+
+def make_function(name: str, source: str, namespace: Dict[str, Any]) -> Callable:
+    exec(compile(source, f"<{name}>", "exec"), namespace)
+    function = namespace[name]
+    function.source = source
+    return function
+
+
+def get_template_id(fields: Sequence[ContentField]) -> str:
+    # changes to the names or descriptions of the fields give a new template_id
+    template = json.dumps([[field.name, field.meta] for field in fields])
+    return hashlib.sha256(template.encode()).hexdigest()[:16]
+
+
+def get_template(fields: Sequence[ContentField]) -> Dict[str, Any]:
+    return dict(
+        template_id=get_template_id(fields),
+        content_fields=[field.name for field in fields],
+        content_meta=[field.meta for field in fields],
+    )
+
+
+def compile_reply(model, fields: Sequence[ContentField], reply_dates: Dict[str, Field], api_version: int):
+    value_key = "value" if api_version == 2 else None
+    invitation = 'reply["invitation"]' if api_version == 1 else 'reply["invitations"][0]'
+    namespace = dict(
+        model=model,
+        template_id=get_template_id(fields),
+    )
+    content = [
+        value_expression(
+            "content", Field(field.key or field.name, field.optional, "", field.transform), value_key, namespace
+        )
+        for field in fields
+    ]
+    dates = [
+        f"{name}={value_expression('reply', reply_dates[name], None, namespace) if name in reply_dates else None},"
+        for name in REPLY_DATES
+    ]
+    source = "\n".join(
+        [
+            "def parse_reply(reply):",
+            '    content = reply["content"]',
+            "    return model(",
+            '        id=reply["id"],',
+            '        number=reply["number"],',
+            '        forum=reply["forum"],',
+            '        reply_to=reply["replyto"],',
+            f"        invitation={invitation},",
+            '        writers=reply["writers"],',
+            "        template_id=template_id,",
+            "        content=[",
+            *[f"            {expression}," for expression in content],
+            "        ],",
+            *[f"        {date}" for date in dates],
+            "    )",
+        ]
+    )
+    return make_function("parse_reply", source, namespace)
+
+
+def compile_note_parser(
+    schema: VenueSchema, validate: bool = True, dump_replies: bool = True
+) -> Callable[[Dict[str, Any]], Any]:
+    assert dump_replies or not validate, "the pydantic models store replies as json strings"
+    unknown_fields = set(schema.note_fields) - set(NOTE_CONTENT_FIELDS)
+    assert not unknown_fields, f"unknown note fields {unknown_fields}"
+    value_key = "value" if schema.api_version == 2 else None
+    invitation = 'direct_reply["invitation"]' if schema.api_version == 1 else 'direct_reply["invitations"][0]'
+    note_model, review_model, decision_model = (Note, Review, Decision) if validate else (dict, dict, dict)
+    namespace = dict(
+        json=json,
+        Note=note_model,
+        ParserError=ParserError,
+        parse_review=compile_reply(review_model, schema.review_fields, schema.reply_dates, schema.api_version),
+    )
+    match_replies = [
+        f"        if {schema.review_invitation!r} in inv:",
+        "            reviews.append(parse_review(direct_reply))",
+    ]
+    if schema.decision_fields is not None:
+        namespace["parse_decision"] = compile_reply(
+            decision_model, schema.decision_fields, schema.reply_dates, schema.api_version
+        )
+        match_replies += [
+            '        elif "Decision" in inv:',
+            "            decision = parse_decision(direct_reply)",
+        ]
+    require_reviews = []
+    if schema.require_reviews:
+        require_reviews = [
+            "    if not reviews:",
+            "        raise ParserError(f\"Found no reviews in note. forum: {note['forum']}\")",
+        ]
+    parses_replies = "directReplies" in note_details(schema)
+    if dump_replies:
+        replies = [
+            '        replies=json.dumps(details["replies"]) if "replies" in details else None,',
+            '        direct_replies=json.dumps(details["directReplies"]),'
+            if parses_replies
+            else '        direct_replies=json.dumps(details["directReplies"]) if "directReplies" in details else None,',
+        ]
+    else:
+        replies = [
+            '        replies=details["replies"] if "replies" in details else None,',
+            '        direct_replies=details["directReplies"],'
+            if parses_replies
+            else '        direct_replies=details.get("directReplies"),',
+        ]
+    reply_loop = []
+    if parses_replies:
+        reply_loop = [
+            '    for direct_reply in details["directReplies"]:',
+            f"        inv = {invitation}",
+            *match_replies,
+        ]
+    content = [
+        (
+            f"{name}={value_expression('content', schema.note_fields[name], value_key, namespace)},"
+            if name in schema.note_fields
+            else f"{name}=None,"
+        )
+        for name in NOTE_CONTENT_FIELDS
+    ]
+    source = "\n".join(
+        [
+            "def parse_note(note):",
+            '    details = note["details"]',
+            '    content = note["content"]',
+            "    reviews = []",
+            "    decision = None",
+            *reply_loop,
+            *require_reviews,
+            "    return Note(",
+            '        id=note["id"],',
+            '        number=note["number"],',
+            '        forum=note["forum"],',
+            '        or_venue=note["or_venue"],',
+            *[f"        {expression}" for expression in content],
+            *[f'        {name}=note["{name}"],' for name in NOTE_DATES],
+            '        tags=details["tags"],',
+            '        reply_count=details["replyCount"],',
+            '        direct_reply_count=details["directReplyCount"],',
+            *replies,
+            "        reviews=reviews,",
+            "        decision=decision,",
+            "    )",
+        ]
+    )
+    return make_function("parse_note", source, namespace)
@@ -0,0 +1,571 @@
+from .schema import ContentField, Field, VenueSchema, join_lines
+
+# Adding a venue only needs a new entry in VENUE_SCHEMAS, it is compiled into a note parser by schema.py.
+
+REPLY_DATES = {key: Field(key) for key in ["cdate", "tcdate", "mdate", "tmdate", "ddate", "tddate"]}
+# ICLR 2021 replies may lack mdate
+ICLR_2021_REPLY_DATES = {**REPLY_DATES, "mdate": Field("mdate", optional=True)}
+# API v2 replies may lack ddate and tddate
+OPTIONAL_DELETION_REPLY_DATES = {
+    **REPLY_DATES,
+    "ddate": Field("ddate", optional=True),
+    "tddate": Field("tddate", optional=True),
+}
+# deletion dates are not parsed for NeurIPS
+NO_DELETION_REPLY_DATES = {key: REPLY_DATES[key] for key in ["cdate", "tcdate", "mdate", "tmdate"]}
+
+VENUE_SCHEMAS = {
+    "NeurIPS.cc/2024/Conference": VenueSchema(
+        api_version=2,
+        note_fields={
+            "venue": Field("venue"),
+            "venueid": Field("venueid"),
+            "title": Field("title"),
+            "authors": Field("authors"),
+            "author_ids": Field("authorids"),
+            "keywords": Field("keywords"),
+            "summary": Field("TLDR", optional=True),
+            "abstract": Field("abstract"),
+            "paperhash": Field("paperhash"),
+            "bibtex": Field("_bibtex"),
+            "pdf_url": Field("pdf"),
+            "supplementary_material_url": Field("supplementary_material", optional=True),
+        },
+        review_invitation="Official_Review",
+        review_fields=[
+            ContentField(
+                "summary",
+                "Briefly summarize the paper and its contributions. This is not the place to critique the paper; the authors should generally agree with a well-written summary.",
+            ),
+            ContentField(
+                "soundness",
+                "Please assign the paper a numerical rating on the following scale to indicate the soundness of the technical claims, experimental and research methodology and on whether the central claims of the paper are adequately supported with evidence.\n4: excellent\n3: good\n2: fair\n1: poor",
+                transform=str,
+            ),
+            ContentField(
+                "presentation",
+                "Please assign the paper a numerical rating on the following scale to indicate the quality of the presentation. This should take into account the writing style and clarity, as well as contextualization relative to prior work.\n4: excellent\n3: good\n2: fair\n1: poor",
+                transform=str,
+            ),
+            ContentField(
+                "contribution",
+                "Please assign the paper a numerical rating on the following scale to indicate the quality of the overall contribution this paper makes to the research area being studied. Are the questions being asked important? Does the paper bring a significant originality of ideas and/or execution? Are the results valuable to share with the broader NeurIPS community?\n4: excellent\n3: good\n2: fair\n1: poor",
+                transform=str,
+            ),
+            ContentField(
+                "strengths",
+                "A substantive assessment of the strengths of the paper, touching on each of the following dimensions: originality, quality, clarity, and significance. We encourage reviewers to be broad in their definitions of originality and significance. For example, originality may arise from a new definition or problem formulation, creative combinations of existing ideas, application to a new domain, or removing limitations from prior results.",
+            ),
+            ContentField(
+                "weaknesses",
+                "A substantive assessment of the weaknesses of the paper. Focus on constructive and actionable insights on how the work could improve towards its stated goals. Be specific, and avoid generic remarks. For example, if you believe the contribution lacks novelty, provide references and an explanation as evidence; if you believe experiments are insufficient, explain why and exactly what is missing, etc. Please keep in mind that the rebuttal period is not necessarily enough to run new experiments. As a result, asking for new results is rather unrealistic.",
+            ),
+            ContentField(
+                "questions",
+                "Please list up and carefully describe any questions and suggestions for the authors. Think of the things where a response from the author can change your opinion, clarify a confusion, or address a limitation. This is important for a productive rebuttal and discussion phase with the authors.",
+            ),
+            ContentField(
+                "limitations",
+                "Have the authors adequately addressed the limitations and, if applicable, potential negative societal impact of their work? If not, please include constructive suggestions for improvement. Authors should be rewarded rather than punished for being up front about the limitations of their work and any potential negative societal impact.",
+            ),
+            ContentField(
+                "flag_for_ethics_review",
+                "If there are ethical issues with this paper, please flag the paper for an ethics review and select area of expertise that would be most useful for the ethics reviewer to have. Please select all that apply.\nNo ethics review needed\nEthics review needed: Research involving human subjects\nEthics review needed: Data privacy, copyright, and consent\nEthics review needed: Data quality and representativeness\nEthics review needed: Safety and security\nEthics review needed: Discrimination, bias, and fairness\nEthics review needed: Deception and harassment\nEthics review needed: Environmental Impact\nEthics review needed: Human rights (including surveillance)",
+                transform=join_lines,
+            ),
+            ContentField(
+                "rating",
+                'Please provide an "overall score" for this submission. Choose from the following:\n10: Award quality: Technically flawless paper with groundbreaking impact, with exceptionally strong evaluation, reproducibility, and resources, and no unaddressed ethical considerations.\n9: Very Strong Accept: Technically flawless paper with groundbreaking impact on at least one area of AI/ML and excellent impact on multiple areas of AI/ML, with flawless evaluation, resources, and reproducibility, and no unaddressed ethical considerations.\n8: Strong Accept: Technically strong paper, with novel ideas, excellent impact on at least one area, or high-to-excellent impact on multiple areas, with excellent evaluation, resources, and reproducibility, and no unaddressed ethical considerations.\n7: Accept: Technically solid paper, with high impact on at least one sub-area, or moderate-to-high impact on more than one areas, with good-to-excellent evaluation, resources, reproducibility, and no unaddressed ethical considerations.\n6: Weak Accept: Technically solid, moderate-to-high impact paper, with no major concerns with respect to evaluation, resources, reproducibility, ethical considerations.\n5: Borderline accept: Technically solid paper where reasons to accept outweigh reasons to reject, e.g., limited evaluation. Please use sparingly.\n4: Borderline reject: Technically solid paper where reasons to reject, e.g., limited evaluation, outweigh reasons to accept, e.g., good evaluation. Please use sparingly.\n3: Reject: For instance, a paper with technical flaws, weak evaluation, inadequate reproducibility and/or incompletely addressed ethical considerations.\n2: Strong Reject: For instance, a paper with major technical flaws, and/or poor evaluation, limited impact, poor reproducibility and mostly unaddressed ethical considerations.\n1: Very Strong Reject: For instance, a paper with incorrect statements, improper (e.g., offensive) language, unaddressed ethical considerations, incorrect results and/or flawed methodology (e.g., training using a test set).',
+                transform=str,
+            ),
+            ContentField(
+                "confidence",
+                'Please provide a "confidence score" for your assessment of this submission to indicate how confident you are in your evaluation. Choose from the following:\n5: You are absolutely certain about your assessment. You are very familiar with the related work and checked the math/other details carefully.\n4: You are confident in your assessment, but not absolutely certain. It is unlikely, but not impossible, that you did not understand some parts of the submission or that you are unfamiliar with some pieces of related work.\n3: You are fairly confident in your assessment. It is possible that you did not understand some parts of the submission or that you are unfamiliar with some pieces of related work. Math/other details were not carefully checked.\n2: You are willing to defend your assessment, but it is quite likely that you did not understand the central parts of the submission or that you are unfamiliar with some pieces of related work. Math/other details were not carefully checked.\n1: Your assessment is an educated guess. The submission is not in your area or the submission was difficult to understand. Math/other details were not carefully checked.',
+                transform=str,
+            ),
+        ],
+        decision_fields=[
+            ContentField(
+                "decision",
+                "Paper Decision. Choose from the following:\nAccept (oral)\nAccept (spotlight)\nAccept (poster)\nReject",
+            ),
+            ContentField("comment", "Comment (Optional)."),
+        ],
+        reply_dates=NO_DELETION_REPLY_DATES,
+    ),
+    "NeurIPS.cc/2023/Conference": VenueSchema(
+        api_version=2,
+        note_fields={
+            "venue": Field("venue"),
+            "venueid": Field("venueid"),
+            "title": Field("title"),
+            "authors": Field("authors"),
+            "author_ids": Field("authorids"),
+            "keywords": Field("keywords"),
+            "summary": Field("TLDR", optional=True),
+            "abstract": Field("abstract"),
+            "paperhash": Field("paperhash"),
+            "bibtex": Field("_bibtex"),
+            "pdf_url": Field("pdf"),
+            "supplementary_material_url": Field("supplementary_material", optional=True),
+        },
+        review_invitation="Official_Review",
+        review_fields=[
+            ContentField(
+                "summary",
+                "Briefly summarize the paper and its contributions. This is not the place to critique the paper; the authors should generally agree with a well-written summary.",
+            ),
+            ContentField(
+                "soundness",
+                "Please assign the paper a numerical rating on the following scale to indicate the soundness of the technical claims, experimental and research methodology and on whether the central claims of the paper are adequately supported with evidence.\n4 excellent\n3 good\n2 fair\n1 poor",
+            ),
+            ContentField(
+                "presentation",
+                "Please assign the paper a numerical rating on the following scale to indicate the quality of the presentation. This should take into account the writing style and clarity, as well as contextualization relative to prior work.\n4 excellent\n3 good\n2 fair\n1 poor",
+            ),
+            ContentField(
+                "contribution",
+                "Please assign the paper a numerical rating on the following scale to indicate the quality of the overall contribution this paper makes to the research area being studied. Are the questions being asked important? Does the paper bring a significant originality of ideas and/or execution? Are the results valuable to share with the broader NeurIPS community?\n4 excellent\n3 good\n2 fair\n1 poor",
+            ),
+            ContentField(
+                "strengths",
+                "A substantive assessment of the strengths of the paper, touching on each of the following dimensions: originality, quality, clarity, and significance. We encourage reviewers to be broad in their definitions of originality and significance. For example, originality may arise from a new definition or problem formulation, creative combinations of existing ideas, application to a new domain, or removing limitations from prior results.",
+            ),
+            ContentField(
+                "weaknesses",
+                "A substantive assessment of the weaknesses of the paper. Focus on constructive and actionable insights on how the work could improve towards its stated goals. Be specific, avoid generic remarks. For example, if you believe the contribution lacks novelty, provide references and an explanation as evidence; if you believe experiments are insufficient, explain why and exactly what is missing, etc.",
+            ),
+            ContentField(
+                "questions",
+                "Please list up and carefully describe any questions and suggestions for the authors. Think of the things where a response from the author can change your opinion, clarify a confusion or address a limitation. This is important for a productive rebuttal and discussion phase with the authors.",
+            ),
+            ContentField(
+                "limitations",
+                "Have the authors adequately addressed the limitations and, if applicable, potential negative societal impact of their work? If not, please include constructive suggestions for improvement. Authors should be rewarded rather than punished for being up front about the limitations of their work and any potential negative societal impact.",
+            ),
+            ContentField(
+                "flag_for_ethics_review",
+                "If there are ethical issues with this paper, please flag the paper for an ethics review and select area of expertise that would be most useful for the ethics reviewer to have. Please select all that apply. \nNo ethics review needed.\nEthics review needed: Discrimination / Bias / Fairness Concerns\nEthics review needed: Inadequate Data and Algorithm Evaluation\nEthics review needed: Inappropriate Potential Applications & Impact  (e.g., human rights concerns)\nEthics review needed: Privacy and Security (e.g., consent, surveillance, data storage concern)\nEthics review needed: Compliance (e.g., GDPR, copyright, license, terms of use)\nEthics review needed: Research Integrity Issues (e.g., plagiarism)\nEthics review needed: Responsible Research Practice (e.g., IRB, documentation, research ethics)\nEthics review needed: Failure to comply with NeurIPS Code of Ethics (lack of required documentation, safeguards, disclosure, licenses, legal compliance)",
+                transform=join_lines,
+            ),
+            ContentField(
+                "rating",
+                'Please provide an "overall score" for this submission. Choose from the following:\n10: Award quality: Technically flawless paper with groundbreaking impact, with exceptionally strong evaluation, reproducibility, and resources, and no unaddressed ethical considerations.\n9: Very Strong Accept: Technically flawless paper with groundbreaking impact on at least one area of AI/ML and excellent impact on multiple areas of AI/ML, with flawless evaluation, resources, and reproducibility, and no unaddressed ethical considerations.\n8: Strong Accept: Technically strong paper, with novel ideas, excellent impact on at least one area, or high-to-excellent impact on multiple areas, with excellent evaluation, resources, and reproducibility, and no unaddressed ethical considerations.\n7: Accept: Technically solid paper, with high impact on at least one sub-area, or moderate-to-high impact on more than one areas, with good-to-excellent evaluation, resources, reproducibility, and no unaddressed ethical considerations.\n6: Weak Accept: Technically solid, moderate-to-high impact paper, with no major concerns with respect to evaluation, resources, reproducibility, ethical considerations.\n5: Borderline accept: Technically solid paper where reasons to accept outweigh reasons to reject, e.g., limited evaluation. Please use sparingly.\n4: Borderline reject: Technically solid paper where reasons to reject, e.g., limited evaluation, outweigh reasons to accept, e.g., good evaluation. Please use sparingly.\n3: Reject: For instance, a paper with technical flaws, weak evaluation, inadequate reproducibility and incompletely addressed ethical considerations.\n2: Strong Reject: For instance, a paper with major technical flaws, and/or poor evaluation, limited impact, poor reproducibility and mostly unaddressed ethical considerations.\n1: Very Strong Reject: For instance, a paper with trivial results or unaddressed ethical considerations.',
+            ),
+            ContentField(
+                "confidence",
+                'Please provide a "confidence score" for your assessment of this submission to indicate how confident you are in your evaluation. Choose from the following:\n5: You are absolutely certain about your assessment. You are very familiar with the related work and checked the math/other details carefully.\n4: You are confident in your assessment, but not absolutely certain. It is unlikely, but not impossible, that you did not understand some parts of the submission or that you are unfamiliar with some pieces of related work.\n3: You are fairly confident in your assessment. It is possible that you did not understand some parts of the submission or that you are unfamiliar with some pieces of related work. Math/other details were not carefully checked.\n2: You are willing to defend your assessment, but it is quite likely that you did not understand the central parts of the submission or that you are unfamiliar with some pieces of related work. Math/other details were not carefully checked.\n1: Your assessment is an educated guess. The submission is not in your area or the submission was difficult to understand. Math/other details were not carefully checked.',
+            ),
+        ],
+        decision_fields=[
+            ContentField(
+                "decision",
+                "Paper Decision. Choose from the following:\nAccept (oral)\nAccept (spotlight)\nAccept (poster)\nReject",
+            ),
+            ContentField("comment", "Comment (Optional)."),
+        ],
+        reply_dates=NO_DELETION_REPLY_DATES,
+    ),
+    "NeurIPS.cc/2022/Conference": VenueSchema(
+        api_version=1,
+        note_fields={
+            "venue": Field("venue"),
+            "venueid": Field("venueid"),
+            "title": Field("title"),
+            "authors": Field("authors"),
+            "author_ids": Field("authorids"),
+            "keywords": Field("keywords"),
+            "summary": Field("TL;DR", optional=True),
+            "abstract": Field("abstract"),
+            "paperhash": Field("paperhash"),
+            "bibtex": Field("_bibtex"),
+            "pdf_url": Field("pdf"),
+            "supplementary_material_url": Field("supplementary_material", optional=True),
+        },
+        review_invitation="Official_Review",
+        review_fields=[
+            ContentField(
+                "summary",
+                "Briefly summarize the paper and its contributions. This is not the place to critique the paper; the authors should generally agree with a well-written summary.",
+            ),
+            ContentField(
+                "strengths_and_weaknesses",
+                "Please provide a thorough assessment of the strengths and weaknesses of the paper, touching on each of the following dimensions: originality, quality, clarity and significance. You can incorporate Markdown and Latex into your review.",
+            ),
+            ContentField(
+                "questions",
+                "Please list up and carefully describe any questions and suggestions for the authors. Think of the things where a response from the author can change your opinion, clarify a confusion or address a limitation. This can be very important for a productive rebuttal and discussion phase with the authors.",
+            ),
+            ContentField(
+                "limitations",
+                "Have the authors adequately addressed the limitations and potential negative societal impact of their work? If not, please include constructive suggestions for improvement. Authors should be rewarded rather than punished for being up front about the limitations of their work and any potential negative societal impact.",
+            ),
+            ContentField(
+                "ethics_flag",
+                "If there are ethical issues with this paper, please flag the paper for an ethics review.",
+            ),
+            ContentField(
+                "ethics_review_area",
+                "If you flagged this paper for ethics review, what area of expertise would it be most useful for the ethics reviewer to have? Choose from the following:\nDiscrimination / Bias / Fairness Concerns\nInadequate Data and Algorithm Evaluation\nInappropriate Potential Applications & Impact  (e.g., human rights concerns)\nPrivacy and Security (e.g., consent)\nLegal Compliance (e.g., GDPR, copyright, terms of use)\nResearch Integrity Issues (e.g., plagiarism)\nResponsible Research Practice (e.g., IRB, documentation, research ethics)\nI don’t know",
+                transform=join_lines,
+            ),
+            ContentField(
+                "soundness",
+                "Please assign the paper a numerical rating on the following scale to indicate the soundness of the technical claims, experimental and research methodology and on whether the central claims of the paper are adequately supported with evidence.\n4 excellent\n3 good\n2 fair\n1 poor",
+            ),
+            ContentField(
+                "presentation",
+                "Please assign the paper a numerical rating on the following scale to indicate the quality of the presentation. This should take into account the writing style and clarity, as well as contextualization relative to prior work.\n4 excellent\n3 good\n2 fair\n1 poor",
+            ),
+            ContentField(
+                "contribution",
+                "Please assign the paper a numerical rating on the following scale to indicate the quality of the overall contribution this paper makes to the research area being studied. Are the questions being asked important? Does the paper bring a significant originality of ideas and/or execution? Are the results valuable to share with the broader NeurIPS community.\n4 excellent\n3 good\n2 fair\n1 poor",
+            ),
+            ContentField(
+                "rating",
+                'Please provide an "overall score" for this submission. Choose from the following:\n10: Award quality: Technically flawless paper with groundbreaking impact, with exceptionally strong evaluation, reproducibility, and resources, and no unaddressed ethical considerations.\n9: Very Strong Accept: Technically flawless paper with groundbreaking impact on at least one area of AI/ML and excellent impact on multiple areas of AI/ML, with flawless evaluation, resources, and reproducibility, and no unaddressed ethical considerations.\n8: Strong Accept: Technically strong paper, with novel ideas, excellent impact on at least one area, or high-to-excellent impact on multiple areas, with excellent evaluation, resources, and reproducibility, and no unaddressed ethical considerations.\n7: Accept: Technically solid paper, with high impact on at least one sub-area, or moderate-to-high impact on more than one areas, with good-to-excellent evaluation, resources, reproducibility, and no unaddressed ethical considerations.\n6: Weak Accept: Technically solid, moderate-to-high impact paper, with no major concerns with respect to evaluation, resources, reproducibility, ethical considerations.\n5: Borderline accept: Technically solid paper where reasons to accept outweigh reasons to reject, e.g., limited evaluation. Please use sparingly.\n4: Borderline reject: Technically solid paper where reasons to reject, e.g., limited evaluation, outweigh reasons to accept, e.g., good evaluation. Please use sparingly.\n3: Reject: For instance, a paper with technical flaws, weak evaluation, inadequate reproducibility and incompletely addressed ethical considerations.\n2: Strong Reject: For instance, a paper with major technical flaws, and/or poor evaluation, limited impact, poor reproducibility and mostly unaddressed ethical considerations.\n1: Very Strong Reject: For instance, a paper with trivial results or unaddressed ethical considerations',
+            ),
+            ContentField(
+                "confidence",
+                'Please provide a "confidence score" for your assessment of this submission to indicate how confident you are in your evaluation. Choose from the following:\n5: You are absolutely certain about your assessment. You are very familiar with the related work and checked the math/other details carefully.\n4: You are confident in your assessment, but not absolutely certain. It is unlikely, but not impossible, that you did not understand some parts of the submission or that you are unfamiliar with some pieces of related work.\n3: You are fairly confident in your assessment. It is possible that you did not understand some parts of the submission or that you are unfamiliar with some pieces of related work. Math/other details were not carefully checked.\n2: You are willing to defend your assessment, but it is quite likely that you did not understand the central parts of the submission or that you are unfamiliar with some pieces of related work. Math/other details were not carefully checked.\n1: Your assessment is an educated guess. The submission is not in your area or the submission was difficult to understand. Math/other details were not carefully checked.',
+            ),
+        ],
+        decision_fields=[
+            ContentField("decision", "Paper Decision. Choose from the following:\nAccept\nReject\nOn Hold"),
+            ContentField("comment", "Comment (Optional).", optional=True),
+        ],
+        reply_dates=NO_DELETION_REPLY_DATES,
+    ),
+    "ICLR.cc/2025/Conference": VenueSchema(
+        api_version=2,
+        note_fields={
+            "venue": Field("venue"),
+            "venueid": Field("venueid"),
+            "title": Field("title"),
+            "authors": Field("authors", optional=True),
+            "author_ids": Field("authorids", optional=True),
+            "keywords": Field("keywords"),
+            "summary": Field("TLDR", optional=True, default=""),
+            "abstract": Field("abstract"),
+            "area": Field("primary_area"),
+            "paperhash": Field("paperhash", optional=True),
+            "bibtex": Field("_bibtex"),
+            "pdf_url": Field("pdf"),
+            "supplementary_material_url": Field("supplementary_material", optional=True),
+        },
+        review_invitation="Official_Review",
+        review_fields=[
+            ContentField(
+                "summary",
+                "Briefly summarize the paper and its contributions. This is not the place to critique the paper; the authors should generally agree with a well-written summary.",
+            ),
+            ContentField(
+                "soundness",
+                "Please assign the paper a numerical rating on the following scale to indicate the soundness of the technical claims, experimental and research methodology and on whether the central claims of the paper are adequately supported with evidence. Choose from the following:\n4: excellent\n3: good\n2: fair\n1: poor",
+                transform=str,
+            ),
+            ContentField(
+                "presentation",
+                "Please assign the paper a numerical rating on the following scale to indicate the quality of the presentation. This should take into account the writing style and clarity, as well as contextualization relative to prior work. Choose from the following:\n4: excellent\n3: good\n2: fair\n1: poor",
+                transform=str,
+            ),
+            ContentField(
+                "contribution",
+                "Please assign the paper a numerical rating on the following scale to indicate the quality of the overall contribution this paper makes to the research area being studied. Are the questions being asked important? Does the paper bring a significant originality of ideas and/or execution? Are the results valuable to share with the broader ICLR community? Choose from the following:\n4: excellent\n3: good\n2: fair\n1: poor",
+                transform=str,
+            ),
+            ContentField(
+                "strengths",
+                "A substantive assessment of the strengths of the paper, touching on each of the following dimensions: originality, quality, clarity, and significance. We encourage reviewers to be broad in their definitions of originality and significance. For example, originality may arise from a new definition or problem formulation, creative combinations of existing ideas, application to a new domain, or removing limitations from prior results.",
+            ),
+            ContentField(
+                "weaknesses",
+                "A substantive assessment of the weaknesses of the paper. Focus on constructive and actionable insights on how the work could improve towards its stated goals. Be specific, avoid generic remarks. For example, if you believe the contribution lacks novelty, provide references and an explanation as evidence; if you believe experiments are insufficient, explain why and exactly what is missing, etc.",
+            ),
+            ContentField(
+                "questions",
+                "Please list up and carefully describe any questions and suggestions for the authors. Think of the things where a response from the author can change your opinion, clarify a confusion or address a limitation. This is important for a productive rebuttal and discussion phase with the authors.",
+            ),
+            ContentField(
+                "flag_for_ethics_review",
+                "If there are ethical issues with this paper, please flag the paper for an ethics review and select area of expertise that would be most useful for the ethics reviewer to have. Please select all that apply. Choose from the following:\nNo ethics review needed.\nYes, Discrimination / bias / fairness concerns\nYes, Privacy, security and safety\nYes, Legal compliance (e.g., GDPR, copyright, terms of use)\nYes, Potentially harmful insights, methodologies and applications\nYes, Responsible research practice (e.g., human subjects, data release)\nYes, Research integrity issues (e.g., plagiarism, dual submission)\nYes, Unprofessional behaviors (e.g., unprofessional exchange between authors and reviewers)\nYes, Other reasons (please specify below)",
+                transform=join_lines,
+            ),
+            ContentField("details_of_ethics_concerns", "Please provide details of your concerns.", optional=True),
+            ContentField(
+                "rating",
+                'Please provide an "overall score" for this submission. Choose from the following:\n1: strong reject\n3: reject, not good enough\n5: marginally below the acceptance threshold\n6: marginally above the acceptance threshold\n8: accept, good paper\n10: strong accept, should be highlighted at the conference',
+                transform=str,
+            ),
+            ContentField(
+                "confidence",
+                'Please provide a "confidence score" for your assessment of this submission to indicate how confident you are in your evaluation. Choose from the following:\n1: You are unable to assess this paper and have alerted the ACs to seek an opinion from different reviewers.\n2: You are willing to defend your assessment, but it is quite likely that you did not understand the central parts of the submission or that you are unfamiliar with some pieces of related work. Math/other details were not carefully checked.\n3: You are fairly confident in your assessment. It is possible that you did not understand some parts of the submission or that you are unfamiliar with some pieces of related work. Math/other details were not carefully checked.\n4: You are confident in your assessment, but not absolutely certain. It is unlikely, but not impossible, that you did not understand some parts of the submission or that you are unfamiliar with some pieces of related work.\n5: You are absolutely certain about your assessment. You are very familiar with the related work and checked the math/other details carefully.',
+                transform=str,
+            ),
+        ],
+        decision_fields=None,
+        reply_dates=OPTIONAL_DELETION_REPLY_DATES,
+        require_reviews=True,
+    ),
+    "ICLR.cc/2024/Conference": VenueSchema(
+        api_version=2,
+        note_fields={
+            "venue": Field("venue"),
+            "venueid": Field("venueid"),
+            "title": Field("title"),
+            "authors": Field("authors"),
+            "author_ids": Field("authorids"),
+            "keywords": Field("keywords"),
+            "summary": Field("TLDR", optional=True, default=""),
+            "abstract": Field("abstract"),
+            "area": Field("primary_area"),
+            "paperhash": Field("paperhash"),
+            "bibtex": Field("_bibtex"),
+            "pdf_url": Field("pdf"),
+            "supplementary_material_url": Field("supplementary_material", optional=True),
+        },
+        review_invitation="Official_Review",
+        review_fields=[
+            ContentField(
+                "summary",
+                "Briefly summarize the paper and its contributions. This is not the place to critique the paper; the authors should generally agree with a well-written summary.",
+            ),
+            ContentField(
+                "soundness",
+                "Please assign the paper a numerical rating on the following scale to indicate the soundness of the technical claims, experimental and research methodology and on whether the central claims of the paper are adequately supported with evidence. Choose from the following:\n4 excellent\n3 good\n2 fair\n1 poor",
+            ),
+            ContentField(
+                "presentation",
+                "Please assign the paper a numerical rating on the following scale to indicate the quality of the presentation. This should take into account the writing style and clarity, as well as contextualization relative to prior work. Choose from the following:\n4 excellent\n3 good\n2 fair\n1 poor",
+            ),
+            ContentField(
+                "contribution",
+                "Please assign the paper a numerical rating on the following scale to indicate the quality of the overall contribution this paper makes to the research area being studied. Are the questions being asked important? Does the paper bring a significant originality of ideas and/or execution? Are the results valuable to share with the broader ICLR community? Choose from the following:\n4 excellent\n3 good\n2 fair\n1 poor",
+            ),
+            ContentField(
+                "strengths",
+                "A substantive assessment of the strengths of the paper, touching on each of the following dimensions: originality, quality, clarity, and significance. We encourage reviewers to be broad in their definitions of originality and significance. For example, originality may arise from a new definition or problem formulation, creative combinations of existing ideas, application to a new domain, or removing limitations from prior results.",
+            ),
+            ContentField(
+                "weaknesses",
+                "A substantive assessment of the weaknesses of the paper. Focus on constructive and actionable insights on how the work could improve towards its stated goals. Be specific, avoid generic remarks. For example, if you believe the contribution lacks novelty, provide references and an explanation as evidence; if you believe experiments are insufficient, explain why and exactly what is missing, etc.",
+            ),
+            ContentField(
+                "questions",
+                "Please list up and carefully describe any questions and suggestions for the authors. Think of the things where a response from the author can change your opinion, clarify a confusion or address a limitation. This is important for a productive rebuttal and discussion phase with the authors.",
+            ),
+            ContentField(
+                "flag_for_ethics_review",
+                "If there are ethical issues with this paper, please flag the paper for an ethics review and select area of expertise that would be most useful for the ethics reviewer to have. Please select all that apply. Choose from the following:\nNo ethics review needed.\nYes, Discrimination / bias / fairness concerns\nYes, Privacy, security and safety\nYes, Legal compliance (e.g., GDPR, copyright, terms of use)\nYes, Potentially harmful insights, methodologies and applications\nYes, Responsible research practice (e.g., human subjects, data release)\nYes, Research integrity issues (e.g., plagiarism, dual submission)\nYes, Unprofessional behaviors (e.g., unprofessional exchange between authors and reviewers)\nYes, Other reasons (please specify below)",
+                transform=join_lines,
+            ),
+            ContentField(
+                "details_of_ethics_concerns", "(Optional) Please provide details of your concerns.", optional=True
+            ),
+            ContentField(
+                "rating",
+                'Please provide an "overall score" for this submission. Choose from the following:\n1: strong reject\n3: reject, not good enough\n5: marginally below the acceptance threshold\n6: marginally above the acceptance threshold\n8: accept, good paper\n10: strong accept, should be highlighted at the conference',
+            ),
+            ContentField(
+                "confidence",
+                'Please provide a "confidence score" for your assessment of this submission to indicate how confident you are in your evaluation. Choose from the following:\n1: You are unable to assess this paper and have alerted the ACs to seek an opinion from different reviewers.\n2: You are willing to defend your assessment, but it is quite likely that you did not understand the central parts of the submission or that you are unfamiliar with some pieces of related work. Math/other details were not carefully checked.\n3: You are fairly confident in your assessment. It is possible that you did not understand some parts of the submission or that you are unfamiliar with some pieces of related work. Math/other details were not carefully checked.\n4: You are confident in your assessment, but not absolutely certain. It is unlikely, but not impossible, that you did not understand some parts of the submission or that you are unfamiliar with some pieces of related work.\n5: You are absolutely certain about your assessment. You are very familiar with the related work and checked the math/other details carefully.',
+            ),
+        ],
+        decision_fields=[
+            ContentField(
+                "decision",
+                "Paper Decision. Choose from the following:\nAccept (oral)\nAccept (spotlight)\nAccept (poster)\nReject\nDecision Pending",
+            ),
+            ContentField("comment", "Comment (Optional).", optional=True),
+        ],
+        reply_dates=OPTIONAL_DELETION_REPLY_DATES,
+        require_reviews=True,
+    ),
+    "ICLR.cc/2023/Conference": VenueSchema(
+        api_version=1,
+        note_fields={
+            "venue": Field("venue"),
+            "venueid": Field("venueid"),
+            "title": Field("title"),
+            "authors": Field("authors"),
+            "author_ids": Field("authorids"),
+            "keywords": Field("keywords"),
+            "summary": Field("TL;DR", optional=True),
+            "abstract": Field("abstract"),
+            "area": Field("Please_choose_the_closest_area_that_your_submission_falls_into", optional=True),
+            "paperhash": Field("paperhash"),
+            "bibtex": Field("_bibtex"),
+            "pdf_url": Field("pdf"),
+            "supplementary_material_url": Field("supplementary_material", optional=True),
+        },
+        review_invitation="Review",
+        review_fields=[
+            ContentField("summary_of_the_paper", "Provide a brief summary of the paper and its contributions."),
+            ContentField(
+                "strength_and_weaknesses",
+                "Please list both the strengths and weaknesses of the paper. When discussing weaknesses, please provide concrete, actionable feedback on the paper.",
+            ),
+            ContentField(
+                "clarity,_quality,_novelty_and_reproducibility",
+                "Can you provide an evaluation of the quality, clarity and originality of the work?",
+            ),
+            ContentField(
+                "summary_of_the_review", "Please provide a short summary justifying your recommendation of the paper."
+            ),
+            ContentField(
+                "correctness",
+                "When evaluating correctness, we urge reviewers to focus on the technical content of the paper instead of language. This is especially important to support researchers from diverse geographical backgrounds. Choose from the following:\n1: The main claims of the paper are incorrect or not at all supported by theory or empirical results.\n2: Several of the paper’s claims are incorrect or not well-supported.\n3: Some of the paper’s claims have minor issues. A few statements are not well-supported, or require small changes to be made correct.\n4: All of the claims and statements are well-supported and correct.",
+            ),
+            ContentField(
+                "technical_novelty_and_significance",
+                "For this question, contributions are technical in nature, including new models, techniques, or theoretical insights. Choose from the following:\n1: The contributions are neither significant nor novel.\n2: The contributions are only marginally significant or novel.\n3: The contributions are significant and somewhat new. Aspects of the contributions exist in prior work.\n4: The contributions are significant, and do not exist in prior works.",
+            ),
+            ContentField(
+                "empirical_novelty_and_significance",
+                "For this question, contributions include new insights supported by empirical results including those arising from new benchmarks or datasets. Choose from the following:\nNot applicable\n1: The contributions are neither significant nor novel.\n2: The contributions are only marginally significant or novel.\n3: The contributions are significant and somewhat new. Aspects of the contributions exist in prior work.\n4: The contributions are significant, and do not exist in prior works.",
+            ),
+            ContentField(
+                "flag_for_ethics_review",
+                "Choose one or more from the following entries:\nNO.\nYes, Discrimination / bias / fairness concerns\nYes, Privacy, security and safety\nYes, Legal compliance (e.g., GDPR, copyright, terms of use)\nYes, Potentially harmful insights, methodologies and applications\nYes, Responsible research practice (e.g., human subjects, data release)\nYes, Research integrity issues (e.g., plagiarism, dual submission)\nYes, Unprofessional behaviors (e.g., unprofessional exchange between authors and reviewers)\nYes, Other reasons (please specify below)",
+                transform=join_lines,
+            ),
+            ContentField("details_of_ethics_concerns", "Please provide details of your concerns.", optional=True),
+            ContentField(
+                "recommendation",
+                "Your recommendation. Choose from the following:\n1: strong reject\n3: reject, not good enough\n5: marginally below the acceptance threshold\n6: marginally above the acceptance threshold\n8: accept, good paper\n10: strong accept, should be highlighted at the conference",
+            ),
+            ContentField(
+                "confidence",
+                "Your confidence. Choose from the following:\n1: You are unable to assess this paper and have alerted the ACs to seek an opinion from different reviewers.\n2: You are willing to defend your assessment, but it is quite likely that you did not understand the central parts of the submission or that you are unfamiliar with some pieces of related work. Math/other details were not carefully checked.\n3: You are fairly confident in your assessment. It is possible that you did not understand some parts of the submission or that you are unfamiliar with some pieces of related work. Math/other details were not carefully checked.\n4: You are confident in your assessment, but not absolutely certain. It is unlikely, but not impossible, that you did not understand some parts of the submission or that you are unfamiliar with some pieces of related work.\n5: You are absolutely certain about your assessment. You are very familiar with the related work and checked the math/other details carefully.",
+            ),
+        ],
+        decision_fields=[
+            ContentField(
+                "decision",
+                "Paper Decision. Choose from the following:\nAccept: notable-top-5%\nAccept: notable-top-25%\nAccept: poster\nReject\nConditional Accept",
+            ),
+            ContentField("comment", "Comment (Optional).", optional=True),
+            ContentField(
+                "metareview:_summary,_strengths_and_weaknesses",
+                "Please fill out the following section (max 5000 characters): (a) Summarize the scientific claims and findings of the paper based on your own reading and characterizations from the reviewers. (b) What are the strengths of the paper? (c) What are the weaknesses of the paper? What might be missing in the submission?",
+            ),
+            ContentField(
+                "summary_of_AC-reviewer_meeting",
+                "If this was a borderline paper, please summarize the meeting with reviewers. What were the points raised by the reviewers? How were each of these points addressed by the authors? How did you weigh in each point in your final decision?",
+                optional=True,
+            ),
+            ContentField(
+                "justification_for_why_not_higher_score",
+                "Please state the reasons behind the current recommendation, especially why not a higher score (e.g., if you choose Accept with spotlight, why not Accept with oral). If your recommendation is already the highest score (Accept with Oral), then put N/A. Your justification should be based on what you articulated in the above points of part 1 and 2.",
+            ),
+            ContentField(
+                "justification_for_why_not_lower_score",
+                "Please state the reasons behind the current recommendation, especially why not a lower score (e.g., if you choose Accept with poster, why not reject). If your recommendation is already the lowest score (Reject), then please put N/A.",
+            ),
+        ],
+        reply_dates=REPLY_DATES,
+    ),
+    "ICLR.cc/2022/Conference": VenueSchema(
+        api_version=1,
+        note_fields={
+            "venue": Field("venue"),
+            "venueid": Field("venueid"),
+            "title": Field("title"),
+            "authors": Field("authors"),
+            "author_ids": Field("authorids"),
+            "keywords": Field("keywords"),
+            "summary": Field("one-sentence_summary", optional=True),
+            "abstract": Field("abstract"),
+            "paperhash": Field("paperhash"),
+            "bibtex": Field("_bibtex"),
+            "pdf_url": Field("pdf"),
+            "supplementary_material_url": Field("supplementary_material", optional=True),
+        },
+        review_invitation="Review",
+        review_fields=[
+            ContentField("summary_of_the_paper", "Provide a brief summary of the paper and its contributions."),
+            ContentField(
+                "main_review",
+                "Please list both the strengths and weaknesses of the paper. When discussing weaknesses, please provide concrete, actionable feedback on the paper.",
+            ),
+            ContentField(
+                "summary_of_the_review", "Please provide a short summary justifying your recommendation of the paper."
+            ),
+            ContentField(
+                "correctness",
+                "When evaluating correctness, we urge reviewers to focus on the technical content of the paper instead of language. This is especially important to support researchers from diverse geographical backgrounds. Choose from the following:\n1: The main claims of the paper are incorrect or not at all supported by theory or empirical results.\n2: Several of the paper’s claims are incorrect or not well-supported.\n3: Some of the paper’s claims have minor issues. A few statements are not well-supported, or require small changes to be made correct.\n4: All of the claims and statements are well-supported and correct.",
+            ),
+            ContentField(
+                "technical_novelty_and_significance",
+                "For this question, contributions are technical in nature, including new models, techniques, or theoretical insights. Choose from the following:\n1: The contributions are neither significant nor novel.\n2: The contributions are only marginally significant or novel.\n3: The contributions are significant and somewhat new. Aspects of the contributions exist in prior work.\n4: The contributions are significant, and do not exist in prior works.",
+            ),
+            ContentField(
+                "empirical_novelty_and_significance",
+                "For this question, contributions include new insights supported by empirical results including those arising from new benchmarks or datasets. Choose from the following:\nNot applicable\n1: The contributions are neither significant nor novel.\n2: The contributions are only marginally significant or novel.\n3: The contributions are significant and somewhat new. Aspects of the contributions exist in prior work.\n4: The contributions are significant, and do not exist in prior works.",
+            ),
+            ContentField(
+                "flag_for_ethics_review",
+                "Choose one or more from the following entries:\nNO.\nYes, Discrimination / bias / fairness concerns\nYes, Privacy, security and safety\nYes, Legal compliance (e.g., GDPR, copyright, terms of use)\nYes, Potentially harmful insights, methodologies and applications\nYes, Responsible research practice (e.g., human subjects, data release)\nYes, Research integrity issues (e.g., plagiarism, dual submission)\nYes, Unprofessional behaviors (e.g., unprofessional exchange between authors and reviewers)\nYes, Other reasons (please specify below)",
+                transform=join_lines,
+            ),
+            ContentField("details_of_ethics_concerns", "Please provide details of your concerns.", optional=True),
+            ContentField(
+                "recommendation",
+                "Your recommendation. Choose from the following:\n1: strong reject\n3: reject, not good enough\n5: marginally below the acceptance threshold\n6: marginally above the acceptance threshold\n8: accept, good paper\n10: strong accept, should be highlighted at the conference",
+            ),
+            ContentField(
+                "confidence",
+                "Your confidence. Choose from the following:\n1: You are unable to assess this paper and have alerted the ACs to seek an opinion from different reviewers.\n2: You are willing to defend your assessment, but it is quite likely that you did not understand the central parts of the submission or that you are unfamiliar with some pieces of related work. Math/other details were not carefully checked.\n3: You are fairly confident in your assessment. It is possible that you did not understand some parts of the submission or that you are unfamiliar with some pieces of related work. Math/other details were not carefully checked.\n4: You are confident in your assessment, but not absolutely certain. It is unlikely, but not impossible, that you did not understand some parts of the submission or that you are unfamiliar with some pieces of related work.\n5: You are absolutely certain about your assessment. You are very familiar with the related work and checked the math/other details carefully.",
+            ),
+        ],
+        decision_fields=[
+            ContentField(
+                "decision",
+                "Paper Decision. Choose from the following:\nAccept (Oral)\nAccept (Poster)\nAccept (Spotlight)\nReject",
+            ),
+            ContentField("comment", "Comment (Optional)."),
+        ],
+        reply_dates=REPLY_DATES,
+    ),
+    "ICLR.cc/2021/Conference": VenueSchema(
+        api_version=1,
+        note_fields={
+            "venue": Field("venue", optional=True),
+            "venueid": Field("venueid", optional=True),
+            "title": Field("title"),
+            "authors": Field("authors"),
+            "author_ids": Field("authorids"),
+            "keywords": Field("keywords"),
+            "summary": Field("one-sentence_summary", optional=True),
+            "abstract": Field("abstract"),
+            "paperhash": Field("paperhash"),
+            "bibtex": Field("_bibtex"),
+            "pdf_url": Field("pdf"),
+            "supplementary_material_url": Field("supplementary_material", optional=True),
+        },
+        review_invitation="Official_Review",
+        review_fields=[
+            ContentField("review_summary", "Brief summary of your review (max 500 characters).", key="title"),
+            ContentField(
+                "review",
+                "Please provide an evaluation of the quality, clarity, originality and significance of this work, including a list of its pros and cons (max 200000 characters).",
+            ),
+            ContentField(
+                "rating",
+                "Your rating. Choose from the following:\n10: Top 5% of accepted papers, seminal paper\n9: Top 15% of accepted papers, strong accept\n8: Top 50% of accepted papers, clear accept\n7: Good paper, accept\n6: Marginally above acceptance threshold\n5: Marginally below acceptance threshold\n4: Ok but not good enough - rejection\n3: Clear rejection\n2: Strong rejection\n1: Trivial or wrong",
+            ),
+            ContentField(
+                "confidence",
+                "Your confidence. Choose from the following:\n5: The reviewer is absolutely certain that the evaluation is correct and very familiar with the relevant literature\n4: The reviewer is confident but not absolutely certain that the evaluation is correct\n3: The reviewer is fairly confident that the evaluation is correct\n2: The reviewer is willing to defend the evaluation, but it is quite likely that the reviewer did not understand central parts of the paper\n1: The reviewer's evaluation is an educated guess",
+            ),
+        ],
+        decision_fields=[
+            ContentField(
+                "decision",
+                "Final Decision. Choose from the following:\nAccept (Oral)\nAccept (Spotlight)\nAccept (Poster)\nReject",
+            ),
+            ContentField("comment", "Comment (Optional)."),
+        ],
+        reply_dates=ICLR_2021_REPLY_DATES,
+    ),
+}
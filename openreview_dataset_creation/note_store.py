@@ -0,0 +1,141 @@
+import gzip
+import json
+import os
+import pickle
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+# Notes of a venue are stored as a directory of gzip compressed jsonl shards plus a small index.json:
+#   {"or_venue": ..., "details": "all", "complete": true, "num_notes": 1234, "shards": [{"file": "notes-00000.jsonl.gz", "num_notes": 1000}, ...]}
+# Shards are added to the index as soon as they are closed, so readers can start before the writer is done. A store is
+# written to <store_dir>.tmp and only replaces an existing store once it is complete, so a failed crawl keeps the old
+# notes.
+INDEX_FILE = "index.json"
+
+
+def store_dir_for(output_dir: Path, or_venue: str) -> Path:
+    return Path(output_dir) / or_venue.replace("/", "_")
+
+
+def write_index(store_dir: Path, index: Dict[str, Any]):
+    tmpfile = store_dir / f"{INDEX_FILE}.tmp"
+    with open(tmpfile, "w") as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmpfile, store_dir / INDEX_FILE)
+
+
+def read_index(store_dir: Path) -> Dict[str, Any]:
+    with open(Path(store_dir) / INDEX_FILE, "r") as f:
+        return json.load(f)
+
+
+def store_exists(store_dir: Path) -> bool:
+    return (Path(store_dir) / INDEX_FILE).exists()
+
+
+class NoteShardWriter:
+    def __init__(self, store_dir: Path, or_venue: str, shard_size: int = 1000, details: str = "all"):
+        self.target_dir = Path(store_dir)
+        self.store_dir = self.target_dir.with_name(self.target_dir.name + ".tmp")
+        self.shard_size = shard_size
+        if self.store_dir.exists():
+            # left behind by a failed run
+            shutil.rmtree(self.store_dir)
+        self.store_dir.mkdir(parents=True)
+        self.index = {"or_venue": or_venue, "details": details, "complete": False, "num_notes": 0, "shards": []}
+        self.shard = None
+        self.shard_num_notes = 0
+        self.ids = set()
+        write_index(self.store_dir, self.index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(complete=exc_type is None)
+
+    def open_shard(self):
+        shard_file = f"notes-{len(self.index['shards']):05d}.jsonl.gz"
+        self.shard = gzip.open(self.store_dir / shard_file, "wt", encoding="utf-8")
+        self.shard_file = shard_file
+        self.shard_num_notes = 0
+
+    def close_shard(self):
+        self.shard.close()
+        self.shard = None
+        self.index["shards"].append({"file": self.shard_file, "num_notes": self.shard_num_notes})
+        self.index["num_notes"] += self.shard_num_notes
+        write_index(self.store_dir, self.index)
+
+    def write(self, note: Dict[str, Any]) -> bool:
+        if note["id"] in self.ids:
+            return False
+        self.ids.add(note["id"])
+        if self.shard is None:
+            self.open_shard()
+        self.shard.write(json.dumps(note) + "\n")
+        self.shard_num_notes += 1
+        if self.shard_num_notes >= self.shard_size:
+            self.close_shard()
+        return True
+
+    def close(self, complete: bool = True):
+        if self.shard is not None:
+            self.close_shard()
+        self.index["complete"] = complete
+        write_index(self.store_dir, self.index)
+        if not complete:
+            print(f"warning: incomplete notes left in {self.store_dir.absolute()}")
+            return
+        if not self.num_notes:
+            # nothing to replace the existing store with
+            shutil.rmtree(self.store_dir)
+            return
+        if self.target_dir.exists():
+            old_dir = self.target_dir.with_name(self.target_dir.name + ".old")
+            os.replace(self.target_dir, old_dir)
+            os.replace(self.store_dir, self.target_dir)
+            shutil.rmtree(old_dir)
+        else:
+            os.replace(self.store_dir, self.target_dir)
+
+    @property
+    def num_notes(self):
+        return self.index["num_notes"] + self.shard_num_notes
+
+
+def list_shards(path: Path) -> List[Path]:
+    path = Path(path)
+    if path.suffix == ".pkl":
+        return [path]
+    index = read_index(path)
+    if not index["complete"]:
+        print(f"warning: {path} is still being written, only using the {len(index['shards'])} completed shards.")
+    return [path / shard["file"] for shard in index["shards"]]
+
+
+def iter_shard(shard: Path) -> Iterator[Dict[str, Any]]:
+    shard = Path(shard)
+    if shard.suffix == ".pkl":
+        # notes written by older versions of get_openreview_notes.py
+        with open(shard, "rb") as f:
+            yield from pickle.load(f)
+        return
+    with gzip.open(shard, "rt", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def read_shard_lines(shard: Path) -> List[str]:
+    # the json of every note in a shard, without decoding it
+    shard = Path(shard)
+    if shard.suffix == ".pkl":
+        return [json.dumps(note) for note in iter_shard(shard)]
+    with gzip.open(shard, "rb") as f:
+        return [line for line in f.read().decode("utf-8").split("\n") if line]
+
+
+def iter_notes(path: Path) -> Iterator[Dict[str, Any]]:
+    for shard in list_shards(path):
+        yield from iter_shard(shard)
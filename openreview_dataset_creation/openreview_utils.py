@@ -1,22 +1,103 @@
+import threading
+from contextlib import contextmanager
+
 import openreview
 
+API_V1_URL = "https://api.openreview.net"
+API_V2_URL = "https://api2.openreview.net"
+
 
-def get_client(version, or_username, or_password):
+def get_client(version, or_username=None, or_password=None, token=None, baseurl=None):
+    # with a token from an existing client no new login is needed
+    credentials = dict(token=token) if token else dict(username=or_username, password=or_password)
     if version == 1:
         print("creating v1 client")
         return openreview.Client(
-            username=or_username,
-            password=or_password,
-            baseurl="https://api.openreview.net",
+            baseurl=baseurl or API_V1_URL,
+            **credentials,
         )
     elif version == 2:
         print("creating v2 client")
         return openreview.api.OpenReviewClient(
-            username=or_username,
-            password=or_password,
-            baseurl="https://api2.openreview.net",
+            baseurl=baseurl or API_V2_URL,
+            **credentials,
         )
     else:
         raise ValueError(
-            "version must be in {1,2}, but specified version is: " + version
+            "version must be in {1,2}, but specified version is: " + str(version)
         )
+
+
+def throttle_client(client, limiter):
+    # every http request of the client, including the pages of get_all_notes, takes a token from the shared limiter
+    request = client.session.request
+
+    def throttled_request(*args, **kwargs):
+        limiter.acquire()
+        return request(*args, **kwargs)
+
+    client.session.request = throttled_request
+    return client
+
+
+class ClientPool:
+    # Clients shared by concurrent crawls. We log in once per API version and create further clients from its token.
+    def __init__(self, or_username, or_password, limiter=None, baseurls=None):
+        self.or_username = or_username
+        self.or_password = or_password
+        self.limiter = limiter
+        self.baseurls = baseurls or {1: API_V1_URL, 2: API_V2_URL}
+        self.tokens = dict()
+        self.idle = {1: [], 2: []}
+        self.lock = threading.Lock()
+
+    def create_client(self, version):
+        with self.lock:
+            if self.idle[version]:
+                return self.idle[version].pop()
+            client = None
+            if version not in self.tokens:
+                client = get_client(
+                    version, or_username=self.or_username, or_password=self.or_password, baseurl=self.baseurls[version]
+                )
+                self.tokens[version] = client.token
+        if client is None:
+            client = get_client(version, token=self.tokens[version], baseurl=self.baseurls[version])
+        if self.limiter is not None:
+            throttle_client(client, self.limiter)
+        return client
+
+    @contextmanager
+    def client(self, version):
+        client = self.create_client(version)
+        try:
+            yield client
+        finally:
+            with self.lock:
+                self.idle[version].append(client)
+
+
+def iter_all_notes(client, batch_size=1000, **query):
+    # like client.get_all_notes, but yields every page as soon as it arrives
+    offset = 0
+    while True:
+        notes = client.get_notes(limit=batch_size, offset=offset, **query)
+        yield from notes
+        if len(notes) < batch_size:
+            return
+        offset += len(notes)
+
+
+def iter_notes_modified_since(client, since, batch_size=1000, **query):
+    # page through notes newest modification first and stop at the first note that is older than `since`. Notes
+    # modified at `since` itself are included, they may have been saved in the same millisecond after the last sync.
+    offset = 0
+    while True:
+        notes = client.get_notes(sort="tmdate:desc", limit=batch_size, offset=offset, **query)
+        for note in notes:
+            if note.tmdate < since:
+                return
+            yield note
+        if len(notes) < batch_size:
+            return
+        offset += len(notes)
@@ -1,21 +1,32 @@
 import argparse
-import pickle
+import json
+import multiprocessing
+import random
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import polars as pl
-from note_parsers import get_note_parser
-from note_parsers.data_models import ParserError
+import pyarrow as pa
+from build_state import file_stamp, fingerprint, read_build_state, write_build_state
+from note_parsers import get_frame_parser, get_note_parser
+from note_parsers.data_models import NOTE_SCHEMA, Note, ParserError
+from note_store import INDEX_FILE, iter_shard, list_shards, read_shard_lines
 
+NOTE_ARROW_SCHEMA = pl.DataFrame(schema=NOTE_SCHEMA).to_arrow().schema
+REPLY_COLUMNS = ["replies", "direct_replies"]
 
-def parse_args():
+
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
     )
     parser.add_argument(
         "--notes",
         type=str,
+        nargs="+",
         required=True,
-        help="pkl file containing notes",
+        help="notes directories written by get_openreview_notes.py (or pkl files from older versions)",
     )
     parser.add_argument(
         "--output_dir",
@@ -23,34 +34,262 @@ def parse_args():
         required=True,
         help="The output directory.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        required=False,
+        default=1,
+        help="The number of processes parsing shards in parallel.",
+    )
+    parser.add_argument(
+        "--output_layout",
+        type=str,
+        required=False,
+        choices=["file", "hive"],
+        default="file",
+        help="'file' writes one <name>.zstd.parquet per input. "
+        "'hive' keeps the parquet file of every shard in <output_dir>/notes=<name>/.",
+    )
+    parser.add_argument(
+        "--validate_fraction",
+        type=float,
+        required=False,
+        default=0.01,
+        help="The fraction of parsed notes that are validated with the pydantic models in note_parsers/data_models.py. "
+        "With --engine polars, they are also compared to the output of the python engine. 1 validates every note.",
+    )
+    parser.add_argument(
+        "--replies_format",
+        type=str,
+        required=False,
+        choices=["json", "nested"],
+        default="json",
+        help="'json' stores replies and direct_replies as json strings. "
+        "'nested' stores them as list of struct columns, with their types inferred from the notes of each input.",
+    )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        required=False,
+        choices=["python", "polars"],
+        default="python",
+        help="'python' parses note by note with the compiled parsers. "
+        "'polars' decodes the json of whole shards and extracts the fields with polars expressions (note_parsers/expressions.py), "
+        "replies are copied as compact json.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only parse inputs whose notes changed since the last --incremental run into --output_dir "
+        "and replace their outputs, instead of refusing to overwrite existing outputs.",
+    )
+    args = parser.parse_args(argv)
+    if args.engine == "polars" and args.replies_format != "json":
+        parser.error("--engine polars only supports --replies_format json")
+    return args
 
 
-def main(args):
+def has_empty_struct(dtype):
+    if isinstance(dtype, pl.Struct):
+        return not dtype.fields or any(has_empty_struct(field.dtype) for field in dtype.fields)
+    if isinstance(dtype, pl.List):
+        return has_empty_struct(dtype.inner)
+    return False
 
-    infile = Path(args.notes)
-    output_dir = Path(args.output_dir)
-    output_dir.mkdir(exist_ok=True, parents=True)
-    outfile = Path(args.output_dir) / f"{infile.stem}.zstd.parquet"
-    if outfile.exists():
-        raise FileExistsError(f"output file {outfile.absolute()} already exists.")
 
-    with open(infile, "rb") as f:
-        notes = pickle.load(f)
-    print(f"Notes: {len(notes):_}")
+def drop_empty_dicts(value):
+    if isinstance(value, dict):
+        return {key: drop_empty_dicts(v) for key, v in value.items()} or None
+    if isinstance(value, list):
+        return [drop_empty_dicts(v) for v in value]
+    return value
+
+
+def get_replies_column(name, values):
+    # pyarrow infers nested types fast, but fails on conflicting types (e.g. an int and a string under the same key),
+    # polars then falls back to their supertype
+    try:
+        column = pl.from_arrow(pa.array(values)).alias(name)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        column = pl.Series(name, values, strict=False)
+    if has_empty_struct(column.dtype):
+        # parquet cannot store structs without fields, which are inferred for keys that only ever hold {}
+        column = get_replies_column(name, drop_empty_dicts(values))
+    return column
+
 
+def to_frame(parsed_notes, replies_format):
+    if replies_format == "json":
+        return pl.from_arrow(pa.Table.from_pylist(parsed_notes, schema=NOTE_ARROW_SCHEMA))
+    schema = pa.schema([field for field in NOTE_ARROW_SCHEMA if field.name not in REPLY_COLUMNS])
+    df = pl.from_arrow(pa.Table.from_pylist(parsed_notes, schema=schema))
+    replies = [get_replies_column(name, [note[name] for note in parsed_notes]) for name in REPLY_COLUMNS]
+    return df.with_columns(replies).select(NOTE_SCHEMA.names())
+
+
+def check_note(df, line):
+    # compare a note parsed by the polars engine with the validated output of the compiled parser
+    note = json.loads(line)
+    try:
+        expected = get_note_parser(note["or_venue"])(note).model_dump()
+    except ParserError:
+        assert df.filter(pl.col("id") == note["id"]).is_empty(), f"note {note['id']} should have been skipped"
+        return
+    (parsed,) = df.filter(pl.col("id") == note["id"]).rows(named=True)
+    for key in ["replies", "direct_replies"]:
+        # the polars engine writes compact json
+        expected[key], parsed[key] = [
+            None if value is None else json.loads(value) for value in (expected[key], parsed[key])
+        ]
+    differences = [key for key in expected if expected[key] != parsed[key]]
+    assert not differences, f"note {note['id']}: the polars engine parsed {differences} differently"
+
+
+def check_parsed_note(parsed_note, note, replies_format):
+    # validate the dict that is written and compare it with the output of the validated parser
+    if replies_format == "nested":
+        parsed_note = {
+            **parsed_note,
+            **{key: None if parsed_note[key] is None else json.dumps(parsed_note[key]) for key in REPLY_COLUMNS},
+        }
+    Note.model_validate(parsed_note)
+    expected = get_note_parser(note["or_venue"])(note).model_dump()
+    differences = [key for key in expected if expected[key] != parsed_note[key]]
+    assert not differences, f"note {note['id']}: the parsed note differs from the validated one in {differences}"
+
+
+def parse_shard_polars(shard, part_file, validate_fraction):
+    rng = random.Random(str(shard))
+    lines = pl.DataFrame({"line": read_shard_lines(shard)}, schema={"line": pl.String})
+    if lines.is_empty():
+        return 0, 0
+    try:
+        # shards usually hold the notes of one venue
+        df = get_frame_parser(json.loads(lines["line"][0])["or_venue"])(lines)
+    except (ParserError, pl.exceptions.ComputeError):
+        # the notes of other venues may not even decode with the dtype of the first one, split the shard by venue
+        or_venue = pl.col("line").str.json_decode(pl.Struct({"or_venue": pl.String})).struct.field("or_venue")
+        venue_lines = lines.with_columns(or_venue.alias("or_venue")).partition_by("or_venue", as_dict=True)
+        df = pl.concat(get_frame_parser(venue)(group.select("line")) for (venue,), group in venue_lines.items())
+    for line in lines["line"]:
+        if rng.random() < validate_fraction:
+            check_note(df, line)
+    if not df.is_empty():
+        df.write_parquet(part_file)
+    return lines.height, df.height
+
+
+def parse_shard(shard, part_file, validate_fraction, replies_format, engine):
+    if engine == "polars":
+        return parse_shard_polars(shard, part_file, validate_fraction)
+    # notes are parsed into plain dicts, which pyarrow turns into columns much faster than polars or pydantic
+    rng = random.Random(str(shard))
+    num_notes = 0
     parsed_notes = []
-    for note in notes:
-        parse_fn = get_note_parser(note["or_venue"])
+    for note in iter_shard(shard):
+        num_notes += 1
+        parse_fn = get_note_parser(note["or_venue"], validate=False, dump_replies=replies_format == "json")
         try:
-            parsed_note = parse_fn(note).model_dump()
-            parsed_notes.append(parsed_note)
+            parsed_note = parse_fn(note)
         except ParserError as e:
             print(e)
+            continue
+        if rng.random() < validate_fraction:
+            check_parsed_note(parsed_note, note, replies_format)
+        parsed_notes.append(parsed_note)
+    if parsed_notes:
+        to_frame(parsed_notes, replies_format).write_parquet(part_file)
+    return num_notes, len(parsed_notes)
+
+
+def unify_parts(part_files):
+    # nested replies get different types in every shard, cast all parts of an input to the union of them
+    parts = [pl.scan_parquet(part_file) for part_file in part_files]
+    schema = pl.concat(parts, how="vertical_relaxed").collect_schema()
+    for part_file in part_files:
+        if pl.read_parquet_schema(part_file) != schema:
+            pl.read_parquet(part_file).cast(schema).write_parquet(part_file)
+
+
+def get_outputs(infile: Path, output_dir: Path, output_layout: str, incremental: bool = False):
+    name = infile.stem if infile.suffix == ".pkl" else infile.name
+    if output_layout == "hive":
+        parts_dir = output_dir / f"notes={name}"
+        outfile = parts_dir
+    else:
+        parts_dir = output_dir / f"{name}.parts"
+        outfile = output_dir / f"{name}.zstd.parquet"
+    if outfile.exists() and not incremental:
+        raise FileExistsError(f"output {outfile.absolute()} already exists.")
+    return parts_dir, outfile
+
+
+def get_input_fingerprint(infile: Path, replies_format: str, output_layout: str):
+    files = list_shards(infile)
+    if infile.suffix != ".pkl":
+        files = [infile / INDEX_FILE, *files]
+    return fingerprint(
+        dict(files=[file_stamp(file) for file in files], replies_format=replies_format, output_layout=output_layout)
+    )
+
+
+def main(args):
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(exist_ok=True, parents=True)
+
+    # every shard of every input is parsed into its own parquet file
+    state = read_build_state(output_dir) if args.incremental else dict()
+    outputs = dict()
+    tasks = []
+    for infile in map(Path, args.notes):
+        parts_dir, outfile = get_outputs(infile, output_dir, args.output_layout, args.incremental)
+        inputs = None
+        if args.incremental:
+            inputs = get_input_fingerprint(infile, args.replies_format, args.output_layout)
+            if state.get(outfile.name) == inputs and outfile.exists():
+                print(f"{infile}: unchanged since the last build of {outfile}")
+                continue
+        if parts_dir.exists():
+            shutil.rmtree(parts_dir)
+        parts_dir.mkdir(parents=True)
+        part_files = [parts_dir / f"part-{i:05d}.zstd.parquet" for i, _ in enumerate(list_shards(infile))]
+        outputs[infile] = outfile, parts_dir, part_files, inputs
+        tasks.extend(
+            (shard, part_file, args.validate_fraction, args.replies_format, args.engine)
+            for shard, part_file in zip(list_shards(infile), part_files)
+        )
+    print(f"Parsing {len(tasks):_} shards of {len(outputs):_} inputs with {args.num_workers} workers.")
+
+    if args.num_workers > 1 and tasks:
+        # forked workers can deadlock on the thread pools polars and pyarrow start in this process
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=args.num_workers, mp_context=mp_context) as executor:
+            counts = list(executor.map(parse_shard, *zip(*tasks)))
+    else:
+        counts = [parse_shard(*task) for task in tasks]
+    counts = dict(zip([task[1] for task in tasks], counts))
 
-    df = pl.from_dicts(parsed_notes)
-    df.write_parquet(outfile)
-    print(df.shape)
+    for infile, (outfile, parts_dir, part_files, inputs) in outputs.items():
+        num_notes = sum(counts[part_file][0] for part_file in part_files)
+        print(f"{infile}: Notes: {num_notes:_}")
+        part_files = [part_file for part_file in part_files if part_file.exists()]
+        if args.output_layout == "hive":
+            if part_files and args.replies_format == "nested":
+                unify_parts(part_files)
+            print(f"wrote {len(part_files):_} files to {outfile}")
+        else:
+            if part_files:
+                df = pl.concat([pl.read_parquet(part_file) for part_file in part_files], how="vertical_relaxed")
+                df.write_parquet(outfile)
+                print(df.shape)
+            else:
+                print(f"no notes could be parsed, not writing {outfile}")
+                # an output of an earlier build would be stale
+                outfile.unlink(missing_ok=True)
+            shutil.rmtree(parts_dir)
+        if args.incremental:
+            state[outfile.name] = inputs
+            write_build_state(output_dir, state)
 
 
 if __name__ == "__main__":
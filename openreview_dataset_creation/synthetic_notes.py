@@ -0,0 +1,144 @@
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+import polars as pl
+from note_parsers import VENUE_SCHEMAS
+from note_parsers.data_models import NOTE_SCHEMA
+from note_parsers.schema import ContentField, VenueSchema, join_lines
+from note_store import NoteShardWriter, store_dir_for
+
+# Fabricates notes in the shape the OpenReview API returns them for a venue of VENUE_SCHEMAS, i.e. the notes that
+# get_openreview_notes.py stores: API v1 or v2 content, reviews and decisions with the venue's content fields, comments,
+# withdrawn papers without decisions and missing optional fields. Used by benchmark_parsers.py.
+
+WORDS = (
+    "the a model we data results method learning training paper show propose task performance neural network".split()
+)
+EXTRA_NOTE_KEYS = ["html", "community_implementations", "code_of_ethics"]
+
+
+def synthetic_text(rng: random.Random, num_words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=num_words))
+
+
+def content_value(rng: random.Random, field: ContentField, words: int) -> Any:
+    if field.transform is str:
+        # scores are numbers in the API
+        return rng.randint(1, 10)
+    if field.transform is join_lines:
+        return [synthetic_text(rng, 6) for _ in range(rng.randint(1, 3))]
+    return synthetic_text(rng, rng.randint(words // 2, words * 2))
+
+
+def make_content(values: Dict[str, Any], api_version: int) -> Dict[str, Any]:
+    # API v2 wraps every content value in {"value": ...}
+    return {key: {"value": value} if api_version == 2 else value for key, value in values.items()}
+
+
+def make_reply(rng, or_venue, schema: VenueSchema, note, kind, fields, number, reply_to, words):
+    values = {}
+    for field in fields:
+        if field.optional and rng.random() < 0.3:
+            continue
+        values[field.key or field.name] = content_value(rng, field, words)
+    invitation = f"{or_venue}/Submission{note['number']}/-/{kind}"
+    reply = {
+        "id": f"{note['id']}{kind[:3]}{number}",
+        "number": number,
+        "forum": note["id"],
+        "replyto": reply_to,
+        "writers": [f"{or_venue}/Submission{note['number']}/Reviewer_{number}"],
+        "signatures": [f"{or_venue}/Submission{note['number']}/Reviewer_{number}"],
+        "readers": ["everyone"],
+        "content": make_content(values, schema.api_version),
+    }
+    if schema.api_version == 1:
+        reply["invitation"] = invitation
+    else:
+        reply["invitations"] = [invitation, f"{or_venue}/-/Edit"]
+    for name, field in schema.reply_dates.items():
+        if field.optional and rng.random() < 0.3:
+            continue
+        reply[field.key] = None if name in ("ddate", "tddate") else note["cdate"] + rng.randint(1, 10**9)
+    return reply
+
+
+def make_note(rng: random.Random, or_venue: str, schema: VenueSchema, number: int, review_words: int) -> Dict[str, Any]:
+    note_id = f"{rng.getrandbits(48):012x}"
+    cdate = 1_600_000_000_000 + rng.randint(0, 10**10)
+    values = {}
+    for name, field in schema.note_fields.items():
+        if field.optional and rng.random() < 0.3:
+            continue
+        if NOTE_SCHEMA[name] == pl.List(pl.String):
+            value = [synthetic_text(rng, 2) for _ in range(rng.randint(1, 6))]
+        elif name in ("pdf_url", "original_pdf_url", "supplementary_material_url"):
+            value = f"/attachment/{rng.getrandbits(64):016x}.pdf"
+        else:
+            value = synthetic_text(rng, 200 if name == "abstract" else 8)
+        values[field.key] = value
+    for key in EXTRA_NOTE_KEYS:
+        if rng.random() < 0.5:
+            values[key] = synthetic_text(rng, 10)
+    note = {
+        "id": note_id,
+        "number": number,
+        "forum": note_id,
+        "or_venue": or_venue,
+        "content": make_content(values, schema.api_version),
+        **{name: cdate for name in ["cdate", "tcdate", "mdate", "tmdate", "pdate", "odate"]},
+        "ddate": None,
+    }
+    if schema.api_version == 1:
+        note["invitation"] = f"{or_venue}/-/Blind_Submission"
+    else:
+        note["invitations"] = [f"{or_venue}/-/Submission", f"{or_venue}/-/Edit"]
+
+    def reply(kind, fields, number, reply_to, words):
+        return make_reply(rng, or_venue, schema, note, kind, fields, number, reply_to, words)
+
+    direct_replies = []
+    withdrawn = rng.random() < 0.1
+    num_reviews = rng.choice([0, 1, 2]) if withdrawn else rng.choice([3, 4, 4, 5])
+    for i in range(num_reviews):
+        direct_replies.append(reply(schema.review_invitation, schema.review_fields, i + 1, note_id, review_words))
+    if withdrawn:
+        # withdrawn papers have no decision
+        direct_replies.append(reply("Withdrawal", [ContentField("withdrawal_confirmation", "")], 1, note_id, 10))
+    elif schema.decision_fields is not None:
+        direct_replies.append(reply("Decision", schema.decision_fields, 1, note_id, 40))
+    comment_fields = [ContentField("comment", "")]
+    for i in range(rng.randint(0, 3)):
+        direct_replies.append(reply("Official_Comment", comment_fields, i + 1, note_id, review_words // 2))
+    rng.shuffle(direct_replies)
+    # the discussion below the reviews, only part of the "replies" detail
+    threads = [
+        reply("Official_Comment", comment_fields, i + 100, rng.choice(direct_replies)["id"], review_words // 2)
+        for i in range(rng.randint(0, 2 * len(direct_replies)))
+    ]
+    replies = direct_replies + threads
+    note["details"] = {
+        "directReplies": direct_replies,
+        "directReplyCount": len(direct_replies),
+        "replies": replies,
+        "replyCount": len(replies),
+        "tags": [],
+    }
+    return note
+
+
+def make_notes(or_venue: str, num_notes: int, seed: int = 0, review_words: int = 100) -> List[Dict[str, Any]]:
+    rng = random.Random(f"{or_venue}-{seed}")
+    schema = VENUE_SCHEMAS[or_venue]
+    return [make_note(rng, or_venue, schema, number + 1, review_words) for number in range(num_notes)]
+
+
+def write_synthetic_store(
+    output_dir: Path, or_venue: str, num_notes: int, seed: int = 0, review_words: int = 100, shard_size: int = 1000
+) -> Path:
+    store_dir = store_dir_for(output_dir, or_venue)
+    with NoteShardWriter(store_dir, or_venue, shard_size=shard_size) as writer:
+        for note in make_notes(or_venue, num_notes, seed, review_words):
+            writer.write(note)
+    return store_dir
@@ -6,6 +6,7 @@ os.environ["PYTORCH_ENABLE_MPS_FALLBACK"] = (
 os.environ["IN_STREAMLIT"] = "true"  # Avoid multiprocessing inside surya
 os.environ["PDFTEXT_CPU_WORKERS"] = "1"  # Avoid multiprocessing inside pdftext
 
+import sys
 from pathlib import Path
 
 import pypdfium2  # Needs to be at the top to avoid warnings
@@ -29,6 +30,11 @@ from marker.logger import configure_logging
 import traceback
 import json
 
+# the manifest is shared with the download script in openreview_dataset_creation
+sys.path.append(str(Path(__file__).resolve().parent.parent / "openreview_dataset_creation"))
+from manifest import DONE, FAILED, SKIPPED, Manifest, blob_path
+from md_corpus import MdCorpus, MdCorpusWriter
+
 configure_logging()
 MAX_PAGES = 20
 
@@ -47,11 +53,12 @@ def worker_exit():
 
 
 def process_single_pdf(args):
-    filepath, out_folder, metadata, min_length = args
+    filepath, out_folder, metadata, min_length, to_corpus = args
 
     fname = os.path.basename(filepath)
-    if markdown_exists(out_folder, fname):
-        return
+    name = Path(fname).stem
+    if not to_corpus and markdown_exists(out_folder, fname):
+        return name, DONE, "markdown exists", None
 
     try:
         # Skip trying to convert files that don't have a lot of embedded text
@@ -60,24 +67,29 @@ def process_single_pdf(args):
         if min_length:
             filetype = find_filetype(filepath)
             if filetype == "other":
-                return 0
+                return name, SKIPPED, f"filetype {filetype}", None
 
             length = get_length_of_text(filepath)
             if length < min_length:
-                return
+                return name, SKIPPED, f"text length {length} < {min_length}", None
 
         full_text, images, out_metadata = convert_single_pdf(
             filepath, model_refs, metadata=metadata, max_pages=MAX_PAGES
         )
-        if len(full_text.strip()) > 0:
-            save_markdown(out_folder, fname, full_text, images, out_metadata)
-        else:
+        message = None
+        if len(full_text.strip()) == 0:
             print(f"Empty file: {filepath}.  Could not convert.")
             print(f"saving empty markdown: {fname}")
-            save_markdown(out_folder, fname, full_text, images, out_metadata)
+            message = "empty markdown"
+        if to_corpus:
+            # the main process appends the markdown to the corpus
+            return name, DONE, message, full_text
+        save_markdown(out_folder, fname, full_text, images, out_metadata)
+        return name, DONE, message, None
     except Exception as e:
         print(f"Error converting {filepath}: {e}")
         print(traceback.format_exc())
+        return name, FAILED, str(e), None
 
 
 def main():
@@ -108,16 +120,46 @@ def main():
     parser.add_argument(
         "--min_length", type=int, default=None, help="Minimum length of pdf to convert"
     )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help="sqlite manifest written by download_pdfs.py. Takes the pdfs to convert from it and records each conversion",
+    )
+    parser.add_argument(
+        "--content_addressed",
+        action="store_true",
+        help="in_folder is the sha256 directory of a content-addressed store, convert each unique pdf of the manifest once",
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        default=None,
+        help="Packed md corpus (openreview_dataset_creation/md_corpus.py) to append the markdown to, "
+        "instead of writing a directory per pdf to out_folder. Images and metadata are not kept.",
+    )
 
     args = parser.parse_args()
 
     in_folder = Path(args.in_folder)
     out_folder = Path(args.out_folder)
-    files = [f for f in sorted(list(in_folder.glob("**/*.pdf"))) if f.is_file()]
     print(f"in_folder: {in_folder}")
     print(f"out_folder: {out_folder}")
-    print(f"num files in in_folder: {len(files)}")
     out_folder.mkdir(exist_ok=True)
+    manifest = None
+    if args.manifest:
+        manifest = Manifest(args.manifest)
+        if manifest.is_empty("conversions"):
+            print(f"imported {manifest.import_conversions(out_folder)} existing conversions into {manifest.path}")
+        if args.content_addressed:
+            files = [blob_path(in_folder, sha256) for sha256 in manifest.get_unique_hashes()]
+        else:
+            files = [in_folder / f"{note_id}.pdf" for note_id, _ in manifest.get_downloads(DONE)]
+    elif args.content_addressed:
+        raise ValueError("--content_addressed requires --manifest")
+    else:
+        files = [f for f in sorted(list(in_folder.glob("**/*.pdf"))) if f.is_file()]
+    print(f"num files in in_folder: {len(files)}")
 
     # Handle chunks if we're processing in parallel
     # Ensure we get all files into a chunk
@@ -126,11 +168,30 @@ def main():
     end_idx = start_idx + chunk_size
     files_to_convert = files[start_idx:end_idx]
     print(f"num files in chunk: {len(files_to_convert)}")
-    files_to_convert = [
-        f
-        for f in files_to_convert
-        if not (out_folder / f.stem / f"{f.stem}.md").exists()
-    ]  # skip files if exist.
+    corpus_names = None
+    if args.corpus:
+        corpus_names = set()
+        if Path(args.corpus).exists():
+            with MdCorpus(args.corpus) as corpus:
+                corpus_names = set(corpus.names())
+    if manifest is not None:
+        conversion_status = manifest.get_conversion_status()
+        converted = {name for name, status in conversion_status.items() if status == DONE}
+        if corpus_names is not None:
+            # conversions to out_folder (e.g. imported from it) are not in the corpus, pack them with md_corpus.py
+            # instead of converting them again
+            print(f"{len(converted - corpus_names):_} converted pdfs are not in the corpus {args.corpus}")
+            converted &= corpus_names
+        converted |= {name for name, status in conversion_status.items() if status == SKIPPED}
+        files_to_convert = [f for f in files_to_convert if f.stem not in converted]
+    elif corpus_names is not None:
+        files_to_convert = [f for f in files_to_convert if f.stem not in corpus_names]
+    else:
+        files_to_convert = [
+            f
+            for f in files_to_convert
+            if not (out_folder / f.stem / f"{f.stem}.md").exists()
+        ]  # skip files if exist.
     print(f"num files to convert: {len(files_to_convert)}")
     # print(files_to_convert)
 
@@ -180,28 +241,37 @@ def main():
         f"Converting {len(files_to_convert)} pdfs in chunk {args.chunk_idx + 1}/{args.num_chunks} with {total_processes} processes, and storing in {out_folder}"
     )
     task_args = [
-        (str(f), out_folder, metadata.get(os.path.basename(f)), args.min_length)
+        (str(f), out_folder, metadata.get(os.path.basename(f)), args.min_length, args.corpus is not None)
         for f in files_to_convert
     ]
+    corpus_writer = MdCorpusWriter(args.corpus) if args.corpus else None
 
     with mp.Pool(
         processes=total_processes, initializer=worker_init, initargs=(model_lst,)
     ) as pool:
-        list(
-            tqdm(
-                pool.imap_unordered(process_single_pdf, task_args),
-                total=len(task_args),
-                desc="Processing PDFs",
-                unit="pdf",
-                disable=False,
-                smoothing=0.1,
-            )
-        )
+        for name, status, message, full_text in tqdm(
+            pool.imap_unordered(process_single_pdf, task_args),
+            total=len(task_args),
+            desc="Processing PDFs",
+            unit="pdf",
+            disable=False,
+            smoothing=0.1,
+        ):
+            if full_text is not None:
+                # written before the conversion is recorded, so that the manifest never lists md missing from the corpus
+                corpus_writer.write(name, full_text)
+            if manifest is not None:
+                manifest.record_conversion(name, status, message)
 
         pool._worker_handler.terminate = worker_exit
 
     # Delete all CUDA tensors
     del model_lst
+    if corpus_writer is not None:
+        corpus_writer.close()
+    if manifest is not None:
+        print(f"manifest: {manifest.summary()['conversions']}")
+        manifest.close()
 
 
 if __name__ == "__main__":